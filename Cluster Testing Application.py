@@ -1,140 +1,801 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox
-from threading import Thread, Event
-import cantools
-import can
-import can.interfaces.pcan
+import os
 import time
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+from threading import Thread
+import queue
+
+# python-can loads an interface backend (e.g. the PCAN vendor library) only when its bus is created;
+# cantools and NumPy are imported on first use as well, so the window shows up quickly
+from can_engine import (
+    BITRATE_MAP,
+    CYCLE_TIME_OPTIONS_MS,
+    DATA_BITRATE_MAP,
+    INTERFACE_CHANNEL_MAP,
+    OVERFLOW_DROP_OLDEST,
+    OVERFLOW_LATEST,
+    CanNetwork,
+    discover_channels,
+    parse_signal_entry,
+    warm_up,
+)
+
+LOG_FILE_TYPES = [("BLF Files", "*.blf"), ("ASC Files", "*.asc")]
+
+
+ROW_HEIGHT = 30
+HEADER_ROW = 0
+SIGNAL_ROW = 1
+
+# After the window is up, the modules deferred until first use are imported in the background
+WARM_UP_DELAY_MS = 500
+
+# TX statistics and bus load are refreshed at this interval, never per frame
+STATS_REFRESH_MS = 1000
+# The RX monitor shows the latest value per signal at this interval, not a per-frame log
+RX_REFRESH_MS = 250
+# Errors and notifications from engine threads are handed to the Tk main thread at this interval
+ENGINE_EVENT_POLL_MS = 50
+
+# Data bitrate choice that opens the bus for classical CAN only
+CLASSICAL_CAN = "Classical CAN"
+
+# TX queue overflow policies by their name in the GUI
+TX_OVERFLOW_OPTIONS = {
+    "Keep latest": OVERFLOW_LATEST,
+    "Drop oldest": OVERFLOW_DROP_OLDEST,
+}
+
+
+class _ChannelState:
+    """GUI-side settings of one CAN channel; the CAN side lives in the channel's CanEngine."""
+
+    def __init__(self, name):
+        self.name = name
+        self.interface = "Select Interface"
+        self.channel = "Select Channel"
+        self.bitrate = "Select Bitrate"
+        self.data_bitrate = CLASSICAL_CAN
+        self.dbc_path = ""
+        self.dbc_status = "No DBC loaded"
+        self.signal_entry_texts = []  # signal id -> entry text
+        self.bus_config = None  # (python-can interface, channel) once started
+
+
+class _HeaderRow:
+    """Pooled widgets for a message header row."""
+
+    def __init__(self, parent, signal_list):
+        self.frame_id = None
+        self.frame = tk.Frame(parent, bg="#e8e8e8")
+        self.collapse_button = tk.Button(
+            self.frame, width=2, relief="flat", bg="#e8e8e8",
+            command=lambda: signal_list.toggle_collapsed(self.frame_id)
+        )
+        self.collapse_button.pack(side="left", padx=(5, 0))
+        self.label = tk.Label(self.frame, bg="#e8e8e8", font=("Arial", 10, "bold"))
+        self.label.pack(side="left", padx=5)
+
+        # Per-message cycle time (ms); empty means DBC/global default
+        self.cycle_entry = tk.Entry(self.frame, width=8, font=("Arial", 10))
+        self.cycle_entry.pack(side="right", padx=5)
+        tk.Label(self.frame, text="Cycle (ms):", bg="#e8e8e8").pack(side="right")
+        self.cycle_entry.bind("<Return>", lambda e: signal_list.apply_cycle_entry(self))
+        self.cycle_entry.bind("<FocusOut>", lambda e: signal_list.apply_cycle_entry(self))
+
+        # Message-level toggles: all signals of the message in one batch
+        tk.Button(
+            self.frame, text="All Off", font=("Arial", 9),
+            command=lambda: signal_list.app.toggle_signals(signal_list.message_signal_ids(self.frame_id), False)
+        ).pack(side="right", padx=(5, 15))
+        tk.Button(
+            self.frame, text="All On", font=("Arial", 9),
+            command=lambda: signal_list.app.toggle_signals(signal_list.message_signal_ids(self.frame_id), True)
+        ).pack(side="right")
+
+
+class _SignalRow:
+    """Pooled widgets for a signal row."""
+
+    def __init__(self, parent, signal_list):
+        self.sid = None
+        self.active = None
+        self.frame = tk.Frame(parent)
+        self.label = tk.Label(self.frame)
+        self.label.pack(side="left", padx=(30, 5))
+
+        # Entry box for signal value (decoded/physical units); edits go to the app by signal id
+        self.entry_var = tk.StringVar()
+        self.entry_var.trace_add("write", lambda *_: signal_list.on_entry_changed(self))
+        self.entry = tk.Entry(self.frame, width=12, font=("Arial", 10), textvariable=self.entry_var)
+        self.entry.pack(side="left", padx=5)
+
+        # Start/Stop toggle button
+        self.toggle_button = tk.Button(
+            self.frame, relief="raised", font=("Arial", 10, "bold"),
+            command=lambda: signal_list.app.toggle_signal(self.sid)
+        )
+        self.toggle_button.pack(side="right", padx=5, pady=2)
+
+
+class VirtualSignalList:
+    """
+    Scrollable, searchable signal list that only creates widgets for the rows on screen.
+
+    Rows are messages (collapsible headers) followed by their signals. Row widgets are pooled
+    and re-bound to other messages/signals while scrolling, so the widget count depends on the
+    window height, not on the DBC size. The search box filters incrementally over a name index
+    built once per DBC load.
+    """
+
+    def __init__(self, parent, app):
+        self.app = app
+        self.messages = []  # [(message, signal ids)] in DBC order
+        self.search_index = []  # signal id -> "signal message" lowercase search key
+        self.collapsed = set()  # frame_ids of collapsed messages
+        self.rows = []  # visible (row kind, frame_id or signal id) after filter/collapse
+        self.top = 0  # index into rows of the first row on screen
+        self._matches = None  # signal ids matching the current query, None if no query
+        self._query = ""
+        self._header_pool = []
+        self._signal_pool = []
+        self._binding = False
+
+        # Search / collapse controls
+        controls = tk.Frame(parent)
+        controls.pack(side="top", fill="x")
+        tk.Label(controls, text="Search:", font=("Arial", 11)).pack(side="left", padx=5)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *_: self.apply_filter())
+        tk.Entry(controls, textvariable=self.search_var, width=30, font=("Arial", 11)).pack(side="left", padx=5)
+        tk.Button(controls, text="Collapse All", command=self.collapse_all).pack(side="left", padx=5)
+        tk.Button(controls, text="Expand All", command=self.expand_all).pack(side="left", padx=5)
+        tk.Button(controls, text="Shown ON", command=lambda: app.toggle_signals(self.shown_signal_ids(), True)).pack(
+            side="left", padx=5)
+        tk.Button(controls, text="Shown OFF", command=lambda: app.toggle_signals(self.shown_signal_ids(), False)).pack(
+            side="left", padx=5)
+        self.count_label = tk.Label(controls, font=("Arial", 10))
+        self.count_label.pack(side="right", padx=5)
+
+        # Row area and scrollbar
+        self.scrollbar = tk.Scrollbar(parent, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.container = tk.Frame(parent, bg="white")
+        self.container.pack(side="left", fill="both", expand=True)
+        self.container.bind("<Configure>", lambda e: self.render())
+
+        # Bind scrolling gestures for Windows/Mac
+        self.container.bind_all("<MouseWheel>", lambda e: self.yview("scroll", -1 * (e.delta // 120) * 3, "units"))
+        # Bind scrolling gestures for Linux
+        self.container.bind_all("<Button-4>", lambda e: self.yview("scroll", -3, "units"))
+        self.container.bind_all("<Button-5>", lambda e: self.yview("scroll", 3, "units"))
+
+    def load(self, messages, signal_store):
+        """Index the messages of a freshly loaded DBC and show the first screen of rows."""
+        self.messages = [(message, signal_store.message_signal_ids[message.frame_id]) for message in messages]
+        self.search_index = [""] * len(signal_store)
+        for message, sids in self.messages:
+            message_key = f"{message.name.lower()} 0x{message.frame_id:x}"
+            for sid in sids:
+                self.search_index[sid] = f"{signal_store.names[sid].lower()} {message_key}"
+        self.collapsed.clear()
+        self._query = ""
+        self._matches = None
+        self.top = 0
+        if self.search_var.get():
+            self.search_var.set("")  # trace rebuilds the rows
+        else:
+            self.rebuild_rows()
+
+    def clear(self):
+        self.messages = []
+        self.search_index = []
+        self.rows = []
+        self.top = 0
+        self.render()
+
+    def apply_filter(self):
+        """Filter rows by the search box; a query that extends the previous one only re-checks previous matches."""
+        query = self.search_var.get().strip().lower()
+        if not query:
+            self._matches = None
+        else:
+            if self._matches is not None and query.startswith(self._query):
+                candidates = self._matches
+            else:
+                candidates = range(len(self.search_index))
+            index = self.search_index
+            self._matches = [sid for sid in candidates if query in index[sid]]
+        self._query = query
+        self.top = 0
+        self.rebuild_rows()
+
+    def shown_signal_ids(self):
+        """Signal ids matching the search box (every signal without a query), collapsed messages included."""
+        if self._matches is not None:
+            return list(self._matches)
+        return [sid for _, sids in self.messages for sid in sids]
+
+    def message_signal_ids(self, frame_id):
+        """Signal ids of a message that match the search box."""
+        sids = self.app.engine.signal_store.message_signal_ids.get(frame_id, ())
+        if self._matches is None:
+            return list(sids)
+        match_set = set(self._matches)
+        return [sid for sid in sids if sid in match_set]
+
+    def toggle_collapsed(self, frame_id):
+        if frame_id in self.collapsed:
+            self.collapsed.discard(frame_id)
+        else:
+            self.collapsed.add(frame_id)
+        self.rebuild_rows()
+
+    def collapse_all(self):
+        self.collapsed = {message.frame_id for message, _ in self.messages}
+        self.top = 0
+        self.rebuild_rows()
+
+    def expand_all(self):
+        self.collapsed.clear()
+        self.rebuild_rows()
+
+    def rebuild_rows(self):
+        """Recompute the visible row list after a load, filter or collapse change."""
+        match_set = set(self._matches) if self._matches is not None else None
+        rows = []
+        shown_signals = 0
+        for message, sids in self.messages:
+            if match_set is not None:
+                sids = [sid for sid in sids if sid in match_set]
+                if not sids:
+                    continue
+            rows.append((HEADER_ROW, message.frame_id))
+            shown_signals += len(sids)
+            if message.frame_id not in self.collapsed:
+                rows.extend((SIGNAL_ROW, sid) for sid in sids)
+        self.rows = rows
+        self.count_label.config(text=f"{shown_signals} signals")
+        self.render()
+
+    def _visible_slots(self):
+        return max(1, self.container.winfo_height() // ROW_HEIGHT + 1)
+
+    def yview(self, *args):
+        """Scrollbar / mouse wheel protocol: ('moveto', fraction) or ('scroll', n, 'units'|'pages')."""
+        slots = self._visible_slots()
+        if args[0] == "moveto":
+            top = int(float(args[1]) * len(self.rows))
+        else:
+            step = int(args[1])
+            top = self.top + (step * max(1, slots - 1) if args[2] == "pages" else step)
+        top = max(0, min(top, len(self.rows) - slots + 1))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def render(self):
+        """Bind pooled widgets to the rows on screen and hide the rest."""
+        slots = self._visible_slots()
+        self.top = max(0, min(self.top, len(self.rows) - slots + 1))
+        if str(self.container.tk.call("focus")).startswith(str(self.container) + "."):
+            # Recycled rows must not keep keyboard focus meant for another signal
+            self.container.focus_set()
+
+        headers_used = 0
+        signals_used = 0
+        for slot, (kind, key) in enumerate(self.rows[self.top:self.top + slots]):
+            if kind == HEADER_ROW:
+                if headers_used == len(self._header_pool):
+                    self._header_pool.append(_HeaderRow(self.container, self))
+                row = self._header_pool[headers_used]
+                headers_used += 1
+                self._bind_header(row, key)
+            else:
+                if signals_used == len(self._signal_pool):
+                    self._signal_pool.append(_SignalRow(self.container, self))
+                row = self._signal_pool[signals_used]
+                signals_used += 1
+                self._bind_signal(row, key)
+            row.frame.place(x=0, y=slot * ROW_HEIGHT, relwidth=1, height=ROW_HEIGHT)
+
+        for row in self._header_pool[headers_used:]:
+            row.frame_id = None
+            row.frame.place_forget()
+        for row in self._signal_pool[signals_used:]:
+            row.sid = None
+            row.frame.place_forget()
+
+        total = len(self.rows)
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + slots) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def refresh(self):
+        """Re-sync the rows on screen with entry texts and toggle states (after bulk changes)."""
+        for row in self._signal_pool:
+            if row.sid is None:
+                continue
+            text = self.app.signal_entry_texts[row.sid]
+            if row.entry_var.get() != text:
+                sid = row.sid
+                row.sid = None  # suppress the entry trace
+                row.entry_var.set(text)
+                row.sid = sid
+            self._update_toggle(row)
+
+    def _bind_header(self, row, frame_id):
+        message = self.app.engine.messages_by_id[frame_id]
+        if row.frame_id != frame_id:
+            row.frame_id = frame_id
+            dbc_cycle = f"{message.cycle_time} ms" if message.cycle_time else "none"
+            row.label.config(text=f"{message.name} (0x{message.frame_id:X}) - DBC cycle: {dbc_cycle}")
+            cycle_ms = self.app.engine.message_cycle_overrides.get(frame_id)
+            row.cycle_entry.delete(0, tk.END)
+            if cycle_ms is not None:
+                row.cycle_entry.insert(0, str(cycle_ms))
+        row.collapse_button.config(text="+" if frame_id in self.collapsed else "-")
+
+    def _bind_signal(self, row, sid):
+        if row.sid != sid:
+            store = self.app.engine.signal_store
+            row.sid = None  # suppress the entry trace while re-binding
+            row.label.config(text=f"{store.names[sid]} (Min: {store.phys_min[sid]:g}, Max: {store.phys_max[sid]:g})")
+            row.entry_var.set(self.app.signal_entry_texts[sid])
+            row.sid = sid
+            row.active = None
+        self._update_toggle(row)
+
+    def _update_toggle(self, row):
+        active = self.app.engine.signal_store.is_active(row.sid)
+        if active == row.active:
+            return
+        row.active = active
+        name = self.app.engine.signal_store.names[row.sid]
+        if active:
+            row.toggle_button.config(text=f"On: {name}", bg="green", relief="sunken")
+        else:
+            row.toggle_button.config(text=f"Off: {name}", bg="lightgray", relief="raised")
+
+    def on_entry_changed(self, row):
+        if row.sid is not None:
+            self.app.on_signal_entry_changed(row.sid, row.entry_var.get())
+
+    def apply_cycle_entry(self, row):
+        if row.frame_id is None:
+            return
+        message = self.app.engine.messages_by_id[row.frame_id]
+        shown = self.app.set_message_cycle_time(message, row.cycle_entry.get())
+        if shown is not None:
+            row.cycle_entry.delete(0, tk.END)
+            row.cycle_entry.insert(0, shown)
+
+
+class TxStatsPanel:
+    """Window with the per-frame TX statistics of the engine, refreshed by the app at STATS_REFRESH_MS."""
+
+    COLUMNS = (
+        ("frame_id", "Frame ID", 80),
+        ("message", "Message", 180),
+        ("sent", "Sent", 80),
+        ("expected_period_ms", "Cycle (ms)", 80),
+        ("period_min_ms", "Min (ms)", 80),
+        ("period_mean_ms", "Mean (ms)", 80),
+        ("period_max_ms", "Max (ms)", 80),
+        ("late", "Late", 60),
+        ("errors", "Errors", 60),
+        ("timeouts", "Timeouts", 70),
+    )
+
+    def __init__(self, app):
+        self.app = app
+        self.window = tk.Toplevel(app.root)
+        self.window.title("TX Statistics")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        toolbar = tk.Frame(self.window)
+        toolbar.pack(fill="x", padx=10, pady=5)
+        tk.Label(toolbar, textvariable=app.bus_load_text, font=("Arial", 11, "bold")).pack(side="left")
+        tk.Label(toolbar, textvariable=app.tx_health_text, font=("Arial", 10)).pack(side="left", padx=10)
+        tk.Button(toolbar, text="Export CSV", command=self.export_csv, font=("Arial", 10)).pack(side="right", padx=5)
+        tk.Button(toolbar, text="Reset", command=self.reset, font=("Arial", 10)).pack(side="right", padx=5)
+        self.profile_button = tk.Button(toolbar, command=self.toggle_profiling, font=("Arial", 10))
+        self.profile_button.pack(side="right", padx=5)
+
+        table = tk.Frame(self.window)
+        table.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.tree = ttk.Treeview(table, columns=[key for key, _, _ in self.COLUMNS], show="headings", height=20)
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor="e" if key not in ("frame_id", "message") else "w")
+        scrollbar = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self.refresh()
+
+    def refresh(self):
+        """Update the table in place; frames that never sent anything are left out."""
+        rows = [row for row in self.app.engine.tx_stats_rows() if row["sent"] or row["errors"]]
+        shown = set()
+        for row in rows:
+            iid = row["frame_id"]
+            values = [row[key] for key, _, _ in self.COLUMNS]
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=values)
+            else:
+                self.tree.insert("", "end", iid=iid, values=values)
+            shown.add(iid)
+        for iid in self.tree.get_children():
+            if iid not in shown:
+                self.tree.delete(iid)
+        self.profile_button.config(text="Stop Profiling..." if self.app.engine.profiling else "Start Profiling")
+
+    def toggle_profiling(self):
+        """
+        Start profiling the send path of the selected channel, or stop it and save the Chrome trace
+        (open it in chrome://tracing or ui.perfetto.dev) with a per-frame summary CSV next to it.
+        """
+        engine = self.app.engine
+        if not engine.profiling:
+            try:
+                engine.start_profiling()
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to start profiling: {str(e)}", parent=self.window)
+            self.refresh()
+            return
+        engine.stop_profiling()
+        self.refresh()
+        file_path = filedialog.asksaveasfilename(
+            parent=self.window, defaultextension=".json", filetypes=[("Chrome Trace Files", "*.json")]
+        )
+        if not file_path:
+            return
+        summary_path = os.path.splitext(file_path)[0] + "_summary.csv"
+        try:
+            engine.export_profile(file_path, summary_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export the profile: {str(e)}", parent=self.window)
 
+    def reset(self):
+        self.app.engine.reset_tx_stats()
+        self.refresh()
+
+    def export_csv(self):
+        file_path = filedialog.asksaveasfilename(
+            parent=self.window, defaultextension=".csv", filetypes=[("CSV Files", "*.csv")]
+        )
+        if not file_path:
+            return
+        try:
+            self.app.engine.export_tx_stats(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export TX statistics: {str(e)}", parent=self.window)
+
+    def close(self):
+        self.window.destroy()
+        self.app.stats_panel = None
+
+
+class RxMonitorPanel:
+    """
+    Window with the latest received frame per frame_id and, for expanded frames, the latest
+    decoded value per signal. Refreshed every RX_REFRESH_MS; only frames that received
+    something since the previous refresh are updated.
+    """
+
+    COLUMNS = (
+        ("frame_id", "Frame ID", 90),
+        ("name", "Message / Signal", 240),
+        ("count", "Count", 80),
+        ("value", "Data / Value", 260),
+    )
+
+    def __init__(self, app):
+        self.app = app
+        self.window = tk.Toplevel(app.root)
+        self.window.title("RX Monitor")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.status = tk.StringVar()
+        self._shown = {}  # frame iid -> can.Message shown in its row
+
+        toolbar = tk.Frame(self.window)
+        toolbar.pack(fill="x", padx=10, pady=5)
+        tk.Label(toolbar, textvariable=self.status, font=("Arial", 10)).pack(side="left")
+        tk.Button(toolbar, text="Clear", command=self.clear, font=("Arial", 10)).pack(side="right", padx=5)
+        tk.Button(toolbar, text="Save Buffer...", command=self.save_buffer, font=("Arial", 10)).pack(
+            side="right", padx=5)
+
+        table = tk.Frame(self.window)
+        table.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.tree = ttk.Treeview(table, columns=[key for key, _, _ in self.COLUMNS], show="tree headings", height=25)
+        self.tree.column("#0", width=30, stretch=False)
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor="e" if key == "count" else "w")
+        scrollbar = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        # Expanding a frame fills in its signal values at the next refresh, even if no new frame arrived
+        self.tree.bind("<<TreeviewOpen>>", lambda e: self.window.after_idle(self._force_refresh))
+
+        self._refresh_job = None
+        self.refresh()
+
+    def refresh(self):
+        started = time.perf_counter()
+        monitor = self.app.engine.rx_monitor
+        for state in monitor.latest():
+            msg = state.message
+            iid = f"0x{state.frame_id:X}"
+            if not self.tree.exists(iid):
+                message = self.app.engine.messages_by_id.get(state.frame_id)
+                name = message.name if message is not None else "(unknown)"
+                self.tree.insert("", "end", iid=iid, values=(iid, name, state.count, msg.data.hex(" ")))
+                if state.values:
+                    for signal_name in state.values:
+                        self.tree.insert(iid, "end", iid=f"{iid}/{signal_name}", values=("", signal_name, "", ""))
+            elif self._shown.get(iid) is msg:
+                continue
+            else:
+                self.tree.set(iid, "count", state.count)
+                self.tree.set(iid, "value", msg.data.hex(" "))
+            self._shown[iid] = msg
+            if state.values and self.tree.item(iid, "open"):
+                for signal_name, value in state.values.items():
+                    self.tree.set(f"{iid}/{signal_name}", "value", f"{value:g}")
+
+        buffer = monitor.buffer
+        self.status.set(
+            f"{buffer.total} frames received, {len(buffer)} buffered ({buffer.overwritten} overwritten), "
+            f"{monitor.error_frames} error frames"
+        )
+        self.app.engine.record_gui_work(started)
+        self._refresh_job = self.window.after(RX_REFRESH_MS, self.refresh)
+
+    def _force_refresh(self):
+        self._shown.clear()
+
+    def save_buffer(self):
+        """Save the frames in the RX ring buffer (the most recent traffic) to a log file."""
+        file_path = filedialog.asksaveasfilename(parent=self.window, defaultextension=".blf", filetypes=LOG_FILE_TYPES)
+        if not file_path:
+            return
+        try:
+            count = self.app.engine.save_rx_buffer(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save the RX buffer: {str(e)}", parent=self.window)
+            return
+        messagebox.showinfo("RX Monitor", f"{count} frames saved", parent=self.window)
+
+    def clear(self):
+        self.app.engine.rx_monitor.clear()
+        self.reset_view()
+
+    def reset_view(self):
+        """Empty the table; it is filled again from the monitor of the selected channel."""
+        self._shown.clear()
+        self.tree.delete(*self.tree.get_children())
+
+    def close(self):
+        if self._refresh_job is not None:
+            self.window.after_cancel(self._refresh_job)
+        self.window.destroy()
+        self.app.rx_panel = None
 
 
 class CANSignalSenderApp:
     def __init__(self, root):
         # Interface and bitrate configuration maps
-        self.interface_channel_map = {
-            "Peak CAN": ["pcan", "PCAN_USBBUS1"],
-            "Kvaser CAN": ["kvaser", "0"],
-            "Chuangxin USBCAN": ["canalystii", "0"],
-            "Virtual CAN": ["virtual", "vcan0"]
-        }
-
-        self.bitrate_map = {
-            "125 kbps": 125000,
-            "250 kbps": 250000,
-            "500 kbps": 500000,
-            "1 Mbps": 1000000,
-        }
+        self.interface_channel_map = dict(INTERFACE_CHANNEL_MAP)
+        self.bitrate_map = dict(BITRATE_MAP)
+        self.data_bitrate_map = dict(DATA_BITRATE_MAP)
 
         # CAN Configuration variables
         self.interface_selection = tk.StringVar(value="Select Interface")
         self.bitrate_selection = tk.StringVar(value="Select Bitrate")
+        self.data_bitrate_selection = tk.StringVar(value=CLASSICAL_CAN)
         self.channel_selection = tk.StringVar(value="Select Channel")
 
-        # Other variables
-        self.db = None
-        self.dbc_path = tk.StringVar()
-        self.bus = None
-
-        # Signal/UI state
-        self.toggling = {}  # signal_name -> bool (on/off)
-        self.signal_entries = {}  # signal_name -> Entry widget
-        self.toggle_buttons = {}  # signal_name -> Button widget
-
-        # Per-message worker model
-        self.messages_by_id = {}  # frame_id -> cantools message
-        self.signal_to_message_id = {}  # signal_name -> frame_id
-        self.message_threads = {}  # frame_id -> Thread
-        self.message_stop_events = {}  # frame_id -> Event
-        self.message_current_values = {}  # frame_id -> {signal_name: current_physical_value}
-
-        # Global cycle time (ms) for sends when signals are active
-        self.cycle_time_ms = tk.IntVar(value=100)  # default 100 ms
-
-        # Tkinter root and widgets
+        # Tkinter root
         self.root = root
         self.root.title("Cluster Testing Application")
 
+        # CAN channels: each has its own bus, bitrate, DBC and TX scheduling in a CanEngine; errors
+        # from their threads are shown on the Tk main thread. The controls show the selected channel.
+        # Tk may only be used from the main thread, so worker threads put (function, args) events
+        # in this queue and _poll_engine_events runs them there.
+        self.engine_events = queue.Queue()
+        self.network = CanNetwork(on_error=self._show_engine_error)
+        self.channel_states = {}  # channel name -> _ChannelState
+        self.current_channel = tk.StringVar()
+        self._shown_channel = None
+        self.discovered_channels = {}  # python-can interface -> channels reported by the drivers
+
+        # Other variables
+        self.dbc_path = tk.StringVar()
+        self.dbc_status = tk.StringVar(value="No DBC loaded")
+
+        # Signal entry texts are kept per channel and signal (see _ChannelState), since the list
+        # only has widgets for visible rows
+        self._list_refresh_pending = False
+
+        # Cycle times: each message defaults to its DBC GenMsgCycleTime.
+        # The global cycle time is used for messages without one, or for all messages when override is on.
+        self.cycle_time_ms = tk.IntVar(value=100)  # CanEngine's default
+        self.cycle_override = tk.BooleanVar(value=False)
+        self.cycle_time_ms.trace_add("write", self._on_cycle_time_changed)
+        self.cycle_override.trace_add("write", self._on_cycle_time_changed)
+
+        # Offloaded TX: cyclic frames run as python-can periodic tasks (kernel/hardware timed)
+        self.offload_tx = tk.BooleanVar(value=False)
+        self.offload_tx.trace_add("write", self._on_offload_tx_changed)
+
+        # Bus and cyclic transmission in a child process, chosen when the interface is started
+        self.separate_process = tk.BooleanVar(value=False)
+
+        # What the TX queue drops when the bus cannot keep up
+        self.tx_overflow = tk.StringVar(value="Keep latest")
+        self.tx_overflow.trace_add("write", self._on_tx_overflow_changed)
+
+        # Live TX statistics: bus load and send problems in the status bar, per-frame counters in a
+        # separate window. Send errors are counted there instead of opening a dialog per error.
+        self.bus_load_text = tk.StringVar(value="Bus load: -")
+        self.tx_health_text = tk.StringVar()
+        self.stats_panel = None
+        self.rx_panel = None
+
+        # Record / replay
+        self.replay_speed = tk.StringVar(value="1.0")
+        self.replay_tx_only = tk.BooleanVar(value=False)
+
+        self._add_channel_state("CAN 1")
         self.create_widgets()
+        self.interface_selection.trace_add("write", self._on_interface_changed)
+        self.current_channel.trace_add("write", self._on_channel_selected)
+        self.current_channel.set("CAN 1")
+        self.root.after(STATS_REFRESH_MS, self._refresh_tx_stats)
+        self.root.after(ENGINE_EVENT_POLL_MS, self._poll_engine_events)
+        self.root.after(WARM_UP_DELAY_MS, warm_up)
+
+    @property
+    def engine(self):
+        """CanEngine of the selected channel."""
+        return self.network.channels[self.current_channel.get()]
+
+    @property
+    def signal_entry_texts(self):
+        return self.channel_states[self.current_channel.get()].signal_entry_texts
 
     def create_widgets(self):
+        # Channel selection and management
+        channel_bar = tk.Frame(self.root)
+        channel_bar.grid(row=0, column=0, columnspan=3, sticky="w", padx=10, pady=(10, 0))
+        tk.Label(channel_bar, text="Channel:", font=("Arial", 14)).pack(side="left")
+        self.channel_combo = ttk.Combobox(channel_bar, textvariable=self.current_channel, state="readonly", width=14,
+                                          values=list(self.channel_states))
+        self.channel_combo.pack(side="left", padx=10)
+        tk.Button(channel_bar, text="Add Channel", command=self.add_channel, font=("Arial", 11)).pack(
+            side="left", padx=5)
+        tk.Button(channel_bar, text="Remove Channel", command=self.remove_channel, font=("Arial", 11)).pack(
+            side="left", padx=5)
+        self.detect_button = tk.Button(channel_bar, text="Detect Hardware", command=self.detect_channels,
+                                       font=("Arial", 11))
+        self.detect_button.pack(side="left", padx=5)
+        self.detect_status = tk.StringVar()
+        tk.Label(channel_bar, textvariable=self.detect_status, font=("Arial", 10)).pack(side="left", padx=5)
+
         # Load DBC File
-        tk.Label(self.root, text="DBC File:", font=("Arial, 14")).grid(row=0, column=0, sticky="e", padx=10, pady=10)
+        tk.Label(self.root, text="DBC File:", font=("Arial, 14")).grid(row=1, column=0, sticky="e", padx=10, pady=10)
         tk.Entry(self.root, textvariable=self.dbc_path, width=50, state="readonly", font=("Arial", 12)).grid(
-            row=0, column=1, padx=10, pady=10
-        )
-        tk.Button(self.root, text="Load DBC", command=self.load_dbc, font=("Arial", 12), width=15).grid(
-            row=0, column=2, padx=10, pady=10
+            row=1, column=1, padx=10, pady=10
         )
+        self.load_button = tk.Button(self.root, text="Load DBC", command=self.load_dbc, font=("Arial", 12), width=15)
+        self.load_button.grid(row=1, column=2, padx=10, pady=10)
 
         # Interface Dropdown
-        tk.Label(self.root, text="CAN Interface:", font=("Arial", 14)).grid(row=1, column=0, sticky="e", padx=10,
+        tk.Label(self.root, text="CAN Interface:", font=("Arial", 14)).grid(row=2, column=0, sticky="e", padx=10,
                                                                             pady=10)
-        tk.OptionMenu(
-            self.root, self.interface_selection, *self.interface_channel_map.keys()
-        ).grid(row=1, column=1, sticky="w", padx=10, pady=10)
+        interface_frame = tk.Frame(self.root)
+        interface_frame.grid(row=2, column=1, sticky="w", padx=10, pady=10)
+        tk.OptionMenu(interface_frame, self.interface_selection, *self.interface_channel_map.keys()).pack(side="left")
+        tk.Label(interface_frame, text="HW Channel:", font=("Arial", 11)).pack(side="left", padx=(10, 3))
+        self.hw_channel_combo = ttk.Combobox(interface_frame, textvariable=self.channel_selection, width=16)
+        self.hw_channel_combo.pack(side="left")
 
         # Bitrate Dropdown
-        tk.Label(self.root, text="CAN Bitrate:", font=("Arial", 14)).grid(row=2, column=0, sticky="e", padx=10, pady=10)
-        tk.OptionMenu(self.root, self.bitrate_selection, *self.bitrate_map.keys()).grid(
-            row=2, column=1, sticky="w", padx=10, pady=10
+        tk.Label(self.root, text="CAN Bitrate:", font=("Arial", 14)).grid(row=3, column=0, sticky="e", padx=10, pady=10)
+        bitrate_frame = tk.Frame(self.root)
+        bitrate_frame.grid(row=3, column=1, sticky="w", padx=10, pady=10)
+        tk.OptionMenu(bitrate_frame, self.bitrate_selection, *self.bitrate_map.keys()).pack(side="left")
+        # CAN FD: the data phase bitrate (bitrate switching for FD messages of the DBC)
+        tk.Label(bitrate_frame, text="Data Bitrate:", font=("Arial", 11)).pack(side="left", padx=(10, 3))
+        tk.OptionMenu(bitrate_frame, self.data_bitrate_selection, CLASSICAL_CAN, *self.data_bitrate_map.keys()).pack(
+            side="left")
+
+        # Offloaded TX and separate TX process toggles
+        tx_options = tk.Frame(self.root)
+        tx_options.grid(row=3, column=2, sticky="w", padx=10)
+        tk.Checkbutton(
+            tx_options,
+            text="Offload cyclic TX to interface",
+            variable=self.offload_tx,
+            font=("Arial", 11)
+        ).pack(side="left")
+        self.separate_process_check = tk.Checkbutton(
+            tx_options,
+            text="TX in separate process",
+            variable=self.separate_process,
+            font=("Arial", 11)
         )
+        self.separate_process_check.pack(side="left", padx=(10, 0))
+        tk.Label(tx_options, text="On overflow:", font=("Arial", 11)).pack(side="left", padx=(10, 3))
+        tk.OptionMenu(tx_options, self.tx_overflow, *TX_OVERFLOW_OPTIONS.keys()).pack(side="left")
+
+        # Record and replay controls
+        log_controls = tk.Frame(self.root)
+        log_controls.grid(row=2, column=2, sticky="w", padx=10)
+        self.record_button = tk.Button(log_controls, text="Record...", command=self.toggle_recording,
+                                       font=("Arial", 11), width=14)
+        self.record_button.pack(side="left", padx=5)
+        self.replay_button = tk.Button(log_controls, text="Replay...", command=self.toggle_replay,
+                                       font=("Arial", 11), width=12)
+        self.replay_button.pack(side="left", padx=5)
+        tk.Label(log_controls, text="Speed x").pack(side="left")
+        tk.Entry(log_controls, textvariable=self.replay_speed, width=5).pack(side="left")
+        tk.Checkbutton(log_controls, text="TX only", variable=self.replay_tx_only).pack(side="left", padx=3)
 
         # Start Interface Button
         self.start_button = tk.Button(
             self.root, text="Start Interface", command=self.start_interface, font=("Arial", 12)
         )
-        self.start_button.grid(row=3, column=1, pady=10)
+        self.start_button.grid(row=4, column=1, pady=10)
 
         # Toggle All controls
         all_controls = tk.Frame(self.root)
-        all_controls.grid(row=3, column=2, sticky="w", padx=10)
+        all_controls.grid(row=4, column=2, sticky="w", padx=10)
         tk.Button(all_controls, text="Toggle All ON", command=self.toggle_all_on, font=("Arial", 11)).pack(side="left",
                                                                                                            padx=5)
         tk.Button(all_controls, text="Toggle All OFF", command=self.toggle_all_off, font=("Arial", 11)).pack(
             side="left", padx=5)
 
         # Cycle time radio buttons
-        cycle_frame = tk.LabelFrame(self.root, text="Cycle Time", padx=10, pady=5, font=("Arial", 11, "bold"))
-        cycle_frame.grid(row=3, column=0, sticky="w", padx=10)
-        options_ms = [10, 20, 50, 100, 200, 500, 1000]
-        for ms in options_ms:
+        cycle_frame = tk.LabelFrame(self.root, text="Default Cycle Time", padx=10, pady=5, font=("Arial", 11, "bold"))
+        cycle_frame.grid(row=4, column=0, sticky="w", padx=10)
+        for ms in CYCLE_TIME_OPTIONS_MS:
             tk.Radiobutton(
                 cycle_frame,
                 text=f"{ms} ms",
                 variable=self.cycle_time_ms,
                 value=ms
             ).pack(side="left", padx=3)
+        tk.Checkbutton(
+            cycle_frame,
+            text="Override DBC",
+            variable=self.cycle_override
+        ).pack(side="left", padx=3)
 
-        # Scrollable area for signals
+        # Virtualized, searchable area for signals
         signal_frame_container = tk.Frame(self.root, width=900, height=450)
-        signal_frame_container.grid(row=4, column=0, columnspan=3, pady=20, sticky="nsew")
-        signal_frame_container.grid_propagate(False)
-
-        # Scrollable canvas
-        canvas = tk.Canvas(signal_frame_container, highlightthickness=0, bg="white")
-        scrollbar = tk.Scrollbar(signal_frame_container, orient="vertical", command=canvas.yview)
-        self.signal_frame = tk.Frame(canvas, bg="white")
-
-        self.signal_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        canvas.create_window((0, 0), window=self.signal_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        # Bind trackpad scrolling gestures
-        def on_mouse_wheel(event):
-            canvas.yview_scroll(-1 * (event.delta // 120), "units")
-
-        # Bind scrolling gestures for Windows/Mac
-        canvas.bind_all("<MouseWheel>", on_mouse_wheel)
-
-        # Bind scrolling gestures for Linux
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        signal_frame_container.grid(row=5, column=0, columnspan=3, pady=20, sticky="nsew")
+        signal_frame_container.pack_propagate(False)
+        self.signal_list = VirtualSignalList(signal_frame_container, self)
+
+        # Status bar with DBC loading progress
+        status_bar = tk.Frame(self.root)
+        status_bar.grid(row=6, column=0, columnspan=3, sticky="ew", padx=10, pady=(0, 10))
+        tk.Label(status_bar, textvariable=self.dbc_status, font=("Arial", 10)).pack(side="left")
+        self.load_progress = ttk.Progressbar(status_bar, mode="indeterminate", length=200)
+        self.load_progress.pack(side="right")
+        tk.Button(status_bar, text="RX Monitor", command=self.show_rx_monitor, font=("Arial", 10)).pack(
+            side="right", padx=(10, 0))
+        tk.Button(status_bar, text="TX Stats", command=self.show_tx_stats, font=("Arial", 10)).pack(
+            side="right", padx=10)
+        tk.Label(status_bar, textvariable=self.bus_load_text, font=("Arial", 10)).pack(side="right", padx=10)
+        self.tx_health_label = tk.Label(status_bar, textvariable=self.tx_health_text, font=("Arial", 10))
+        self.tx_health_label.pack(side="right", padx=10)
 
     def start_interface(self):
         """Initialize the CAN interface connection."""
@@ -146,367 +807,469 @@ class CANSignalSenderApp:
             messagebox.showerror("Error", "Select a CAN bitrate!")
             return
 
+        channel = self.channel_selection.get().strip()
+        if channel in ("", "Select Channel"):
+            messagebox.showerror("Error", "Select or enter a channel!")
+            return
+        interface = self.interface_channel_map[self.interface_selection.get()][0]
+        for name, state in self.channel_states.items():
+            if state.bus_config == (interface, channel) and self.network.channels[name].is_open:
+                messagebox.showerror("Error", f"{interface} channel {channel} is already used by {name}!")
+                return
+
         try:
-            selected_interface_channel = self.interface_channel_map[self.interface_selection.get()]
-            interface = selected_interface_channel[0]
-            channel = selected_interface_channel[1]
             bitrate = self.bitrate_map[self.bitrate_selection.get()]
+            data_bitrate = self.data_bitrate_map.get(self.data_bitrate_selection.get())  # None: classical CAN
 
             # Create CAN bus connection
-            self.bus = can.interface.Bus(interface=interface, channel=channel, bitrate=bitrate)
-            messagebox.showinfo("Success", "CAN interface started successfully!")
+            engine = self.engine
+            engine.open_bus(interface, channel, bitrate, data_bitrate, separate_process=self.separate_process.get())
+            self.channel_states[self.current_channel.get()].bus_config = (interface, channel)
+            messagebox.showinfo("Success", f"{self.current_channel.get()}: CAN interface started successfully!")
             self.start_button.config(state="disabled")
+            self.separate_process_check.config(state="disabled")
+            self._apply_offload([engine])
+            self._schedule_list_refresh()  # signals of CAN FD messages may have been turned off
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start CAN interface: {str(e)}")
 
+    def _add_channel_state(self, name):
+        """Create a channel with the global cycle time and offload settings."""
+        engine = self.network.add_channel(name)
+        engine.set_default_cycle(self.cycle_time_ms.get(), override=self.cycle_override.get())
+        engine.set_offload(self.offload_tx.get())
+        engine.configure_tx_queue(policy=TX_OVERFLOW_OPTIONS[self.tx_overflow.get()])
+        self.channel_states[name] = _ChannelState(name)
+
+    def add_channel(self):
+        """Add another CAN channel (its own interface, bitrate and DBC) and select it."""
+        number = len(self.channel_states) + 1
+        while f"CAN {number}" in self.channel_states:
+            number += 1
+        name = f"CAN {number}"
+        self._add_channel_state(name)
+        self.channel_combo.config(values=list(self.channel_states))
+        self.current_channel.set(name)
+
+    def remove_channel(self):
+        """Stop and remove the selected channel."""
+        name = self.current_channel.get()
+        if len(self.channel_states) == 1:
+            messagebox.showerror("Error", "At least one channel is needed!")
+            return
+        if self.engine.is_open and not messagebox.askyesno(
+                "Remove Channel", f"{name} is running. Stop sending on it and remove it?"):
+            return
+        self._shown_channel = None  # nothing to save
+        self.network.remove_channel(name)
+        del self.channel_states[name]
+        self.channel_combo.config(values=list(self.channel_states))
+        self.current_channel.set(next(iter(self.channel_states)))
+
+    def _on_channel_selected(self, *_):
+        """Show the settings, DBC and signals of the selected channel."""
+        if self._shown_channel in self.channel_states:
+            state = self.channel_states[self._shown_channel]
+            state.interface = self.interface_selection.get()
+            state.channel = self.channel_selection.get()
+            state.bitrate = self.bitrate_selection.get()
+            state.data_bitrate = self.data_bitrate_selection.get()
+        name = self.current_channel.get()
+        self._shown_channel = name
+        state = self.channel_states[name]
+        engine = self.engine
+
+        self.interface_selection.set(state.interface)  # trace resets the channel choices
+        self.channel_selection.set(state.channel)
+        self.bitrate_selection.set(state.bitrate)
+        self.data_bitrate_selection.set(state.data_bitrate)
+        self.dbc_path.set(state.dbc_path)
+        self.dbc_status.set(state.dbc_status)
+        running = "disabled" if engine.is_open else "normal"
+        self.start_button.config(state=running)
+        self.separate_process_check.config(state=running)
+        self.record_button.config(text="Record..." if engine.recorder is None else "Stop Recording")
+        replaying = engine.replayer is not None and engine.replayer.running
+        self.replay_button.config(text="Stop Replay" if replaying else "Replay...")
+        if engine.db is not None:
+            self.signal_list.load(engine.db.messages, engine.signal_store)
+        else:
+            self.signal_list.clear()
+        if self.rx_panel is not None:
+            self.rx_panel.reset_view()
+        if self.stats_panel is not None:
+            self.stats_panel.refresh()
+
+    def _on_interface_changed(self, *_):
+        """Offer the detected channels of the selected interface, or its default channel."""
+        selected = self.interface_channel_map.get(self.interface_selection.get())
+        if selected is None:
+            self.hw_channel_combo.config(values=[])
+            return
+        interface, default_channel = selected
+        # Load the backend (vendor library) while the user picks the channel and bitrate
+        warm_up(interfaces=(interface,), modules=())
+        channels = self.discovered_channels.get(interface) or [default_channel]
+        self.hw_channel_combo.config(values=channels)
+        self.channel_selection.set(channels[0])
+
+    def detect_channels(self):
+        """Ask the drivers for available hardware channels on a worker thread (can take seconds)."""
+        self.detect_button.config(state="disabled")
+        self.detect_status.set("Detecting channels...")
+        results = queue.Queue()
+
+        def worker():
+            try:
+                results.put(("done", discover_channels()))
+            except Exception as e:
+                results.put(("error", e))
+
+        Thread(target=worker, daemon=True).start()
+        self.root.after(100, self._poll_detect_channels, results)
+
+    def _poll_detect_channels(self, results):
+        try:
+            kind, payload = results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self._poll_detect_channels, results)
+            return
+        self.detect_button.config(state="normal")
+        if kind == "error":
+            self.detect_status.set("Channel detection failed")
+            messagebox.showerror("Error", f"Failed to detect channels: {str(payload)}")
+            return
+        self.discovered_channels = payload
+        count = sum(len(channels) for channels in payload.values())
+        self.detect_status.set(f"{count} hardware channel(s) found")
+        # Keep a channel typed or chosen for the selected interface
+        selected = self.interface_channel_map.get(self.interface_selection.get())
+        if selected is not None:
+            self.hw_channel_combo.config(values=payload.get(selected[0]) or [selected[1]])
+
     def load_dbc(self):
-        """Load signals from a DBC file and create toggleable buttons."""
+        """Pick a DBC file and load it on a worker thread; the window stays responsive meanwhile."""
         file_path = filedialog.askopenfilename(filetypes=[("DBC Files", "*.dbc")])
-        if file_path:
+        if not file_path:
+            return
+
+        self.load_button.config(state="disabled")
+        self.load_progress.start(10)
+        results = queue.Queue()
+        # Looked up here: the worker must not touch Tk variables such as current_channel
+        channel_name = self.current_channel.get()
+        engine = self.engine
+
+        def worker():
             try:
-                self.db = cantools.database.load_file(file_path)
-                self.dbc_path.set(file_path)
+                prepared = engine.prepare_dbc(file_path, progress=lambda stage: results.put(("stage", stage)))
+                results.put(("done", prepared))
+            except Exception as e:
+                results.put(("error", e))
 
-                # Index messages by frame_id
-                self.messages_by_id.clear()
-                self.signal_to_message_id.clear()
-                self._destroy_signal_buttons()
+        Thread(target=worker, daemon=True).start()
+        self.root.after(20, self._poll_dbc_load, channel_name, file_path, results)
 
-                for message in self.db.messages:
-                    self.messages_by_id[message.frame_id] = message
+    def _poll_dbc_load(self, channel_name, file_path, results):
+        """Show worker progress and install the DBC once it is loaded (runs on the Tk main thread)."""
+        try:
+            while True:
+                kind, payload = results.get_nowait()
+                if kind == "stage":
+                    self.dbc_status.set(f"{payload}...")
+                    continue
+                self.load_progress.stop()
+                self.load_button.config(state="normal")
+                if kind == "error":
+                    self.dbc_status.set("DBC loading failed")
+                    messagebox.showerror("Error", f"Failed to load DBC: {str(payload)}")
+                else:
+                    self._install_dbc(channel_name, file_path, *payload)
+                return
+        except queue.Empty:
+            self.root.after(20, self._poll_dbc_load, channel_name, file_path, results)
+
+    def _install_dbc(self, channel_name, file_path, loaded, encoders):
+        """Replace the DBC of a channel with a loaded one and, if it is shown, create its signal rows."""
+        state = self.channel_states.get(channel_name)
+        if state is None:
+            return  # the channel was removed while loading
+        try:
+            engine = self.network.channels[channel_name]
+            engine.install_dbc(loaded, encoders)
+            state.dbc_path = file_path
 
-                # Display the list of signals as toggleable rows
-                self.create_signal_buttons()
-                messagebox.showinfo("Success", f"DBC Loaded: {file_path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load DBC: {str(e)}")
-
-    def _destroy_signal_buttons(self):
-        if self.signal_frame is not None:
-            for widget in self.signal_frame.winfo_children():
-                widget.destroy()
-        # Clear previous UI state
-        self.signal_entries.clear()
-        self.toggling.clear()
-        self.toggle_buttons.clear()
-
-    def _signal_limits_physical(self, sig):
-        """
-        Compute physical min/max for a signal.
-        Uses DBC-provided limits if present; otherwise derives from bit length and signedness with scale/offset.
-        """
-        scale = sig.scale if sig.scale is not None else 1.0
-        offset = sig.offset if sig.offset is not None else 0.0
-        if sig.minimum is not None and sig.maximum is not None:
-            return float(sig.minimum), float(sig.maximum)
-
-        length = sig.length
-        if sig.is_signed:
-            raw_min = -(1 << (length - 1))
-            raw_max = (1 << (length - 1)) - 1
-        else:
-            raw_min = 0
-            raw_max = (1 << length) - 1
+            # Every entry defaults to auto-increment "A"
+            state.signal_entry_texts = ["A"] * len(engine.signal_store)
 
-        phys_min = raw_min * scale + offset
-        phys_max = raw_max * scale + offset
-        # Ensure ordering
-        if phys_min > phys_max:
-            phys_min, phys_max = phys_max, phys_min
-        return float(phys_min), float(phys_max)
+            source = "cache" if loaded.from_cache else "file"
+            state.dbc_status = (
+                f"{len(engine.db.messages)} messages, {len(engine.signal_store)} signals (loaded from {source})"
+            )
+            if channel_name == self.current_channel.get():
+                # Display the list of signals as toggleable rows
+                self.dbc_path.set(file_path)
+                self.dbc_status.set(state.dbc_status)
+                self.signal_list.load(engine.db.messages, engine.signal_store)
+                if self.rx_panel is not None:
+                    self.rx_panel.clear()
+            else:
+                # The status bar showed the loading progress; show the selected channel again
+                self.dbc_status.set(self.channel_states[self.current_channel.get()].dbc_status)
+            messagebox.showinfo("Success", f"{channel_name}: DBC Loaded: {file_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load DBC: {str(e)}")
 
-    def _neutral_value(self, sig):
+    def set_message_cycle_time(self, message, text):
         """
-        Choose a neutral 'off' physical value for a signal:
-        - Prefer 0.0 clamped within physical range
-        - If 0.0 outside range, fall back to physical minimum
+        Apply the per-message cycle time typed in a message header.
+        An empty entry removes the per-message value so the DBC/global cycle time applies again.
+        Returns the text the entry should show instead, or None to keep it.
         """
-        phys_min, phys_max = self._signal_limits_physical(sig)
-        neutral = 0.0
-        if neutral < phys_min:
-            neutral = phys_min
-        if neutral > phys_max:
-            neutral = phys_max
-        return neutral
-
-    def create_signal_buttons(self):
-        """Create toggleable rows for each signal in the DBC."""
-        for message in self.db.messages:
-            for signal in message.signals:
-                signal_name = signal.name
-                phys_min, phys_max = self._signal_limits_physical(signal)
-
-                # Map signal -> message (frame)
-                self.signal_to_message_id[signal_name] = message.frame_id
-
-                # Each signal row
-                frame = tk.Frame(self.signal_frame)
-                frame.pack(fill="x", pady=2)
-
-                # Signal name and min/max (show as physical/decoded)
-                tk.Label(frame, text=f"{signal_name} (Min: {phys_min:g}, Max: {phys_max:g})").pack(side="left", padx=5)
-
-                # Entry box for signal value (decoded/physical units)
-                value_entry = tk.Entry(frame, width=12, font=("Arial", 10))
-                value_entry.pack(side="left", padx=5)
-                # Default to auto-increment "A"
-                value_entry.insert(0, "A")
-                self.signal_entries[signal_name] = value_entry
-
-                # Start/Stop toggle button
-                self.toggling[signal_name] = False
-
-                toggle_button = tk.Button(
-                    frame,
-                    text=f"Off: {signal_name}",
-                    bg="lightgray",
-                    relief="raised",
-                    font=("Arial", 10, "bold")
-                )
-                toggle_button.config(
-                    command=lambda s=signal_name, m=message, max_v=phys_max,
-                                   entry=value_entry, btn=toggle_button: self.toggle_signal_with_custom_value(
-                        s, m, max_v, entry, btn
-                    )
-                )
-                toggle_button.pack(side="right", padx=5, pady=2)
-                self.toggle_buttons[signal_name] = toggle_button
-
-    def toggle_signal_with_custom_value(self, signal_name, message, phys_max, value_entry, button):
+        frame_id = message.frame_id
+        raw = text.strip()
+        if raw == "":
+            self.engine.set_message_cycle(frame_id, None)
+            return None
+        try:
+            cycle_ms = int(raw)
+            if cycle_ms <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", f"Invalid cycle time for {message.name}. Use a positive number of ms.")
+            previous = self.engine.message_cycle_overrides.get(frame_id)
+            return "" if previous is None else str(previous)
+        self.engine.set_message_cycle(frame_id, cycle_ms)
+        return None
+
+    def on_signal_entry_changed(self, sid, text):
+        """Push an edited entry to the signal store; invalid text sends the physical minimum."""
+        self.signal_entry_texts[sid] = text
+        self.engine.set_signal_value_lenient(sid, text)
+
+    def toggle_signal(self, sid):
         """
-        Toggle start/stop of a signal with custom value input via Entry and provide on/off feedback.
+        Toggle start/stop of a signal using the value typed in its entry and provide on/off feedback.
         Entry expects:
           - 'A' (case-insensitive) for auto-increment mode (default)
           - a numeric value for constant transmission (including 0)
+          - a waveform generator, e.g. 'sine(2)', 'ramp(10, 0, 8000)' or 'steps(1, 0, 50, 100)'
         """
-        if not self.bus:
+        if not self.engine.is_open:
             messagebox.showerror("Error", "Start the CAN interface first!")
             return
 
-        if not self.toggling[signal_name]:
-            # Validate entry; accept 'A' or a valid number
-            raw = value_entry.get().strip()
-            if raw.upper() != "A":
-                try:
-                    _ = float(raw)
-                except ValueError:
-                    messagebox.showerror("Error", f"Invalid value for {signal_name}. Use 'A' or a number.")
-                    return
-
-            # Turn ON
-            self.toggling[signal_name] = True
-            self._ensure_message_worker(message)
-            button.config(text=f"On: {signal_name}", bg="green", relief="sunken")
+        if not self.engine.signal_store.is_active(sid):
+            # Validate entry; accept 'A', a valid number or a generator
+            try:
+                self.engine.set_signal_value(sid, self.signal_entry_texts[sid])
+            except ValueError as e:
+                signal_name = self.engine.signal_store.names[sid]
+                messagebox.showerror(
+                    "Error",
+                    f"Invalid value for {signal_name}: {str(e)}\n"
+                    "Use 'A', a number or a generator such as sine(2), ramp(10) or steps(1, 0, 50)."
+                )
+                return
+            try:
+                self.engine.signal_on(sid)
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
         else:
-            # Turn OFF
-            self.toggling[signal_name] = False
-            # Immediately send a single "final off" frame for this signal
-            self._send_final_off_for_signal(message, signal_name)
-            self._stop_message_worker_if_idle(message)
-            button.config(text=f"Off: {signal_name}", bg="lightgray", relief="raised")
+            self.engine.signal_off(sid)
+        self._schedule_list_refresh()
 
-    def toggle_all_on(self):
-        """Turn on all signals and start workers as needed."""
-        if not self.bus:
-            messagebox.showerror("Error", "Start the CAN interface first!")
+    def toggle_signals(self, sids, on):
+        """
+        Turn a group of signals on or off as one batch: each affected message is scheduled once or gets
+        a single final-off frame, and the rows on screen are updated once afterwards.
+        Entries that are empty or invalid are set to 'A' when turning on.
+        """
+        if not len(self.engine.signal_store):
+            if on:
+                messagebox.showerror("Error", "Load a DBC first!")
             return
-        # Ensure DBC loaded
-        if not self.signal_entries:
-            messagebox.showerror("Error", "Load a DBC first!")
+        if not on:
+            self.engine.signals_off(sids)
+            self._schedule_list_refresh()
+            return
+        if not self.engine.is_open:
+            messagebox.showerror("Error", "Start the CAN interface first!")
             return
 
-        # Validate values (set invalid to 'A')
-        for name, entry in self.signal_entries.items():
-            raw = entry.get().strip()
-            if raw == "":
-                entry.delete(0, tk.END)
-                entry.insert(0, "A")
-                raw = "A"
-            if raw.upper() != "A":
-                try:
-                    _ = float(raw)
-                except ValueError:
-                    entry.delete(0, tk.END)
-                    entry.insert(0, "A")
-
-        # Turn all on and ensure workers
-        for name in list(self.toggling.keys()):
-            self.toggling[name] = True
-            frame_id = self.signal_to_message_id.get(name)
-            if frame_id is not None:
-                msg = self.messages_by_id.get(frame_id)
-                if msg is not None:
-                    self._ensure_message_worker(msg)
-            # Update buttons
-            btn = self.toggle_buttons.get(name)
-            if btn is not None:
-                btn.config(text=f"On: {name}", bg="green", relief="sunken")
+        # Validate values (set empty/invalid to 'A')
+        for sid in sids:
+            raw = self.signal_entry_texts[sid]
+            try:
+                parse_signal_entry(raw)
+            except ValueError:
+                raw = ""
+            if raw.strip() == "":
+                self.on_signal_entry_changed(sid, "A")
 
-    def toggle_all_off(self):
-        """Turn off all signals, send final off for each, and stop idle workers."""
-        if not self.signal_entries:
-            return
+        try:
+            self.engine.signals_on(sids)
+        except ValueError as e:
+            # The other signals are on; only the named messages were skipped
+            messagebox.showerror("Error", str(e))
+        self._schedule_list_refresh()
 
-        # Set all off and send final-off per signal
-        handled_msgs = set()
-        for name in list(self.toggling.keys()):
-            if self.toggling[name]:
-                self.toggling[name] = False
-                frame_id = self.signal_to_message_id.get(name)
-                if frame_id is not None:
-                    msg = self.messages_by_id.get(frame_id)
-                    if msg is not None:
-                        self._send_final_off_for_signal(msg, name)
-                        handled_msgs.add(frame_id)
-            # Update buttons
-            btn = self.toggle_buttons.get(name)
-            if btn is not None:
-                btn.config(text=f"Off: {name}", bg="lightgray", relief="raised")
-
-        # Stop workers if idle
-        for frame_id in handled_msgs:
-            msg = self.messages_by_id.get(frame_id)
-            if msg is not None:
-                self._stop_message_worker_if_idle(msg)
-
-    def _ensure_message_worker(self, message):
-        """Start a single worker thread for this message if not already running."""
-        frame_id = message.frame_id
-        if frame_id not in self.message_stop_events:
-            self.message_stop_events[frame_id] = Event()
-        stop_event = self.message_stop_events[frame_id]
-
-        if frame_id not in self.message_threads or not self.message_threads[frame_id].is_alive():
-            # Initialize per-message current values to signal minimums (physical)
-            self.message_current_values[frame_id] = {
-                sig.name: self._signal_limits_physical(sig)[0] for sig in message.signals
-            }
-            stop_event.clear()
-            t = Thread(target=self._message_worker, args=(message,))
-            t.daemon = True
-            self.message_threads[frame_id] = t
-            t.start()
-
-    def _stop_message_worker_if_idle(self, message):
-        """Stop the worker if no signals for this message are currently toggled on."""
-        frame_id = message.frame_id
-        any_active = any(self.toggling.get(sig.name, False) for sig in message.signals)
-        if not any_active and frame_id in self.message_stop_events:
-            self.message_stop_events[frame_id].set()
-            if frame_id in self.message_threads:
-                self.message_threads[frame_id].join(timeout=2)
+    def toggle_all_on(self):
+        """Turn on all signals and schedule their messages."""
+        self.toggle_signals(range(len(self.engine.signal_store)), True)
 
-    def _send_final_off_for_signal(self, message, signal_name):
-        """
-        Build and send a single frame for 'message' where only 'signal_name' is forced to its neutral (zero) value.
-        Other signals keep their last known values to avoid disturbing them.
-        """
-        if not self.bus:
+    def toggle_all_off(self):
+        """Turn off all signals, send one final-off frame per message, and unschedule idle messages."""
+        self.toggle_signals(range(len(self.engine.signal_store)), False)
+
+    def _schedule_list_refresh(self):
+        """Update the rows on screen once, after the current event has been handled."""
+        if not self._list_refresh_pending:
+            self._list_refresh_pending = True
+            self.root.after_idle(self._refresh_list)
+
+    def _refresh_list(self):
+        self._list_refresh_pending = False
+        self.signal_list.refresh()
+
+    def _on_offload_tx_changed(self, *_):
+        """Move cyclic transmission of every channel between the TX scheduler and the interface's periodic tasks."""
+        self._apply_offload(list(self.network.channels.values()))
+
+    def _apply_offload(self, engines):
+        requested = self.offload_tx.get()
+        not_offloaded = [engine for engine in engines if not engine.set_offload(requested) and engine.is_open]
+        if requested and not_offloaded:
+            messagebox.showinfo(
+                "Offloaded TX",
+                "This interface has no native periodic transmission; the built-in scheduler keeps sending."
+            )
+
+    def _on_tx_overflow_changed(self, *_):
+        """Apply the TX queue overflow policy to every channel."""
+        for engine in self.network.channels.values():
+            engine.configure_tx_queue(policy=TX_OVERFLOW_OPTIONS[self.tx_overflow.get()])
+
+    def _on_cycle_time_changed(self, *_):
+        """Re-evaluate the cycle time of every scheduled message after a global cycle setting changed."""
+        for engine in self.network.channels.values():
+            engine.set_default_cycle(self.cycle_time_ms.get(), override=self.cycle_override.get())
+
+    def toggle_recording(self):
+        """Start recording sent and received frames to a BLF/ASC file, or stop the running recording."""
+        if self.engine.recorder is not None:
+            recorder = self.engine.stop_recording()
+            self.record_button.config(text="Record...")
+            messagebox.showinfo("Recording", f"{recorder.recorded} frames written to {recorder.path}")
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".blf", filetypes=LOG_FILE_TYPES)
+        if not file_path:
             return
         try:
-            frame_id = message.frame_id
-            # Start from last known values or physical mins if absent
-            base_vals = dict(self.message_current_values.get(frame_id, {
-                sig.name: self._signal_limits_physical(sig)[0] for sig in message.signals
-            }))
-            # Force the target signal to neutral
-            target_sig = next((s for s in message.signals if s.name == signal_name), None)
-            if target_sig is None:
-                return
-            base_vals[signal_name] = self._neutral_value(target_sig)
+            self.engine.start_recording(file_path)
+            self.record_button.config(text="Stop Recording")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to start recording: {str(e)}")
 
-            encoded = message.encode(base_vals)
-            msg = can.Message(
-                arbitration_id=message.frame_id,
-                data=encoded,
-                is_extended_id=message.is_extended_frame
+    def toggle_replay(self):
+        """Replay a BLF/ASC log at its original timing (scaled by the speed factor), or stop the replay."""
+        if self.engine.replayer is not None and self.engine.replayer.running:
+            self.engine.stop_replay()
+            self.replay_button.config(text="Replay...")
+            return
+        if not self.engine.is_open:
+            messagebox.showerror("Error", "Start the CAN interface first!")
+            return
+        try:
+            speed = float(self.replay_speed.get())
+            if speed <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Invalid replay speed. Use a positive number (1.0 = original timing).")
+            return
+        file_path = filedialog.askopenfilename(filetypes=LOG_FILE_TYPES)
+        if not file_path:
+            return
+        try:
+            self.engine.start_replay(
+                file_path, speed=speed, tx_only=self.replay_tx_only.get(),
+                on_finished=lambda replayer: self.engine_events.put((self._on_replay_finished, (replayer,)))
             )
-            self.bus.send(msg)
-            # Update cached values to reflect the off-send
-            self.message_current_values[frame_id] = base_vals
+            self.replay_button.config(text="Stop Replay")
         except Exception as e:
-            messagebox.showerror("Error",
-                                 f"Failed to send final off for {signal_name} (0x{message.frame_id:X}): {str(e)}")
-
-    def _message_worker(self, message):
-        """
-        Single worker per message:
-        - Entry boxes contain DECoded/physical values.
-        - Each tick:
-            - If a signal is toggled ON and entry == 'A' (case-insensitive): increment physical value by 1.0 until max, then stay at max.
-            - If toggled ON and entry is numeric: clamp to [phys_min, phys_max] and use it directly (0 allowed).
-            - If toggled OFF: force the signal to its neutral 'off' value (e.g., 0.0 clamped), so it no longer carries the last value.
-        - Send at the globally selected cycle time.
-        """
-        frame_id = message.frame_id
-        stop_event = self.message_stop_events[frame_id]
-        current_values = self.message_current_values.get(frame_id) or {
-            sig.name: self._signal_limits_physical(sig)[0] for sig in message.signals
-        }
-
-        # Precompute physical min/max per signal
-        limits = {sig.name: self._signal_limits_physical(sig) for sig in message.signals}
-        neutrals = {sig.name: self._neutral_value(sig) for sig in message.signals}
+            messagebox.showerror("Error", f"Failed to start replay: {str(e)}")
+
+    def _on_replay_finished(self, replayer):
+        """Replay thread finished (end of log, error or stop); runs on the Tk main thread."""
+        if self.engine.replayer is not replayer:
+            return  # stopped by the user, or a newer replay is running
+        self.replay_button.config(text="Replay...")
+        if replayer.error is None:
+            messagebox.showinfo("Replay", f"Replay finished: {replayer.sent} frames sent")
+
+    def show_tx_stats(self):
+        """Open the TX statistics window, or raise it if it is already open."""
+        if self.stats_panel is None:
+            self.stats_panel = TxStatsPanel(self)
+        else:
+            self.stats_panel.window.lift()
 
-        while not stop_event.is_set():
+    def show_rx_monitor(self):
+        """Open the RX monitor window, or raise it if it is already open."""
+        if self.rx_panel is None:
+            self.rx_panel = RxMonitorPanel(self)
+        else:
+            self.rx_panel.window.lift()
+
+    def _refresh_tx_stats(self):
+        """Low-rate refresh of the bus load and the statistics window."""
+        started = time.perf_counter()
+        loads = self.network.bus_loads()
+        if not loads:
+            self.bus_load_text.set("Bus load: -")
+        elif len(self.channel_states) == 1:
+            self.bus_load_text.set(f"Bus load: {next(iter(loads.values())):.1f} %")
+        else:
+            self.bus_load_text.set("Bus load: " + ", ".join(
+                f"{name} {'-' if load is None else f'{load:.1f} %'}" for name, load in loads.items()))
+        self._refresh_tx_health()
+        if self.stats_panel is not None:
+            self.stats_panel.refresh()
+        # Shows up next to the send path in a profile, where it competes with it for the GIL
+        self.engine.record_gui_work(started)
+        self.root.after(STATS_REFRESH_MS, self._refresh_tx_stats)
+
+    def _refresh_tx_health(self):
+        """Aggregated send problems of every channel; red while a channel's sends are failing."""
+        parts = []
+        degraded = False
+        for name, engine in self.network.channels.items():
+            status = engine.tx_queue_status()
+            if not status or not (status["retries"] or status["dropped"] or status["failed"]):
+                continue
+            text = f"{status['retries']} retries, {status['dropped']} dropped, {status['failed']} failed"
+            if status["degraded"]:
+                degraded = True
+                text += f" ({status['last_error']})"
+            parts.append(text if len(self.channel_states) == 1 else f"{name}: {text}")
+        self.tx_health_text.set("TX: " + "; ".join(parts) if parts else "")
+        self.tx_health_label.config(fg="red" if degraded else "black")
+
+    def _show_engine_error(self, text):
+        """Engine error callback; may run on the scheduler thread, so the dialog is queued for the Tk thread."""
+        self.engine_events.put((messagebox.showerror, ("Error", text)))
+
+    def _poll_engine_events(self):
+        """Run the events queued by engine threads; only this (main) thread touches Tk."""
+        while True:
             try:
-                any_active = False
-
-                for sig in message.signals:
-                    name = sig.name
-                    phys_min, phys_max = limits[name]
-                    neutral = neutrals[name]
-                    entry_widget = self.signal_entries.get(name)
-
-                    if self.toggling.get(name, False):
-                        any_active = True
-                        # Read entry; 'A' means auto-increment
-                        entry_text = entry_widget.get().strip() if entry_widget is not None else "A"
-                        if entry_text.upper() == "A" or entry_text == "":
-                            # Auto-increment by 1.0 physical unit up to max, then stay at max
-                            val = current_values.get(name, phys_min)
-                            if val < phys_max:
-                                val = min(val + 1.0, phys_max)
-                            else:
-                                val = phys_max
-                            current_values[name] = val
-                        else:
-                            # Use entry value directly, clamp within physical limits
-                            try:
-                                entry_val = float(entry_text)
-                            except Exception:
-                                entry_val = phys_min
-                            if entry_val < phys_min:
-                                entry_val = phys_min
-                            if entry_val > phys_max:
-                                entry_val = phys_max
-                            current_values[name] = entry_val
-                    else:
-                        # OFF: explicitly set to neutral (do not keep the last value)
-                        current_values[name] = neutral
-
-                # Only send if at least one signal is active for this message
-                if any_active:
-                    encoded = message.encode(current_values)
-                    msg = can.Message(
-                        arbitration_id=message.frame_id,
-                        data=encoded,
-                        is_extended_id=message.is_extended_frame
-                    )
-                    self.bus.send(msg)
-
-                # Respect global cycle time and remain responsive to stop
-                interval = max(0.001, self.cycle_time_ms.get() / 1000.0)
-                if stop_event.wait(interval):
-                    break
-
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to send message 0x{message.frame_id:X}: {str(e)}")
+                function, args = self.engine_events.get_nowait()
+            except queue.Empty:
                 break
-
-        # Persist last known values
-        self.message_current_values[frame_id] = current_values
+            function(*args)
+        self.root.after(ENGINE_EVENT_POLL_MS, self._poll_engine_events)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+"""
+Compare the compiled FrameEncoder with cantools' message.encode across a whole DBC.
+
+Usage:
+    python benchmarks/encoder_benchmark.py path/to/file.dbc [--iterations N]
+
+For every message that FrameEncoder supports, two value sets within the signal limits are
+generated and checked for byte-identical output. Then each encoder is timed for:
+- 'changing': every call alternates between the two value sets (all signals re-packed)
+- 'constant': every call uses the same values (cached payload)
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import cantools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from can_engine.encoder import FrameEncoder  # noqa: E402
+
+
+def random_values(message, rng):
+    """One physical value per signal, taken from the signal's raw range."""
+    values = {}
+    for sig in message.signals:
+        if sig.is_float:
+            values[sig.name] = rng.uniform(-1000.0, 1000.0)
+            continue
+        if sig.is_signed:
+            raw = rng.randint(-(1 << (sig.length - 1)), (1 << (sig.length - 1)) - 1)
+        else:
+            raw = rng.randint(0, (1 << sig.length) - 1)
+        values[sig.name] = raw * sig.scale + sig.offset
+    return values
+
+
+def time_encoder(encode, value_sets, iterations):
+    """Seconds per call of encode() cycling through value_sets."""
+    count = len(value_sets)
+    start = time.perf_counter()
+    for i in range(iterations):
+        encode(value_sets[i % count])
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dbc", help="DBC file to benchmark")
+    parser.add_argument("--iterations", type=int, default=2000, help="encode calls per message and case")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    db = cantools.database.load_file(args.dbc)
+    rng = random.Random(args.seed)
+
+    totals = {"cantools": 0.0, "compiled changing": 0.0, "compiled constant": 0.0}
+    benchmarked = 0
+    skipped = 0
+    for message in db.messages:
+        if not message.signals or not FrameEncoder.supports(message):
+            skipped += 1
+            continue
+        value_sets = [random_values(message, rng), random_values(message, rng)]
+        encoder = FrameEncoder(message)
+        for values in value_sets:
+            expected = message.encode(values)
+            actual = encoder.encode(values)
+            if expected != actual:
+                sys.exit(f"Mismatch for {message.name}: cantools {expected.hex()} != compiled {actual.hex()}")
+
+        totals["cantools"] += time_encoder(lambda v: message.encode(v), value_sets, args.iterations)
+        totals["compiled changing"] += time_encoder(encoder.encode, value_sets, args.iterations)
+        totals["compiled constant"] += time_encoder(encoder.encode, value_sets[:1], args.iterations)
+        benchmarked += 1
+
+    if not benchmarked:
+        sys.exit("No messages supported by FrameEncoder in this DBC")
+
+    print(f"{benchmarked} messages benchmarked, {skipped} skipped (multiplexed, container or empty)")
+    print("Time to encode every message once:")
+    baseline = totals["cantools"]
+    for name, total in totals.items():
+        print(f"  {name:<18} {total * 1e6:10.1f} us   ({baseline / total:5.1f}x vs cantools)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Measure how long the application takes to start, in fresh interpreters.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs N] [--dbc file.dbc] [--output results.json]
+
+Each scenario runs --runs times in a new Python process; the median and minimum wall times are
+reported:
+- 'interpreter': an empty interpreter, the floor of every other number
+- 'gui': executing the GUI script without creating the window (its imports and definitions),
+  i.e. everything that happens before the window can appear
+- 'gui + eager imports': 'gui' plus the modules the application now defers (cantools, NumPy,
+  diskcache) and the PCAN backend, which used to be imported at startup
+- 'first DBC load' (with --dbc): 'gui' plus CanEngine.load_dbc() without the DBC cache, where the
+  cantools import is paid now
+
+The difference between 'gui + eager imports' and 'gui' is the startup time saved by importing on
+demand. The modules found loaded after 'gui' are listed, to catch new eager imports. Results
+are printed and written as JSON, so runs of different versions can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUI_SCRIPT = os.path.join(ROOT, "Cluster Testing Application.py")
+
+sys.path.insert(0, ROOT)
+
+from can_engine import DEFERRED_MODULES  # noqa: E402
+
+EAGER_BACKENDS = ("can.interfaces.pcan",)
+
+# Runs the GUI script under a name other than __main__, so the window is not created
+_LOAD_GUI = f"import runpy; runpy.run_path({GUI_SCRIPT!r}, run_name='startup_benchmark')"
+
+
+def scenarios(dbc):
+    """{name: code run by 'python -c'} of every measured scenario."""
+    eager = "; ".join(f"__import__({name!r})" for name in DEFERRED_MODULES + EAGER_BACKENDS)
+    result = {
+        "interpreter": "pass",
+        "gui": _LOAD_GUI,
+        "gui + eager imports": f"{_LOAD_GUI}; {eager}",
+    }
+    if dbc:
+        result["first DBC load"] = (
+            f"{_LOAD_GUI}; from can_engine import CanEngine, DbcCache; "
+            f"CanEngine(dbc_cache=DbcCache(directory=None)).load_dbc({os.path.abspath(dbc)!r})"
+        )
+    return result
+
+
+def time_run(code):
+    """Wall time in seconds of one fresh 'python -c code'."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def loaded_after_gui():
+    """Deferred modules and backends that are imported by the GUI script anyway (should be none)."""
+    names = DEFERRED_MODULES + EAGER_BACKENDS
+    code = f"{_LOAD_GUI}; import sys; print(','.join(n for n in {names!r} if n in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True)
+    return [name for name in output.stdout.strip().split(",") if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreters per scenario (default: 7)")
+    parser.add_argument("--dbc", help="also time the first DBC load with this file")
+    parser.add_argument("--output", default="startup_benchmark.json", help="JSON result file")
+    args = parser.parse_args()
+
+    # One untimed run per scenario first, so every scenario sees warm OS file caches
+    runs = scenarios(args.dbc)
+    for code in runs.values():
+        time_run(code)
+
+    results = []
+    print(f"{'scenario':<22} {'median ms':>10} {'min ms':>8}")
+    for name, code in runs.items():
+        times = [time_run(code) for _ in range(args.runs)]
+        result = {
+            "scenario": name,
+            "median_ms": round(statistics.median(times) * 1000.0, 1),
+            "min_ms": round(min(times) * 1000.0, 1),
+        }
+        results.append(result)
+        print(f"{name:<22} {result['median_ms']:>10.1f} {result['min_ms']:>8.1f}")
+
+    by_name = {result["scenario"]: result for result in results}
+    saved = by_name["gui + eager imports"]["median_ms"] - by_name["gui"]["median_ms"]
+    eager = loaded_after_gui()
+    print(f"Saved at startup by deferred imports: {saved:.1f} ms (median)")
+    print(f"Deferred modules loaded at startup anyway: {', '.join(eager) or 'none'}")
+
+    report = {
+        "benchmark": "startup_benchmark",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "runs": args.runs,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+        "saved_ms": round(saved, 1),
+        "loaded_at_startup": eager,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
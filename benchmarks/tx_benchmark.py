@@ -0,0 +1,254 @@
+"""
+Measure TX timing and throughput of CanEngine on the virtual bus.
+
+Usage:
+    python benchmarks/tx_benchmark.py [--messages N] [--signals M] [--cycles 10 100 ...]
+                                      [--duration S] [--dbc file.dbc] [--output results.json]
+                                      [--profile trace.json]
+
+The "Virtual CAN" interface from INTERFACE_CHANNEL_MAP is opened by the engine and a second
+bus on the same channel receives every frame. N messages x M signals (generated, or the
+messages of --dbc) are turned on in auto-increment mode and sent through the real TX path
+(scheduler -> payload build/encode -> TX queue -> bus.send) at each cycle time. For every
+cycle time the report contains:
+- frames/s achieved vs. expected
+- period jitter percentiles (received period minus cycle time, per frame, in ms)
+- payload build + encode time per frame
+- CPU use of the process (% of one core) and thread count
+
+Results are printed as a table and written as JSON, so runs of different versions can be
+compared to spot regressions.
+
+With --profile the send path is profiled (CanEngine.start_profiling) over the whole run: the
+Chrome trace is written to the given file and the per-frame summary next to it as
+<name>_summary.csv. The encode column then stays empty (see the summary instead); comparing the
+jitter and CPU use with a run without --profile shows the cost of profiling.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+import can
+import cantools
+from cantools.database.can import Database, Message, Signal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from can_engine import (  # noqa: E402
+    CYCLE_TIME_OPTIONS_MS,
+    INTERFACE_CHANNEL_MAP,
+    CanEngine,
+    DbcCache,
+    LoadedDbc,
+    build_signal_tables,
+    make_frame_encoder,
+)
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def synthetic_database(message_count, signal_count):
+    """message_count 8-byte messages, each with signal_count unsigned little-endian signals."""
+    if not 1 <= signal_count <= 64:
+        raise ValueError("--signals must be between 1 and 64")
+    width = 64 // signal_count
+    messages = []
+    for m in range(message_count):
+        signals = [
+            Signal(f"M{m}_S{s}", s * width, width, minimum=0, maximum=(1 << width) - 1)
+            for s in range(signal_count)
+        ]
+        messages.append(Message(0x100 + m, f"M{m}", 8, signals))
+    return Database(messages)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def drain(rx_bus):
+    """{frame_id: [timestamp, ...]} of every frame waiting on the receiving bus."""
+    timestamps = {}
+    while True:
+        msg = rx_bus.recv(0)
+        if msg is None:
+            return timestamps
+        timestamps.setdefault(msg.arbitration_id, []).append(msg.timestamp)
+
+
+def run_configuration(engine, rx_bus, cycle_ms, duration, settle):
+    """
+    Send every message at cycle_ms for 'duration' seconds and return the measurements.
+    While the engine is profiling, its profiled send path does not call _build_payload, so no encode times are taken.
+    """
+    encode_times = []
+    build_payload = engine._build_payload
+
+    def timed_build_payload(message):
+        start = time.perf_counter()
+        payload = build_payload(message)
+        encode_times.append(time.perf_counter() - start)
+        return payload
+
+    engine._build_payload = timed_build_payload
+    engine.set_default_cycle(cycle_ms, override=True)
+    try:
+        engine.all_on()
+        # Let the first deadlines pass before measuring
+        time.sleep(settle)
+        drain(rx_bus)
+        del encode_times[:]
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        time.sleep(duration / 2)
+        threads = threading.active_count()
+        time.sleep(duration / 2)
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+        sent_payloads = len(encode_times)
+        encode = sorted(encode_times)
+        # Collect before all_off(), whose final-off frames are not part of the cyclic traffic
+        timestamps = drain(rx_bus)
+    finally:
+        engine.all_off()
+        engine._build_payload = build_payload
+    drain(rx_bus)
+
+    period = cycle_ms / 1000.0
+    deviations_ms = []
+    frames = 0
+    for stamps in timestamps.values():
+        frames += len(stamps)
+        deviations_ms.extend((b - a - period) * 1000.0 for a, b in zip(stamps, stamps[1:]))
+    deviations_ms.sort()
+    abs_deviations = sorted(abs(d) for d in deviations_ms)
+    message_count = len(engine.messages_by_id)
+
+    return {
+        "cycle_ms": cycle_ms,
+        "duration_s": round(wall, 3),
+        "frames_received": frames,
+        "payloads_built": None if engine.profiling else sent_payloads,
+        "frames_per_s": round(frames / wall, 1),
+        "expected_frames_per_s": round(message_count / period, 1),
+        "jitter_ms": {
+            "min": round(deviations_ms[0], 3) if deviations_ms else None,
+            "max": round(deviations_ms[-1], 3) if deviations_ms else None,
+            "mean_abs": round(sum(abs_deviations) / len(abs_deviations), 3) if abs_deviations else None,
+            **{f"p{pct:g}_abs": _round(percentile(abs_deviations, pct), 3) for pct in PERCENTILES},
+        },
+        "encode_us": {
+            "mean": _round(sum(encode) / len(encode) * 1e6, 2) if encode else None,
+            **{f"p{pct:g}": _round(_scale(percentile(encode, pct), 1e6), 2) for pct in PERCENTILES},
+        },
+        "cpu_percent": round(cpu / wall * 100.0, 1),
+        "threads": threads,
+    }
+
+
+def _scale(value, factor):
+    return None if value is None else value * factor
+
+
+def _round(value, digits):
+    return None if value is None else round(value, digits)
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value:.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=50, help="generated messages (default: 50)")
+    parser.add_argument("--signals", type=int, default=8, help="signals per generated message (default: 8)")
+    parser.add_argument("--dbc", help="benchmark the messages of this DBC instead of generated ones")
+    parser.add_argument("--cycles", type=int, nargs="+", default=CYCLE_TIME_OPTIONS_MS,
+                        help="cycle times in ms (default: the GUI options)")
+    parser.add_argument("--duration", type=float, default=3.0, help="measured seconds per cycle time")
+    parser.add_argument("--min-periods", type=int, default=20,
+                        help="measure at least this many periods, for long cycle times (default: 20)")
+    parser.add_argument("--output", default="tx_benchmark.json", help="JSON result file")
+    parser.add_argument("--profile", help="profile the send path and write a Chrome trace to this file")
+    args = parser.parse_args()
+
+    interface, channel = INTERFACE_CHANNEL_MAP["Virtual CAN"]
+    engine = CanEngine(dbc_cache=DbcCache(directory=None))
+    if args.dbc:
+        engine.load_dbc(args.dbc)
+        source = os.path.basename(args.dbc)
+    else:
+        db = synthetic_database(args.messages, args.signals)
+        encoders = {message.frame_id: make_frame_encoder(message) for message in db.messages}
+        engine.install_dbc(LoadedDbc(db, build_signal_tables(db)), encoders)
+        source = f"generated {args.messages}x{args.signals}"
+
+    rx_bus = can.interface.Bus(interface=interface, channel=channel)
+    engine.open_bus(interface, channel, 500000)
+    errors = []
+    engine.on_error = errors.append
+    if args.profile:
+        engine.start_profiling()
+
+    results = []
+    print(f"{source}: {len(engine.messages_by_id)} messages, {len(engine.signal_store)} signals")
+    print(f"{'cycle':>7} {'frames/s':>10} {'expected':>10} {'p50 jit':>8} {'p99 jit':>8} {'max jit':>8} "
+          f"{'enc us':>7} {'cpu %':>6} {'thr':>4}")
+    try:
+        for cycle_ms in args.cycles:
+            duration = max(args.duration, args.min_periods * cycle_ms / 1000.0)
+            result = run_configuration(engine, rx_bus, cycle_ms, duration, settle=2 * cycle_ms / 1000.0)
+            results.append(result)
+            jitter = result["jitter_ms"]
+            print(f"{cycle_ms:>5}ms {result['frames_per_s']:>10.1f} {result['expected_frames_per_s']:>10.1f} "
+                  f"{_fmt(jitter['p50_abs']):>8} {_fmt(jitter['p99_abs']):>8} {_fmt(jitter['max']):>8} "
+                  f"{_fmt(result['encode_us']['mean']):>7} {result['cpu_percent']:>6.1f} {result['threads']:>4}")
+        tx_queue = engine.tx_queue_status()
+        if args.profile:
+            engine.stop_profiling()
+            summary = os.path.splitext(args.profile)[0] + "_summary.csv"
+            recorded, overwritten = engine.export_profile(args.profile, summary)
+            print(f"Profile: {recorded} events ({overwritten} overwritten) written to {args.profile} and {summary}")
+    finally:
+        engine.close()
+        rx_bus.shutdown()
+    if tx_queue["failed"]:
+        errors.append(f"{tx_queue['failed']} frame(s) not sent, last error: {tx_queue['last_error']}")
+
+    report = {
+        "benchmark": "tx_benchmark",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "source": source,
+        "messages": len(engine.messages_by_id),
+        "signals": len(engine.signal_store),
+        "interface": interface,
+        "channel": channel,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "python_can": can.__version__,
+            "cantools": cantools.__version__,
+        },
+        "errors": errors,
+        "profile": args.profile,
+        "tx_queue": tx_queue,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    if errors:
+        sys.exit(f"{len(errors)} send error(s), first: {errors[0]}")
+
+
+if __name__ == "__main__":
+    main()
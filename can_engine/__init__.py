@@ -0,0 +1,101 @@
+from .dbc_cache import DbcCache, LoadedDbc, build_signal_tables
+from .decoder import CantoolsFrameDecoder, FrameDecoder, make_frame_decoder
+from .encoder import CantoolsFrameEncoder, FrameEncoder, make_frame_encoder
+from .engine import (
+    BITRATE_MAP,
+    CYCLE_TIME_OPTIONS_MS,
+    DATA_BITRATE_MAP,
+    INTERFACE_CHANNEL_MAP,
+    CanEngine,
+    bus_arguments,
+)
+from .generators import GeneratorSpec, parse_generator
+from .network import CanNetwork, discover_channels
+from .periodic import PeriodicTaskManager, has_native_periodic
+from .profiling import PHASES, PROFILE_BUFFER_CAPACITY, HotPathProfiler, ProfileBuffer
+from .recording import LOG_FORMATS, LogReplayer, TrafficRecorder, write_log
+from .rx import RX_BUFFER_CAPACITY, RxFrameState, RxMonitor, RxRingBuffer
+from .scenario import Scenario, ScenarioRunner, ScenarioStep
+from .scheduler import TxScheduler
+from .sender_process import SenderProcess, SharedSignalTable
+from .signal_store import (
+    MODE_AUTO,
+    MODE_CONSTANT,
+    MODE_GENERATOR,
+    SignalStore,
+    neutral_value,
+    parse_signal_entry,
+    signal_limits_physical,
+)
+from .tx_queue import (
+    OVERFLOW_DROP_OLDEST,
+    OVERFLOW_LATEST,
+    OVERFLOW_POLICIES,
+    TX_QUEUE_CAPACITY,
+    TxQueue,
+    arbitration_priority,
+)
+from .tx_stats import FrameStats, TxStats, fd_frame_bits, frame_bits
+from .warmup import DEFERRED_MODULES, import_backend, warm_up
+
+__all__ = [
+    "BITRATE_MAP",
+    "CYCLE_TIME_OPTIONS_MS",
+    "CanEngine",
+    "CanNetwork",
+    "CantoolsFrameDecoder",
+    "CantoolsFrameEncoder",
+    "DATA_BITRATE_MAP",
+    "DEFERRED_MODULES",
+    "DbcCache",
+    "FrameDecoder",
+    "FrameEncoder",
+    "FrameStats",
+    "GeneratorSpec",
+    "HotPathProfiler",
+    "INTERFACE_CHANNEL_MAP",
+    "LOG_FORMATS",
+    "LoadedDbc",
+    "LogReplayer",
+    "MODE_AUTO",
+    "MODE_CONSTANT",
+    "MODE_GENERATOR",
+    "OVERFLOW_DROP_OLDEST",
+    "OVERFLOW_LATEST",
+    "OVERFLOW_POLICIES",
+    "PHASES",
+    "PROFILE_BUFFER_CAPACITY",
+    "PeriodicTaskManager",
+    "ProfileBuffer",
+    "RX_BUFFER_CAPACITY",
+    "RxFrameState",
+    "RxMonitor",
+    "RxRingBuffer",
+    "Scenario",
+    "ScenarioRunner",
+    "ScenarioStep",
+    "SenderProcess",
+    "SharedSignalTable",
+    "SignalStore",
+    "TX_QUEUE_CAPACITY",
+    "TrafficRecorder",
+    "TxQueue",
+    "TxScheduler",
+    "TxStats",
+    "arbitration_priority",
+    "build_signal_tables",
+    "bus_arguments",
+    "discover_channels",
+    "fd_frame_bits",
+    "frame_bits",
+    "has_native_periodic",
+    "import_backend",
+    "make_frame_decoder",
+    "make_frame_encoder",
+    "neutral_value",
+    "parse_generator",
+    "parse_signal_entry",
+    "signal_limits_physical",
+    "warm_up",
+    "write_log",
+]
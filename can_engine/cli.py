@@ -0,0 +1,190 @@
+"""
+Headless scenario runner.
+
+Usage:
+    python -m can_engine --interface "Virtual CAN" --bitrate "500 kbps" --dbc cluster.dbc --scenario steps.json
+    python -m can_engine --interface "Virtual CAN" --bitrate "500 kbps" --replay drive.blf [--speed 2]
+    python -m can_engine --interface "Peak CAN" --data-bitrate "2 Mbps" --dbc fd.dbc --scenario steps.json
+
+--interface takes the names shown in the GUI (see INTERFACE_CHANNEL_MAP) or a python-can
+interface name (e.g. 'virtual', 'socketcan'); --bitrate and --data-bitrate (CAN FD) take the GUI
+names (see BITRATE_MAP and DATA_BITRATE_MAP) or a number in bit/s. Exits with 0 if every step
+succeeded (or the whole log was replayed) and no frame failed to send, else 1.
+"""
+import argparse
+import os
+import sys
+import time
+
+from .dbc_cache import DbcCache
+from .engine import BITRATE_MAP, DATA_BITRATE_MAP, INTERFACE_CHANNEL_MAP, CanEngine
+from .tx_queue import OVERFLOW_LATEST, OVERFLOW_POLICIES, TX_QUEUE_CAPACITY
+from .scenario import Scenario, ScenarioRunner
+
+EXIT_PASS = 0
+EXIT_FAIL = 1
+
+
+def resolve_interface(name, channel=None):
+    """(interface, channel) for a GUI interface name or a python-can interface name."""
+    if name in INTERFACE_CHANNEL_MAP:
+        interface, default_channel = INTERFACE_CHANNEL_MAP[name]
+        return interface, channel if channel is not None else default_channel
+    if channel is None:
+        raise ValueError(f"--channel is required for interface '{name}'")
+    return name, channel
+
+
+def resolve_bitrate(text, names=BITRATE_MAP):
+    """Bitrate in bit/s for a GUI bitrate name (a key of 'names') or a number."""
+    if text in names:
+        return names[text]
+    try:
+        bitrate = int(text)
+    except ValueError:
+        raise ValueError(f"Unknown bitrate '{text}'. Use one of {', '.join(names)} or a number.")
+    if bitrate <= 0:
+        raise ValueError("Bitrate must be positive")
+    return bitrate
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m can_engine",
+        description="Run a timed signal scenario on a CAN bus without the GUI.",
+    )
+    parser.add_argument("--interface", required=True,
+                        help=f"one of: {', '.join(INTERFACE_CHANNEL_MAP)}; or a python-can interface name")
+    parser.add_argument("--channel", help="channel, overrides the default channel of --interface")
+    parser.add_argument("--bitrate", default="500 kbps",
+                        help=f"one of: {', '.join(BITRATE_MAP)}; or bit/s (default: 500 kbps)")
+    parser.add_argument("--data-bitrate",
+                        help=f"open the bus in CAN FD mode with this data phase bitrate: "
+                             f"one of: {', '.join(DATA_BITRATE_MAP)}; or bit/s")
+    parser.add_argument("--dbc", help="DBC file (required with --scenario)")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--scenario", help="JSON scenario file (see can_engine.scenario.Scenario)")
+    mode.add_argument("--replay", help="BLF/ASC log to re-transmit at its original timing")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed factor (default: 1.0)")
+    parser.add_argument("--tx-only", action="store_true", help="replay only frames logged as transmitted")
+    parser.add_argument("--record", help="record sent and received frames to this .blf/.asc file")
+    parser.add_argument("--offload", action="store_true",
+                        help="use the interface's native periodic transmission when available")
+    parser.add_argument("--separate-process", action="store_true",
+                        help="run the bus and cyclic transmission in a child process (not with --record/--replay)")
+    parser.add_argument("--tx-queue-size", type=int, default=TX_QUEUE_CAPACITY,
+                        help=f"frames that may wait for the bus (default: {TX_QUEUE_CAPACITY})")
+    parser.add_argument("--overflow", choices=OVERFLOW_POLICIES, default=OVERFLOW_LATEST,
+                        help="when the TX queue is full or a frame is still queued: keep only the latest payload "
+                             "per frame, or drop the oldest frame of that frame ID (default: latest)")
+    parser.add_argument("--stats-csv", help="write per-frame TX statistics to this CSV file at the end")
+    parser.add_argument("--profile",
+                        help="profile the send path during the scenario and write a Chrome trace (Perfetto) "
+                             "to this file, and a per-frame summary next to it as <name>_summary.csv")
+    parser.add_argument("--no-cache", action="store_true", help="always parse the DBC, bypassing the DBC cache")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the result")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.scenario and not args.dbc:
+        parser.error("--dbc is required with --scenario")
+    if args.separate_process and (args.record or args.replay):
+        parser.error("--separate-process cannot be combined with --record or --replay")
+    if args.profile and args.replay:
+        parser.error("--profile cannot be combined with --replay")
+
+    def log(text):
+        if not args.quiet:
+            print(text, flush=True)
+
+    try:
+        interface, channel = resolve_interface(args.interface, args.channel)
+        bitrate = resolve_bitrate(args.bitrate)
+        data_bitrate = resolve_bitrate(args.data_bitrate, DATA_BITRATE_MAP) if args.data_bitrate else None
+        scenario = Scenario.load(args.scenario) if args.scenario else None
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return EXIT_FAIL
+
+    engine = CanEngine(dbc_cache=DbcCache(directory=None) if args.no_cache else None)
+    try:
+        engine.configure_tx_queue(args.tx_queue_size, args.overflow)
+        if args.dbc:
+            started = time.monotonic()
+            loaded = engine.load_dbc(args.dbc)
+            log(f"Loaded {args.dbc}: {len(engine.db.messages)} messages, {len(engine.signal_store)} signals "
+                f"({'cache' if loaded.from_cache else 'parsed'}, {time.monotonic() - started:.2f}s)")
+
+        engine.open_bus(interface, channel, bitrate, data_bitrate, separate_process=args.separate_process)
+        if args.offload and not engine.set_offload(True):
+            log("Interface has no native periodic transmission; using the built-in scheduler")
+        if data_bitrate:
+            log(f"Started {interface} on {channel} at {bitrate} bit/s, CAN FD data phase at {data_bitrate} bit/s")
+        else:
+            log(f"Started {interface} on {channel} at {bitrate} bit/s")
+        if args.record:
+            engine.start_recording(args.record)
+            log(f"Recording to {args.record}")
+
+        if args.replay:
+            return _replay(engine, args, log)
+
+        runner = ScenarioRunner(engine, log=log)
+        if args.profile:
+            engine.start_profiling()
+        engine.bus_load()
+        passed = runner.run(scenario)
+        if args.profile:
+            engine.stop_profiling()
+            summary = os.path.splitext(args.profile)[0] + "_summary.csv"
+            recorded, overwritten = engine.export_profile(args.profile, summary)
+            log(f"Profile: {recorded} events ({overwritten} overwritten) written to {args.profile} and {summary}")
+        load = engine.bus_load()
+        if load is not None:
+            log(f"Average bus load: {load:.1f} %")
+        status = engine.tx_queue_status()
+        if status and (status["retries"] or status["dropped"] or status["failed"]):
+            log(f"TX queue: {status['retries']} retries, {status['dropped']} dropped, {status['failed']} failed")
+        if args.stats_csv:
+            engine.export_tx_stats(args.stats_csv)
+            log(f"TX statistics written to {args.stats_csv}")
+        _stop_recording(engine, log)
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return EXIT_FAIL
+    finally:
+        engine.close()
+
+    if passed:
+        print(f"PASS: {len(scenario.steps)} steps in {scenario.duration:.3f}s")
+        return EXIT_PASS
+    print(f"FAIL: {len(runner.errors)} error(s)")
+    for text in runner.errors:
+        print(f"  {text}")
+    return EXIT_FAIL
+
+
+def _replay(engine, args, log):
+    """Replay the log given with --replay and wait for it to finish."""
+    errors = []
+    engine.on_error = errors.append
+    started = time.monotonic()
+    replayer = engine.start_replay(args.replay, speed=args.speed, tx_only=args.tx_only)
+    log(f"Replaying {args.replay} at {args.speed:g}x")
+    replayer.wait()
+    _stop_recording(engine, log)
+    if errors:
+        print("FAIL: " + "; ".join(errors))
+        return EXIT_FAIL
+    print(f"PASS: {replayer.sent} frames replayed in {time.monotonic() - started:.3f}s "
+          f"({replayer.skipped} skipped)")
+    return EXIT_PASS
+
+
+def _stop_recording(engine, log):
+    recorder = engine.stop_recording()
+    if recorder is not None:
+        log(f"{recorder.recorded} frames recorded to {recorder.path}")
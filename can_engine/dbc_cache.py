@@ -0,0 +1,132 @@
+import gc
+import hashlib
+import os
+import pickle
+from threading import Lock
+
+from .signal_store import neutral_value, signal_limits_physical
+
+# Bump when the cached layout changes so stale entries are never unpickled
+CACHE_FORMAT = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cluster_testing_app", "dbc_cache")
+
+
+def build_signal_tables(db):
+    """
+    Per-message signal tables derived from a database:
+    {frame_id: [(signal_name, phys_min, phys_max, neutral), ...]} in message.signals order,
+    which also serves as the signal -> frame_id map.
+    """
+    tables = {}
+    for message in db.messages:
+        tables[message.frame_id] = [
+            (sig.name, *signal_limits_physical(sig), neutral_value(sig)) for sig in message.signals
+        ]
+    return tables
+
+
+class LoadedDbc:
+    """A parsed DBC together with the signal tables derived from it."""
+
+    __slots__ = ("db", "signal_tables", "from_cache")
+
+    def __init__(self, db, signal_tables, from_cache=False):
+        self.db = db
+        self.signal_tables = signal_tables
+        self.from_cache = from_cache
+
+
+class DbcCache:
+    """
+    On-disk cache of parsed DBC files and their signal tables.
+
+    Entries are keyed by absolute path, modification time and SHA-256 of the file content
+    (plus the cantools version, since the value is a pickled cantools database), so an
+    edited or replaced file is always parsed again. Safe to use from a worker thread.
+
+    cantools and diskcache are imported, and the cache is opened, on the first load(): they
+    take longer to import than the rest of the application, which keeps startup fast.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, size_limit=256 * 1024 * 1024):
+        self._directory = directory  # None disables the cache
+        self._size_limit = size_limit
+        self._cache = None
+        self._opened = False
+        self._open_lock = Lock()  # channels may load their DBCs on several worker threads
+
+    def _open(self):
+        """The diskcache.Cache, opened on first use; None without diskcache or a usable directory."""
+        with self._open_lock:
+            if not self._opened:
+                self._opened = True
+                if self._directory is not None:
+                    try:
+                        import diskcache
+                    except ImportError:  # the cache is optional; without it every load parses the file
+                        return None
+                    try:
+                        self._cache = diskcache.Cache(self._directory, size_limit=self._size_limit)
+                    except Exception:
+                        # An unusable cache directory must not prevent loading DBCs
+                        self._cache = None
+            return self._cache
+
+    @property
+    def enabled(self):
+        return self._open() is not None
+
+    def load(self, path, progress=None):
+        """
+        Return a LoadedDbc for 'path', from the cache when possible.
+        progress: optional callable(stage_text) called as loading advances.
+        """
+        import cantools
+
+        report = progress or (lambda stage: None)
+        path = os.path.abspath(path)
+        cache = self._open()
+
+        report("Reading file")
+        with open(path, "rb") as f:
+            content = f.read()
+        key = "{}:{}:{}:{}:{}".format(
+            CACHE_FORMAT, cantools.__version__, path, os.stat(path).st_mtime_ns,
+            hashlib.sha256(content).hexdigest()
+        )
+
+        if cache is not None:
+            blob = cache.get(key)
+            if blob is not None:
+                report("Loading from cache")
+                db, signal_tables = self._unpickle(blob)
+                return LoadedDbc(db, signal_tables, from_cache=True)
+
+        report("Parsing DBC")
+        db = cantools.database.load_file(path)
+        report("Building signal tables")
+        signal_tables = build_signal_tables(db)
+
+        if cache is not None:
+            report("Writing cache")
+            try:
+                cache.set(key, pickle.dumps((db, signal_tables), protocol=pickle.HIGHEST_PROTOCOL))
+            except Exception:
+                pass  # caching is best effort
+        return LoadedDbc(db, signal_tables)
+
+    @staticmethod
+    def _unpickle(blob):
+        # A parsed database is a large graph of small objects; the cyclic GC would
+        # otherwise run many times while it is being rebuilt
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.loads(blob)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def close(self):
+        if self._cache is not None:
+            self._cache.close()
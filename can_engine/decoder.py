@@ -0,0 +1,60 @@
+import struct
+
+from .encoder import FrameEncoder, _SignalLayout
+
+
+class FrameDecoder:
+    """
+    Compiled decoder for one cantools message, the inverse of FrameEncoder.
+
+    Uses the same precomputed per-byte bit segments, so decoding a payload is a few shifts
+    and masks per signal followed by scale/offset. Values are physical; choices are not
+    resolved to their names.
+    """
+
+    def __init__(self, message):
+        self.message = message
+        self.frame_id = message.frame_id
+        self.length = message.length
+        self._layouts = tuple(_SignalLayout(sig) for sig in message.signals)
+
+    supports = staticmethod(FrameEncoder.supports)
+
+    def decode(self, data):
+        """{signal_name: physical_value}; a payload shorter than the message is zero-padded."""
+        if len(data) < self.length:
+            data = bytes(data) + bytes(self.length - len(data))
+        values = {}
+        for layout in self._layouts:
+            raw = 0
+            for byte_index, raw_shift, field_mask, byte_shift, _ in layout.segments:
+                raw |= ((data[byte_index] >> byte_shift) & field_mask) << raw_shift
+            if layout.is_float:
+                value_format, raw_format = layout.float_format
+                values[layout.name] = struct.unpack(value_format, struct.pack(raw_format, raw))[0] \
+                    * layout.scale + layout.offset
+                continue
+            if layout.raw_min < 0 and raw > layout.raw_max:
+                # Sign-extend two's complement
+                raw -= layout.raw_mask + 1
+            values[layout.name] = raw * layout.scale + layout.offset
+        return values
+
+
+class CantoolsFrameDecoder:
+    """Fallback with the FrameDecoder interface for messages FrameDecoder cannot compile."""
+
+    def __init__(self, message):
+        self.message = message
+        self.frame_id = message.frame_id
+        self.length = message.length
+
+    def decode(self, data):
+        return self.message.decode(bytes(data), decode_choices=False, allow_truncated=True)
+
+
+def make_frame_decoder(message):
+    """Build the fastest available decoder for a cantools message."""
+    if FrameDecoder.supports(message):
+        return FrameDecoder(message)
+    return CantoolsFrameDecoder(message)
@@ -0,0 +1,168 @@
+import struct
+
+# Raw values are scaled in floating point, which is exact for integers up to this width only
+MAX_EXACT_RAW_BITS = 53
+
+
+class _SignalLayout:
+    """Precomputed packing data for one signal: scaling, raw range and per-byte bit segments."""
+
+    __slots__ = ("name", "scale", "offset", "is_float", "float_format", "raw_min", "raw_max", "raw_mask",
+                 "segments")
+
+    def __init__(self, sig):
+        self.name = sig.name
+        self.scale = sig.scale if sig.scale is not None else 1.0
+        self.offset = sig.offset if sig.offset is not None else 0.0
+        self.is_float = sig.is_float
+        self.float_format = None
+        if sig.is_float:
+            self.float_format = ("<f", "<I") if sig.length == 32 else ("<d", "<Q")
+
+        length = sig.length
+        if sig.is_signed:
+            self.raw_min = -(1 << (length - 1))
+            self.raw_max = (1 << (length - 1)) - 1
+        else:
+            self.raw_min = 0
+            self.raw_max = (1 << length) - 1
+        self.raw_mask = (1 << length) - 1
+        self.segments = self._compute_segments(sig)
+
+    @staticmethod
+    def _bit_positions(sig):
+        """(byte_index, bit_in_byte) of every raw bit, least significant raw bit first."""
+        if sig.byte_order == "little_endian":
+            return [((sig.start + i) // 8, (sig.start + i) % 8) for i in range(sig.length)]
+        # Motorola: 'start' is the MSB; walk towards the LSB, wrapping into the next byte
+        positions = []
+        byte_index, bit = divmod(sig.start, 8)
+        for _ in range(sig.length):
+            positions.append((byte_index, bit))
+            bit -= 1
+            if bit < 0:
+                byte_index += 1
+                bit = 7
+        positions.reverse()
+        return positions
+
+    def _compute_segments(self, sig):
+        """
+        Group raw bits that land next to each other in the same payload byte.
+        Each segment is (byte_index, raw_shift, field_mask, byte_shift, keep_mask) so that
+        packing is: buf[i] = (buf[i] & keep_mask) | (((raw >> raw_shift) & field_mask) << byte_shift)
+        """
+        segments = []
+        positions = self._bit_positions(sig)
+        raw_bit = 0
+        while raw_bit < len(positions):
+            byte_index, bit = positions[raw_bit]
+            width = 1
+            while (raw_bit + width < len(positions)
+                   and positions[raw_bit + width] == (byte_index, bit + width)):
+                width += 1
+            field_mask = (1 << width) - 1
+            keep_mask = ~(field_mask << bit) & 0xFF
+            segments.append((byte_index, raw_bit, field_mask, bit, keep_mask))
+            raw_bit += width
+        return tuple(segments)
+
+    def to_raw(self, value):
+        """Physical value -> unsigned raw bit pattern (clamped to the representable range)."""
+        if self.is_float:
+            value_format, raw_format = self.float_format
+            return struct.unpack(raw_format, struct.pack(value_format, (value - self.offset) / self.scale))[0]
+        raw = round((value - self.offset) / self.scale)
+        if raw < self.raw_min:
+            raw = self.raw_min
+        elif raw > self.raw_max:
+            raw = self.raw_max
+        return raw & self.raw_mask
+
+
+class FrameEncoder:
+    """
+    Compiled encoder for one cantools message.
+
+    Bit positions, masks, scale and offset of every signal are computed once. Encoding packs
+    raw values with integer operations into a reusable bytearray, and only the signals whose
+    physical value changed since the previous call are re-packed. When nothing changed the
+    previous payload object is returned as-is.
+    """
+
+    def __init__(self, message):
+        self.message = message
+        self.frame_id = message.frame_id
+        self.length = message.length
+        self._layouts = tuple(_SignalLayout(sig) for sig in message.signals)
+        self._positions = range(len(self._layouts))
+        self._last_values = [None] * len(self._layouts)
+        self._buffer = bytearray(self.length)
+        self._payload = bytes(self.length)
+
+    @staticmethod
+    def supports(message):
+        """
+        Multiplexed and container messages need cantools' own encoder, and so do integer signals
+        wider than MAX_EXACT_RAW_BITS, which would lose precision in floating point.
+        """
+        if message.is_multiplexed() or message.is_container:
+            return False
+        return all(sig.is_float or sig.length <= MAX_EXACT_RAW_BITS for sig in message.signals)
+
+    def encode(self, values):
+        """Encode {signal_name: physical_value}; all signals of the message must be present."""
+        return self.encode_indexed([values[layout.name] for layout in self._layouts], self._positions)
+
+    def encode_indexed(self, values, ids):
+        """
+        Encode from an indexable value table (e.g. SignalStore.current): ids[i] is the index
+        of the value of message.signals[i].
+        """
+        changed = False
+        last_values = self._last_values
+        buffer = self._buffer
+        index = 0
+        for layout in self._layouts:
+            value = values[ids[index]]
+            if value != last_values[index]:
+                last_values[index] = value
+                changed = True
+                if layout.is_float:
+                    raw = layout.to_raw(value)
+                else:
+                    # Inlined to_raw() for the common integer case
+                    raw = round((value - layout.offset) / layout.scale)
+                    if raw < layout.raw_min:
+                        raw = layout.raw_min
+                    elif raw > layout.raw_max:
+                        raw = layout.raw_max
+                    raw &= layout.raw_mask
+                for byte_index, raw_shift, field_mask, byte_shift, keep_mask in layout.segments:
+                    buffer[byte_index] = (buffer[byte_index] & keep_mask) | (((raw >> raw_shift) & field_mask) << byte_shift)
+            index += 1
+        if changed:
+            self._payload = bytes(buffer)
+        return self._payload
+
+
+class CantoolsFrameEncoder:
+    """Fallback with the FrameEncoder interface for messages FrameEncoder cannot compile."""
+
+    def __init__(self, message):
+        self.message = message
+        self.frame_id = message.frame_id
+        self.length = message.length
+
+    def encode(self, values):
+        return self.message.encode(values)
+
+    def encode_indexed(self, values, ids):
+        return self.message.encode({sig.name: values[sid] for sig, sid in zip(self.message.signals, ids)})
+
+
+def make_frame_encoder(message):
+    """Build the fastest available encoder for a cantools message."""
+    if FrameEncoder.supports(message):
+        return FrameEncoder(message)
+    return CantoolsFrameEncoder(message)
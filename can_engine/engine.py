@@ -0,0 +1,864 @@
+import os
+import sys
+import time
+
+import can
+
+from .dbc_cache import DbcCache
+from .decoder import make_frame_decoder
+from .encoder import make_frame_encoder
+from .periodic import PeriodicTaskManager, has_native_periodic
+from .profiling import (
+    NO_FRAME,
+    PHASE_BUILD,
+    PHASE_ENCODE,
+    PHASE_GUI,
+    PHASE_RESOLVE,
+    PHASE_SEND,
+    PROFILE_BUFFER_CAPACITY,
+    HotPathProfiler,
+)
+from .recording import LogReplayer, TrafficRecorder, write_log
+from .rx import RX_BUFFER_CAPACITY, RxMonitor
+from .scheduler import TxScheduler
+from .sender_process import EXPORT_TIMEOUT, SenderProcess
+from .signal_store import MODE_CONSTANT, SignalStore, parse_signal_entry
+from .tx_queue import OVERFLOW_LATEST, OVERFLOW_POLICIES, TX_QUEUE_CAPACITY, TxQueue
+from .tx_stats import TxStats
+
+# Interface and bitrate configuration maps shared by the GUI and the CLI
+INTERFACE_CHANNEL_MAP = {
+    "Peak CAN": ["pcan", "PCAN_USBBUS1"],
+    "Kvaser CAN": ["kvaser", "0"],
+    "Chuangxin USBCAN": ["canalystii", "0"],
+    "SocketCAN": ["socketcan", "can0"],
+    "Virtual CAN": ["virtual", "vcan0"]
+}
+
+BITRATE_MAP = {
+    "125 kbps": 125000,
+    "250 kbps": 250000,
+    "500 kbps": 500000,
+    "1 Mbps": 1000000,
+}
+
+# CAN FD data phase bitrates (bitrate switching); the nominal bitrate comes from BITRATE_MAP
+DATA_BITRATE_MAP = {
+    "1 Mbps": 1000000,
+    "2 Mbps": 2000000,
+    "4 Mbps": 4000000,
+    "5 Mbps": 5000000,
+    "8 Mbps": 8000000,
+}
+
+# Interfaces that take CAN FD bit timing only as a BitTimingFd: their CAN FD clock (Hz)
+FD_TIMING_CLOCKS = {"pcan": 80000000}
+FD_SAMPLE_POINT = 80.0  # percent, nominal and data phase
+
+CYCLE_TIME_OPTIONS_MS = [10, 20, 50, 100, 200, 500, 1000]
+
+
+def _print_error(text):
+    print(f"Error: {text}", file=sys.stderr)
+
+
+def bus_arguments(interface, bitrate, data_bitrate=None):
+    """
+    Bit timing keyword arguments for can.interface.Bus: classical CAN without 'data_bitrate',
+    else CAN FD with fd=True and the data phase bitrate.
+    """
+    if not data_bitrate:
+        return {"bitrate": bitrate}
+    if interface in FD_TIMING_CLOCKS:
+        timing = can.BitTimingFd.from_sample_point(
+            f_clock=FD_TIMING_CLOCKS[interface],
+            nom_bitrate=bitrate,
+            nom_sample_point=FD_SAMPLE_POINT,
+            data_bitrate=data_bitrate,
+            data_sample_point=FD_SAMPLE_POINT,
+        )
+        return {"fd": True, "timing": timing}
+    return {"fd": True, "bitrate": bitrate, "data_bitrate": data_bitrate}
+
+
+class CanEngine:
+    """
+    The CAN side of the application without any GUI: bus, DBC, signal state,
+    cyclic transmission and final-off logic.
+
+    Signals are addressed by signal id (see SignalStore). Frames go to the bus through a TxQueue,
+    so a congested or bus-off bus never blocks the scheduler; its send failures are counted (see
+    tx_queue_status) rather than reported one by one. Other errors that happen on the scheduler
+    thread or while building final-off frames are reported through on_error(text); invalid calls
+    (no bus, no DBC, bad values) raise ValueError.
+
+    With open_bus(separate_process=True) the bus and the TX scheduler run in a SenderProcess;
+    this engine then keeps the DBC and the signal state (in shared memory) and forwards the
+    TX-side calls to the engine in that process.
+
+    With a data bitrate the bus is opened in CAN FD mode: messages the DBC marks as CAN FD are
+    sent as FD frames, with bitrate switching when the data bitrate differs from the nominal one.
+    """
+
+    def __init__(self, dbc_cache=None, on_error=None):
+        self.db = None
+        self.bus = None
+        self.bitrate = None
+        self.data_bitrate = None  # CAN FD data phase bitrate; None for classical CAN
+        self.bitrate_switch = False
+        self.dbc_cache = dbc_cache if dbc_cache is not None else DbcCache()
+        self.on_error = on_error or _print_error
+
+        # Signal state (mode, target, on/off, current value) shared with the TX path
+        self.signal_store = SignalStore()
+
+        # Per-message transmit model
+        self.messages_by_id = {}  # frame_id -> cantools message
+        self.frame_encoders = {}  # frame_id -> compiled encoder, built once per DBC load
+        self.frame_decoders = {}  # frame_id -> decoder, built on first reception
+
+        # Receive path: a can.Notifier thread feeds the RX monitor while the bus is open
+        self.rx_monitor = RxMonitor(self.decoder_for, report_error=lambda text: self.on_error(text))
+        self.rx_notifier = None
+
+        # Traffic recording (TX and RX frames to BLF/ASC) and log replay
+        self.recorder = None
+        self.replayer = None
+
+        # Per-frame TX counters and bus load, read at a low rate by the UI
+        self.tx_stats = TxStats()
+
+        # One scheduler thread drives every active message by absolute deadlines
+        self.tx_scheduler = TxScheduler(self._transmit_message, on_error=self._on_transmit_error)
+        self.tx_scheduler.start()
+
+        # Frames wait in a bounded priority queue for the bus while it is open
+        self.tx_queue = None
+        self.tx_queue_capacity = TX_QUEUE_CAPACITY
+        self.tx_overflow_policy = OVERFLOW_LATEST
+
+        # Cycle times: each message defaults to its DBC GenMsgCycleTime.
+        # The default cycle time is used for messages without one, or for all messages when overridden.
+        self.default_cycle_ms = 100
+        self.cycle_override = False
+        self.message_cycle_overrides = {}  # frame_id -> per-message cycle time (ms)
+
+        # Offloaded TX: cyclic frames run as python-can periodic tasks (kernel/hardware timed).
+        # tx_offloaded is the effective state read by the scheduler thread.
+        self.offload_requested = False
+        self.tx_offloaded = False
+        self.periodic_tasks = None
+
+        # Bus and TX scheduler in a child process (see open_bus)
+        self.sender = None
+
+        # Send path profiling (see start_profiling): the active profiler, and the latest one for export.
+        # With a sender process, the profilers live there and only 'profiling' is kept here.
+        self.profiling = False
+        self.profiler = None
+        self.last_profiler = None
+
+    @property
+    def is_open(self):
+        """True while a bus is open, in this process or in the sender process."""
+        return self.bus is not None or self.sender is not None
+
+    @property
+    def is_fd(self):
+        return self.data_bitrate is not None
+
+    def open_bus(self, interface, channel, bitrate, data_bitrate=None, receive=True, separate_process=False):
+        """
+        Create the CAN bus connection; with 'data_bitrate' in CAN FD mode (see bus_arguments).
+        With 'receive', incoming frames feed the RX monitor. With 'separate_process', the bus and
+        cyclic transmission run in a child process so the timing does not suffer from work in
+        this one; receiving, recording and replay are then not available.
+        """
+        self.tx_scheduler.start()  # stopped by a previous close()
+        if separate_process:
+            sender = SenderProcess(interface, channel, bitrate, data_bitrate,
+                                   on_error=lambda text: self.on_error(text))
+            sender.start()
+            self.sender = sender
+            self._set_bitrates(bitrate, data_bitrate)
+            sender.send("configure_tx_queue", self.tx_queue_capacity, self.tx_overflow_policy)
+            sender.send("set_default_cycle", self.default_cycle_ms, self.cycle_override)
+            if self.db is not None:
+                self._install_in_sender()
+            self.set_offload(self.offload_requested)
+            self._resume_active_messages()
+            return
+        self.bus = can.interface.Bus(interface=interface, channel=channel,
+                                     **bus_arguments(interface, bitrate, data_bitrate))
+        self._set_bitrates(bitrate, data_bitrate)
+        self.tx_queue = TxQueue(self.bus, on_sent=self._on_frame_sent, on_send_error=self._on_send_error,
+                                capacity=self.tx_queue_capacity, policy=self.tx_overflow_policy,
+                                on_error=lambda text: self.on_error(text))
+        self.tx_queue.profiler = self.profiler
+        self.tx_queue.start()
+        self.periodic_tasks = PeriodicTaskManager(self.bus)
+        self.set_offload(self.offload_requested)
+        if receive:
+            self.start_rx()
+        self._resume_active_messages()
+
+    def _resume_active_messages(self):
+        """
+        Schedule the messages of signals that are still on from before a close(), so the on/off
+        state seen by the user keeps matching what is sent. CAN FD messages cannot be sent on a
+        classical bus: their signals are turned off and on_error names them.
+        """
+        store = self.signal_store
+        frame_ids = []
+        skipped = []
+        for frame_id, message in self.messages_by_id.items():
+            if not store.any_active(frame_id):
+                continue
+            if not self.is_fd and message.is_fd:
+                for sid in store.message_signal_ids[frame_id]:
+                    store.set_active(sid, False)
+                skipped.append(message)
+            else:
+                frame_ids.append(frame_id)
+        if frame_ids:
+            if self.sender is not None:
+                self.sender.send("_schedule_messages", frame_ids)
+            else:
+                self._schedule_messages(frame_ids)
+        if skipped:
+            names = ", ".join(f"{message.name} (0x{message.frame_id:X})" for message in skipped)
+            self.on_error(f"CAN FD messages not sent on a classical CAN bus, their signals were turned off: {names}")
+
+    def _set_bitrates(self, bitrate, data_bitrate):
+        self.bitrate = bitrate
+        self.data_bitrate = data_bitrate or None
+        self.bitrate_switch = self.data_bitrate is not None and self.data_bitrate != bitrate
+
+    def close(self):
+        """Stop all transmission and shut the bus down. Signals stay on; open_bus() sends their messages again."""
+        self.tx_scheduler.shutdown()
+        self.stop_replay()
+        if self.tx_queue is not None:
+            # Final-off frames that are still queued go out first
+            self.tx_queue.stop()
+            self.tx_queue = None
+        self.stop_rx()
+        self.stop_recording()
+        if self.sender is not None:
+            self.sender.close(self.signal_store)
+            self.sender = None
+            self.tx_offloaded = False
+            self.profiling = False  # the profile went with the sender process
+        if self.periodic_tasks is not None:
+            self.periodic_tasks.stop_all()
+            self.periodic_tasks = None
+            self.tx_offloaded = False  # open_bus() offloads again if still requested
+        if self.bus is not None:
+            self.bus.shutdown()
+            self.bus = None
+
+    def prepare_dbc(self, path, progress=None):
+        """
+        Parse (or fetch from cache) a DBC and compile its frame encoders. Safe to run on a
+        worker thread; pass the result to install_dbc() on the owning thread.
+        """
+        loaded = self.dbc_cache.load(path, progress=progress)
+        if progress is not None:
+            progress("Compiling frame encoders")
+        encoders = {message.frame_id: make_frame_encoder(message) for message in loaded.db.messages}
+        return loaded, encoders
+
+    def install_dbc(self, loaded, encoders):
+        """Replace the current DBC with a prepared one; everything currently sent is stopped."""
+        # Stop sending frames of the previous DBC
+        for frame_id in self.tx_scheduler.scheduled_ids():
+            self.tx_scheduler.remove(frame_id)
+        if self.periodic_tasks is not None:
+            self.periodic_tasks.stop_all()
+        if self.tx_queue is not None:
+            # Frames still waiting for the bus belong to the previous DBC
+            self.tx_queue.clear()
+
+        # Index messages by frame_id
+        self.db = loaded.db
+        self.messages_by_id = {}
+        self.frame_encoders = encoders
+        self.frame_decoders = {}
+        self.rx_monitor.clear()
+        self.signal_store.clear()
+        self.message_cycle_overrides.clear()
+        self.tx_stats.clear()
+
+        for message in self.db.messages:
+            self.messages_by_id[message.frame_id] = message
+            self.signal_store.add_message(message.frame_id, loaded.signal_tables[message.frame_id])
+            self.tx_stats.register(message.frame_id, message.length, message.is_extended_frame, message.is_fd)
+        if self.sender is not None:
+            self._install_in_sender()
+
+    def _install_in_sender(self):
+        """Load the current DBC, signal state and per-message cycle times in the sender process."""
+        self.sender.install(self.db, self.signal_store)
+        for frame_id, cycle_ms in self.message_cycle_overrides.items():
+            self.sender.send("set_message_cycle", frame_id, cycle_ms)
+
+    def load_dbc(self, path, progress=None):
+        """prepare_dbc() + install_dbc() on the calling thread. Returns the LoadedDbc."""
+        loaded, encoders = self.prepare_dbc(path, progress)
+        self.install_dbc(loaded, encoders)
+        return loaded
+
+    def start_rx(self, capacity=RX_BUFFER_CAPACITY):
+        """Start receiving on the open bus into a fresh RX monitor (no-op if already receiving)."""
+        self._require_bus()
+        if self.sender is not None:
+            raise ValueError("Receiving is not available while the bus runs in a separate process")
+        if self.rx_notifier is not None:
+            return
+        if capacity != self.rx_monitor.buffer.capacity:
+            self.rx_monitor = RxMonitor(self.decoder_for, capacity, report_error=self.rx_monitor.report_error)
+        else:
+            self.rx_monitor.clear()
+        self.rx_notifier = can.Notifier(self.bus, [self.rx_monitor], timeout=0.5)
+        if self.recorder is not None:
+            self.rx_notifier.add_listener(self.recorder)
+
+    def stop_rx(self):
+        if self.rx_notifier is not None:
+            self.rx_notifier.stop()
+            self.rx_notifier = None
+
+    def save_rx_buffer(self, path):
+        """Write the frames in the RX monitor's ring buffer to a .blf or .asc file. Returns the frame count."""
+        return write_log(path, self.rx_monitor.buffer.recent())
+
+    def start_recording(self, path):
+        """Record every sent frame (and every received frame while RX runs) to a .blf or .asc file."""
+        if self.recorder is not None:
+            raise ValueError("A recording is already running")
+        if self.sender is not None:
+            raise ValueError("Recording is not available while the bus runs in a separate process")
+        self.recorder = TrafficRecorder(path, report_error=lambda text: self.on_error(text))
+        if self.rx_notifier is not None:
+            self.rx_notifier.add_listener(self.recorder)
+        return self.recorder
+
+    def stop_recording(self):
+        """Stop recording and flush the file. Returns the stopped TrafficRecorder, or None."""
+        recorder = self.recorder
+        if recorder is None:
+            return None
+        self.recorder = None
+        if self.rx_notifier is not None:
+            self.rx_notifier.remove_listener(recorder)
+        recorder.stop()
+        return recorder
+
+    def start_replay(self, path, speed=1.0, tx_only=False, on_finished=None):
+        """Replay a .blf/.asc log on the open bus in the background. Returns the LogReplayer."""
+        self._require_bus()
+        if self.sender is not None:
+            raise ValueError("Replay is not available while the bus runs in a separate process")
+        if self.replayer is not None and self.replayer.running:
+            raise ValueError("A replay is already running")
+        self.replayer = LogReplayer(self._send_replayed, path, speed=speed, tx_only=tx_only,
+                                    on_finished=on_finished, report_error=lambda text: self.on_error(text))
+        self.replayer.start()
+        return self.replayer
+
+    def stop_replay(self):
+        if self.replayer is not None:
+            self.replayer.stop()
+            self.replayer = None
+
+    def _send_replayed(self, logged):
+        """Send a frame read from a log; only the frame content is kept (not its logged channel)."""
+        msg = can.Message(
+            arbitration_id=logged.arbitration_id,
+            data=logged.data,
+            dlc=logged.dlc,
+            is_extended_id=logged.is_extended_id,
+            is_remote_frame=logged.is_remote_frame,
+            is_fd=logged.is_fd,
+            bitrate_switch=logged.bitrate_switch,
+        )
+        self.bus.send(msg)
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(msg)
+
+    def decoder_for(self, frame_id):
+        """Cached decoder for a frame_id of the loaded DBC, or None for unknown frames."""
+        decoder = self.frame_decoders.get(frame_id)
+        if decoder is None:
+            message = self.messages_by_id.get(frame_id)
+            if message is None:
+                return None
+            decoder = self.frame_decoders[frame_id] = make_frame_decoder(message)
+        return decoder
+
+    def signal_id(self, name):
+        """Signal id for a signal name; raises ValueError for unknown signals."""
+        sid = self.signal_store.ids.get(name)
+        if sid is None:
+            raise ValueError(f"Unknown signal: {name}")
+        return sid
+
+    def set_signal_value(self, sid, text):
+        """
+        Set a signal's value from entry text: 'A' for auto-increment, a number or a
+        generator call (see GeneratorSpec). Raises ValueError for invalid text.
+        """
+        mode, value = parse_signal_entry(text)
+        self._apply_entry(sid, mode, value)
+
+    def set_signal_value_lenient(self, sid, text):
+        """Like set_signal_value(), but invalid text sends the physical minimum (entry boxes while typing)."""
+        try:
+            self.set_signal_value(sid, text)
+        except ValueError:
+            self._apply_entry(sid, MODE_CONSTANT, self.signal_store.phys_min[sid])
+
+    def _apply_entry(self, sid, mode, value):
+        if self.sender is not None:
+            self.sender.set_entry(self.signal_store, sid, mode, value)
+        else:
+            self.signal_store.set_entry(sid, mode, value)
+
+    def signal_on(self, sid):
+        """Turn a signal on and make sure its message is being sent."""
+        self.signals_on((sid,))
+
+    def signal_off(self, sid):
+        """Turn a signal off, send its final-off frame and stop the message if it became idle."""
+        self.signals_off((sid,))
+
+    def signals_on(self, sids):
+        """
+        Turn several signals on as one batch; every affected message is scheduled once.
+        On a classical CAN bus the signals of CAN FD messages are skipped: the others are turned on,
+        then a ValueError names the skipped messages.
+        """
+        self._require_bus()
+        store = self.signal_store
+        frame_ids = {}  # insertion-ordered set
+        skipped = {}  # CAN FD messages on a classical bus, insertion-ordered
+        for sid in sids:
+            frame_id = store.frame_ids[sid]
+            if not self.is_fd and self.messages_by_id[frame_id].is_fd:
+                skipped[frame_id] = None
+                continue
+            frame_ids[frame_id] = None
+            store.set_active(sid, True)
+        if frame_ids:
+            if self.sender is not None:
+                self.sender.send("_schedule_messages", list(frame_ids))
+            else:
+                self._schedule_messages(frame_ids)
+        if skipped:
+            names = ", ".join(f"{self.messages_by_id[frame_id].name} (0x{frame_id:X})" for frame_id in skipped)
+            raise ValueError(f"CAN FD messages not sent on a classical CAN bus: {names}; "
+                             f"start the interface with a data bitrate")
+
+    def signals_off(self, sids):
+        """
+        Turn several signals off as one batch. Every affected message gets exactly one final-off
+        frame carrying all of its newly-off signals at their neutral values, and is unscheduled
+        (without blocking) if none of its signals remain on.
+        """
+        store = self.signal_store
+        off_sids = []
+        for sid in sids:
+            if store.is_active(sid):
+                store.set_active(sid, False)
+                off_sids.append(sid)
+        if self.sender is not None:
+            self.sender.send("_send_final_offs", off_sids)
+        else:
+            self._send_final_offs(off_sids)
+
+    def _schedule_messages(self, frame_ids):
+        for frame_id in frame_ids:
+            self._schedule_message(self.messages_by_id[frame_id])
+
+    def _send_final_offs(self, sids):
+        """One final-off frame per message for signals that were just turned off, then unschedule idle messages."""
+        store = self.signal_store
+        off_by_frame = {}  # frame_id -> signal ids turned off
+        for sid in sids:
+            off_by_frame.setdefault(store.frame_ids[sid], []).append(sid)
+        for frame_id, off_sids in off_by_frame.items():
+            message = self.messages_by_id.get(frame_id)
+            if message is not None:
+                self._send_final_off(message, off_sids)
+                self._unschedule_message_if_idle(message)
+
+    def message_on(self, frame_id):
+        """Turn on every signal of a message."""
+        self.signals_on(self.signal_store.message_signal_ids[frame_id])
+
+    def message_off(self, frame_id):
+        """Turn off every signal of a message with a single final-off frame."""
+        self.signals_off(self.signal_store.message_signal_ids[frame_id])
+
+    def all_on(self):
+        """Turn on every signal and schedule their messages."""
+        self.signals_on(range(len(self.signal_store)))
+
+    def all_off(self):
+        """Turn off every signal, send one final-off frame per message and unschedule idle messages."""
+        self.signals_off(range(len(self.signal_store)))
+
+    def _require_bus(self):
+        if not self.is_open:
+            raise ValueError("Start the CAN interface first!")
+
+    def message_period(self, message):
+        """
+        Cycle period (s) for a message, in order of precedence:
+        - the per-message cycle time
+        - the default cycle time, when cycle_override is set
+        - the DBC GenMsgCycleTime of the message
+        - the default cycle time, for messages without a DBC cycle time
+        """
+        cycle_ms = self.message_cycle_overrides.get(message.frame_id)
+        if cycle_ms is None:
+            if self.cycle_override or not message.cycle_time:
+                cycle_ms = self.default_cycle_ms
+            else:
+                cycle_ms = message.cycle_time
+        return max(0.001, cycle_ms / 1000.0)
+
+    def set_default_cycle(self, cycle_ms, override=None):
+        """Change the default cycle time (and optionally the override flag) of all messages."""
+        self.default_cycle_ms = cycle_ms
+        if override is not None:
+            self.cycle_override = override
+        if self.sender is not None:
+            self.sender.send("set_default_cycle", cycle_ms, override)
+            return
+        for frame_id in self.tx_scheduler.scheduled_ids():
+            message = self.messages_by_id.get(frame_id)
+            if message is not None:
+                self._apply_message_period(message)
+
+    def set_message_cycle(self, frame_id, cycle_ms):
+        """Per-message cycle time in ms; None restores the DBC/default cycle time."""
+        if cycle_ms is None:
+            self.message_cycle_overrides.pop(frame_id, None)
+        else:
+            self.message_cycle_overrides[frame_id] = cycle_ms
+        if self.sender is not None:
+            self.sender.send("set_message_cycle", frame_id, cycle_ms)
+            return
+        self._apply_message_period(self.messages_by_id[frame_id])
+
+    def configure_tx_queue(self, capacity=None, policy=None):
+        """
+        Capacity (frames) and overflow policy (see OVERFLOW_POLICIES) of the TX queue; applies to
+        the open bus and to buses opened later.
+        """
+        if capacity is not None and capacity < 1:
+            raise ValueError("TX queue capacity must be at least 1")
+        if policy is not None and policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}'. Use one of: {', '.join(OVERFLOW_POLICIES)}")
+        if capacity is not None:
+            self.tx_queue_capacity = capacity
+        if policy is not None:
+            self.tx_overflow_policy = policy
+        if self.sender is not None:
+            self.sender.send("configure_tx_queue", capacity, policy)
+        elif self.tx_queue is not None:
+            self.tx_queue.configure(capacity, policy)
+
+    def set_offload(self, enabled):
+        """
+        Move cyclic transmission between the TX scheduler and the interface's periodic tasks.
+        Returns the effective state, which stays False on interfaces without native periodic TX.
+        """
+        self.offload_requested = enabled
+        if self.sender is not None:
+            self.tx_offloaded = self.sender.call("set_offload", enabled)
+            return self.tx_offloaded
+        want_offload = enabled and self.bus is not None and has_native_periodic(self.bus)
+        if want_offload == self.tx_offloaded:
+            return self.tx_offloaded
+
+        if want_offload:
+            # Start the tasks before the scheduler stops sending, so no cycle is skipped.
+            # The scheduler thread owns the encoders, so seed each task from a snapshot of its values.
+            for frame_id in self.tx_scheduler.scheduled_ids():
+                message = self.messages_by_id.get(frame_id)
+                if message is not None:
+                    payload = message.encode(self.signal_store.message_values(frame_id))
+                    self._start_periodic_task(message, self.message_period(message), payload)
+            self.tx_offloaded = True
+        else:
+            self.tx_offloaded = False
+            self.periodic_tasks.stop_all()
+        return self.tx_offloaded
+
+    def _schedule_message(self, message):
+        """Add this message to the TX scheduler if it is not already being sent."""
+        frame_id = message.frame_id
+        if not self.tx_scheduler.is_scheduled(frame_id):
+            # Initialize per-message current values to signal minimums (physical)
+            self.signal_store.reset_message(frame_id)
+            period = self.message_period(message)
+            self.signal_store.set_message_tick(frame_id, period)
+            self.tx_stats.start(frame_id, period)
+            if self.tx_offloaded:
+                # The interface transmits; the scheduler only refreshes values one period later.
+                # Only the scheduler thread steps values and uses the compiled encoders, so the
+                # first payload is encoded from a snapshot of the values here.
+                payload = message.encode(self.signal_store.message_values(frame_id))
+                self._start_periodic_task(message, period, payload)
+                self.tx_scheduler.add(frame_id, period, first_due=time.monotonic() + period)
+            else:
+                self.tx_scheduler.add(frame_id, period)
+
+    def _unschedule_message_if_idle(self, message):
+        """Remove the message from the TX scheduler if none of its signals are toggled on."""
+        if not self.signal_store.any_active(message.frame_id):
+            self.tx_scheduler.remove(message.frame_id)
+            if self.periodic_tasks is not None:
+                self.periodic_tasks.stop(message.frame_id)
+
+    def _apply_message_period(self, message):
+        """Push the current cycle period of a scheduled message to the scheduler and its periodic task."""
+        frame_id = message.frame_id
+        if not self.tx_scheduler.is_scheduled(frame_id):
+            return
+        period = self.message_period(message)
+        self.signal_store.set_message_tick(frame_id, period)
+        self.tx_stats.set_period(frame_id, period)
+        self.tx_scheduler.set_period(frame_id, period)
+        if self.tx_offloaded:
+            self.periodic_tasks.set_period(frame_id, period)
+
+    def _start_periodic_task(self, message, period, payload):
+        """Register 'message' as a periodic task on the bus, sending 'payload' until it is modified."""
+        self.periodic_tasks.start(message.frame_id, payload, period, message.is_extended_frame,
+                                  message.is_fd, message.is_fd and self.bitrate_switch)
+
+    def _make_frame(self, message, payload):
+        """can.Message carrying 'payload' for 'message', with its ID type and CAN FD flags."""
+        return can.Message(
+            arbitration_id=message.frame_id,
+            data=payload,
+            is_extended_id=message.is_extended_frame,
+            is_fd=message.is_fd,
+            bitrate_switch=message.is_fd and self.bitrate_switch
+        )
+
+    def _on_transmit_error(self, frame_id, error):
+        """Called on the scheduler thread when building a frame fails; the message has already been unscheduled."""
+        self.on_error(f"Failed to send message 0x{frame_id:X}: {str(error)}")
+
+    def _send_final_off(self, message, sids):
+        """
+        Build and send a single frame for 'message' where the signals 'sids' are forced to their neutral (zero)
+        values. Other signals keep their last known values to avoid disturbing them.
+        """
+        tx_queue = self.tx_queue
+        if tx_queue is None:
+            return
+        store = self.signal_store
+        try:
+            frame_id = message.frame_id
+            # Start from last known values and force the target signals to neutral
+            base_vals = store.message_values(frame_id)
+            for sid in sids:
+                base_vals[store.names[sid]] = store.neutral[sid]
+
+            encoded = message.encode(base_vals)
+            if self.tx_offloaded and self.periodic_tasks.is_running(frame_id):
+                if store.any_active(frame_id):
+                    # Other signals keep the task alive: the periodic frame itself carries the neutral values
+                    self.periodic_tasks.modify(frame_id, encoded)
+                    for sid in sids:
+                        store.current[sid] = store.neutral[sid]
+                    return
+                # Last active signal: stop the task so it cannot overwrite the final frame
+                self.periodic_tasks.stop(frame_id)
+            msg = self._make_frame(message, encoded)
+            tx_queue.put(msg, cyclic=False)
+            # Update cached values to reflect the off-send
+            for sid in sids:
+                store.current[sid] = store.neutral[sid]
+        except Exception as e:
+            what = store.names[sids[0]] if len(sids) == 1 else message.name
+            self.on_error(f"Failed to send final off for {what} (0x{message.frame_id:X}): {str(e)}")
+
+    def _transmit_message(self, frame_id):
+        """
+        One scheduler tick for a message (runs on the scheduler thread): queue the frame, or with
+        offloaded TX, push the new payload to its periodic task.
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            self._transmit_message_profiled(frame_id, profiler)
+            return
+        message = self.messages_by_id.get(frame_id)
+        tx_queue = self.tx_queue
+        if message is None or tx_queue is None:
+            return
+        encoded = self._build_payload(message)
+        if encoded is None:
+            return
+        if self.tx_offloaded:
+            self.periodic_tasks.modify(frame_id, encoded)
+            return
+        msg = self._make_frame(message, encoded)
+        tx_queue.put(msg)
+
+    def _transmit_message_profiled(self, frame_id, profiler):
+        """_transmit_message() with every phase recorded; kept separate so the normal path has no timing calls."""
+        message = self.messages_by_id.get(frame_id)
+        tx_queue = self.tx_queue
+        if message is None or tx_queue is None:
+            return
+        started = time.perf_counter()
+        active = self.signal_store.step_message(frame_id)
+        started = profiler.record(PHASE_RESOLVE, frame_id, started)
+        if not active:
+            return
+        encoded = self.frame_encoders[frame_id].encode_indexed(
+            self.signal_store.current, self.signal_store.message_signal_ids[frame_id]
+        )
+        started = profiler.record(PHASE_ENCODE, frame_id, started)
+        if self.tx_offloaded:
+            self.periodic_tasks.modify(frame_id, encoded)
+            profiler.record(PHASE_SEND, frame_id, started)
+            return
+        msg = self._make_frame(message, encoded)
+        profiler.record(PHASE_BUILD, frame_id, started)
+        tx_queue.put(msg)  # the queue records the send
+
+    def start_profiling(self, capacity=PROFILE_BUFFER_CAPACITY):
+        """
+        Start recording the phases of the send path (see HotPathProfiler) into a new profile;
+        'capacity' events are kept per thread. Export it with export_profile().
+        """
+        if self.sender is not None:
+            self.sender.call("start_profiling", capacity)
+            self.profiling = True
+            return
+        profiler = HotPathProfiler(capacity)
+        self.profiling = True
+        self.profiler = self.last_profiler = profiler
+        self.tx_scheduler.profiler = profiler
+        if self.tx_queue is not None:
+            self.tx_queue.profiler = profiler
+
+    def stop_profiling(self):
+        """Stop recording; the profile is kept for export_profile()."""
+        self.profiling = False
+        if self.sender is not None:
+            try:
+                self.sender.call("stop_profiling")
+            except ValueError:
+                pass  # a stopped sender process has already been reported
+            return
+        self.profiler = None
+        self.tx_scheduler.profiler = None
+        if self.tx_queue is not None:
+            self.tx_queue.profiler = None
+
+    def record_gui_work(self, started):
+        """Record GUI work (main thread) that started at 'started' (time.perf_counter()) while profiling."""
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.record(PHASE_GUI, NO_FRAME, started)
+
+    def export_profile(self, trace_path=None, summary_path=None):
+        """
+        Write the latest profile as a Chrome trace JSON file (chrome://tracing, Perfetto) and/or as
+        a CSV summary per frame_id and phase (see HotPathProfiler.summary_rows). Returns
+        (events recorded, events overwritten). Raises ValueError if nothing was profiled.
+        """
+        if self.sender is not None:
+            return self.sender.call("export_profile", trace_path and os.path.abspath(trace_path),
+                                    summary_path and os.path.abspath(summary_path), timeout=EXPORT_TIMEOUT)
+        profiler = self.last_profiler
+        if profiler is None:
+            raise ValueError("Nothing has been profiled yet")
+        names = self._message_names()
+        if trace_path:
+            profiler.export_chrome_trace(trace_path, names)
+        if summary_path:
+            profiler.export_summary_csv(summary_path, names)
+        return profiler.events_recorded, profiler.events_overwritten
+
+    def _on_frame_sent(self, msg, cyclic):
+        """TxQueue callback (sender thread): a frame went out."""
+        self.tx_stats.record_sent(msg.arbitration_id, cyclic=cyclic)
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(msg)
+
+    def _on_send_error(self, msg, error):
+        """TxQueue callback (sender thread): one send attempt failed; the queue retries or gives up."""
+        self.tx_stats.record_error(msg.arbitration_id, error)
+
+    def tx_queue_status(self):
+        """Aggregated TX queue counters (see TxQueue.status), or None without a bus."""
+        if self.sender is not None:
+            try:
+                return self.sender.call("tx_queue_status")
+            except ValueError:
+                return None
+        if self.tx_queue is None:
+            return None
+        return self.tx_queue.status()
+
+    def bus_load(self):
+        """Bus load (%) caused by this tool since the previous call, or None without a bus."""
+        if self.sender is not None:
+            try:
+                return self.sender.call("bus_load")
+            except ValueError:
+                return None  # a stopped sender process has already been reported
+        if self.bus is None:
+            return None
+        return self.tx_stats.bus_load(self.bitrate, self.data_bitrate if self.bitrate_switch else None)
+
+    def tx_stats_rows(self):
+        """Per-frame TX statistics with message names (see TxStats.rows)."""
+        if self.sender is not None:
+            try:
+                return self.sender.call("tx_stats_rows")
+            except ValueError:
+                return []
+        return self.tx_stats.rows(self._message_names())
+
+    def reset_tx_stats(self):
+        """Start the per-frame TX statistics over."""
+        if self.sender is not None:
+            self.sender.send("reset_tx_stats")
+            return
+        self.tx_stats.reset()
+        if self.tx_queue is not None:
+            self.tx_queue.reset_counters()
+
+    def export_tx_stats(self, path):
+        """Write the per-frame TX statistics to a CSV file."""
+        if self.sender is not None:
+            self.sender.call("export_tx_stats", os.path.abspath(path))
+            return
+        self.tx_stats.export_csv(path, self._message_names())
+
+    def _message_names(self):
+        return {frame_id: message.name for frame_id, message in self.messages_by_id.items()}
+
+    def _build_payload(self, message):
+        """
+        Advance the signal values of 'message' by one cycle (see SignalStore.step_message) and
+        return the encoded payload, or None if none of its signals are toggled on.
+        """
+        frame_id = message.frame_id
+        if not self.signal_store.step_message(frame_id):
+            return None
+        return self.frame_encoders[frame_id].encode_indexed(
+            self.signal_store.current, self.signal_store.message_signal_ids[frame_id]
+        )
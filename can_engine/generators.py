@@ -0,0 +1,179 @@
+import math
+import random
+import re
+from array import array
+
+# NumPy only speeds up building tables; the pure-Python path gives the same samples. It is imported
+# when the first table is built (see _import_numpy), as importing it would slow down startup.
+numpy = None
+_numpy_imported = False
+
+# Longest table built for one signal (e.g. a 1 h ramp at 10 ms needs 360000 samples)
+MAX_TABLE_SAMPLES = 2000000
+# Ticks before a random walk retraces its path (it is mirrored so the table loops without a jump)
+RANDOM_WALK_TICKS = 20000
+
+_ENTRY_PATTERN = re.compile(r"^\s*([a-zA-Z]+)\s*\((.*)\)\s*$")
+
+
+def _import_numpy():
+    """Set the module-level 'numpy' to NumPy, or leave it None if NumPy is not installed."""
+    global numpy, _numpy_imported
+    if not _numpy_imported:
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+        numpy = module
+        _numpy_imported = True
+
+
+class GeneratorSpec:
+    """
+    A parsed generator entry. Physical min/max arguments left out default to the signal's range.
+
+    Entry syntax (times in seconds):
+      ramp(duration[, start, end])          start -> end once, then hold 'end'
+      saw(period[, min, max])               sawtooth: min -> max, jump back
+      tri(period[, min, max])               triangle: min -> max -> min
+      sine(period[, min, max])              sine between min and max, starting at the midpoint
+      square(period[, low, high[, duty]])   'high' for duty (0..1, default 0.5) of the period, else 'low'
+      walk(step[, min, max])                random walk by up to 'step' per tick, within min..max
+      steps(hold, v1, v2, ...)              each value for 'hold' seconds, then repeat
+    """
+
+    NAMES = ("ramp", "saw", "tri", "sine", "square", "walk", "steps")
+
+    def __init__(self, name, args, text):
+        self.name = name
+        self.args = args
+        self.text = text
+
+    def build_table(self, tick, phys_min, phys_max):
+        """
+        Samples for one period at 'tick' seconds per sample, clamped to the physical range.
+        Returns (array('d'), repeat); repeat False means the last sample is held (ramp).
+        """
+        _import_numpy()
+        builder = getattr(self, "_build_" + self.name)
+        samples, repeat = builder(tick, phys_min, phys_max)
+        if numpy is not None:
+            return array("d", numpy.clip(samples, phys_min, phys_max).astype("d").tobytes()), repeat
+        return array("d", [phys_min if v < phys_min else phys_max if v > phys_max else v for v in samples]), repeat
+
+    def _range(self, first, phys_min, phys_max):
+        """(min, max) from the arguments at index 'first' and 'first' + 1, defaulting to the physical range."""
+        low = self.args[first] if len(self.args) > first else phys_min
+        high = self.args[first + 1] if len(self.args) > first + 1 else phys_max
+        return low, high
+
+    @staticmethod
+    def _count(seconds, tick):
+        count = max(1, int(round(seconds / tick)))
+        if count > MAX_TABLE_SAMPLES:
+            raise ValueError(f"{seconds} s at {tick * 1000:g} ms needs more than {MAX_TABLE_SAMPLES} samples")
+        return count
+
+    @staticmethod
+    def _phases(count):
+        """count evenly spaced phases in [0, 1)."""
+        if numpy is not None:
+            return numpy.arange(count, dtype="d") / count
+        return [i / count for i in range(count)]
+
+    def _build_ramp(self, tick, phys_min, phys_max):
+        start, end = self._range(1, phys_min, phys_max)
+        count = self._count(self.args[0], tick) + 1  # include the end value
+        if numpy is not None:
+            return numpy.linspace(start, end, count), False
+        return [start + (end - start) * i / (count - 1) for i in range(count)], False
+
+    def _build_saw(self, tick, phys_min, phys_max):
+        low, high = self._range(1, phys_min, phys_max)
+        count = self._count(self.args[0], tick)
+        if count == 1:
+            return [low], True
+        if numpy is not None:
+            return low + (high - low) * numpy.arange(count, dtype="d") / (count - 1), True
+        return [low + (high - low) * i / (count - 1) for i in range(count)], True
+
+    def _build_tri(self, tick, phys_min, phys_max):
+        low, high = self._range(1, phys_min, phys_max)
+        phases = self._phases(self._count(self.args[0], tick))
+        if numpy is not None:
+            return low + (high - low) * (1.0 - numpy.abs(2.0 * phases - 1.0)), True
+        return [low + (high - low) * (1.0 - abs(2.0 * p - 1.0)) for p in phases], True
+
+    def _build_sine(self, tick, phys_min, phys_max):
+        low, high = self._range(1, phys_min, phys_max)
+        middle = (low + high) / 2.0
+        amplitude = (high - low) / 2.0
+        phases = self._phases(self._count(self.args[0], tick))
+        if numpy is not None:
+            return middle + amplitude * numpy.sin(2.0 * math.pi * phases), True
+        return [middle + amplitude * math.sin(2.0 * math.pi * p) for p in phases], True
+
+    def _build_square(self, tick, phys_min, phys_max):
+        low, high = self._range(1, phys_min, phys_max)
+        duty = self.args[3] if len(self.args) > 3 else 0.5
+        phases = self._phases(self._count(self.args[0], tick))
+        if numpy is not None:
+            return numpy.where(phases < duty, high, low), True
+        return [high if p < duty else low for p in phases], True
+
+    def _build_walk(self, tick, phys_min, phys_max):
+        low, high = self._range(1, phys_min, phys_max)
+        step = self.args[0]
+        rng = random.Random()
+        value = (low + high) / 2.0
+        half = [value]
+        for _ in range(RANDOM_WALK_TICKS // 2 - 1):
+            value += rng.uniform(-step, step)
+            # Reflect at the limits so the walk keeps moving instead of sticking to them
+            if value > high:
+                value = max(low, 2 * high - value)
+            elif value < low:
+                value = min(high, 2 * low - value)
+            half.append(value)
+        return half + half[::-1], True
+
+    def _build_steps(self, tick, phys_min, phys_max):
+        hold = self._count(self.args[0], tick)
+        if len(self.args) * hold > MAX_TABLE_SAMPLES:
+            raise ValueError(f"Step sequence needs more than {MAX_TABLE_SAMPLES} samples")
+        samples = []
+        for value in self.args[1:]:
+            samples.extend([value] * hold)
+        return samples, True
+
+
+def parse_generator(text):
+    """
+    Parse generator entry text (see GeneratorSpec) into a GeneratorSpec, or return None if the
+    text is not a generator call. Raises ValueError for a generator call with invalid arguments.
+    """
+    match = _ENTRY_PATTERN.match(text)
+    if match is None:
+        return None
+    name = match.group(1).lower()
+    if name not in GeneratorSpec.NAMES:
+        raise ValueError(f"Unknown generator '{name}'. Use one of: {', '.join(GeneratorSpec.NAMES)}")
+    raw_args = [arg.strip() for arg in match.group(2).split(",")] if match.group(2).strip() else []
+    try:
+        args = [float(arg) for arg in raw_args]
+    except ValueError:
+        raise ValueError(f"Generator arguments must be numbers: {text.strip()}")
+    if any(math.isnan(arg) or math.isinf(arg) for arg in args):
+        raise ValueError(f"Generator arguments must be finite: {text.strip()}")
+
+    max_args = {"ramp": 3, "saw": 3, "tri": 3, "sine": 3, "square": 4, "walk": 3}
+    if name == "steps":
+        if len(args) < 2:
+            raise ValueError("steps() needs a hold time and at least one value")
+    elif not 1 <= len(args) <= max_args[name]:
+        raise ValueError(f"{name}() takes 1 to {max_args[name]} arguments")
+    if args[0] <= 0:
+        raise ValueError(f"The first argument of {name}() must be positive")
+    if name == "square" and len(args) > 3 and not 0.0 <= args[3] <= 1.0:
+        raise ValueError("The duty cycle of square() must be between 0 and 1")
+    return GeneratorSpec(name, args, text.strip())
@@ -0,0 +1,67 @@
+import can
+
+from .dbc_cache import DbcCache
+from .engine import INTERFACE_CHANNEL_MAP, CanEngine, _print_error
+
+DISCOVERY_TIMEOUT = 5.0  # seconds per interface
+
+
+def discover_channels(interfaces=None, timeout=DISCOVERY_TIMEOUT):
+    """
+    Channels the installed drivers report as available, as {python-can interface: [channel, ...]}.
+    interfaces: python-can interface names to probe (default: those of INTERFACE_CHANNEL_MAP).
+    Probing can take seconds; interfaces without a driver or without detection support are left out.
+    """
+    if interfaces is None:
+        interfaces = sorted({interface for interface, _ in INTERFACE_CHANNEL_MAP.values()})
+    found = {}
+    for config in can.detect_available_configs(interfaces=interfaces, timeout=timeout):
+        channels = found.setdefault(config["interface"], [])
+        channel = str(config["channel"])
+        if channel not in channels:
+            channels.append(channel)
+    return found
+
+
+class CanNetwork:
+    """
+    Several CAN channels used at the same time, e.g. separate body, chassis and infotainment buses.
+
+    Every channel is a CanEngine with its own bus (any interface), bitrate, DBC, signal store and
+    TX scheduler thread (or sender process). A message is therefore sent on the channel whose DBC
+    defines it, and a slow or bus-off channel cannot hold up the others. Errors of a channel are
+    reported as on_error("[channel] text").
+    """
+
+    def __init__(self, dbc_cache=None, on_error=None):
+        self.dbc_cache = dbc_cache if dbc_cache is not None else DbcCache()
+        self.on_error = on_error or _print_error
+        self.channels = {}  # channel name -> CanEngine, in the order they were added
+
+    def add_channel(self, name):
+        """Create a channel (no bus yet) and return its CanEngine."""
+        if not name or name in self.channels:
+            raise ValueError(f"Channel name '{name}' is empty or already used")
+        engine = CanEngine(dbc_cache=self.dbc_cache, on_error=lambda text: self.on_error(f"[{name}] {text}"))
+        self.channels[name] = engine
+        return engine
+
+    def channel(self, name):
+        """CanEngine of a channel; raises ValueError for unknown names."""
+        engine = self.channels.get(name)
+        if engine is None:
+            raise ValueError(f"Unknown channel: {name}")
+        return engine
+
+    def remove_channel(self, name):
+        """Stop everything the channel sends and close its bus."""
+        self.channel(name).close()
+        del self.channels[name]
+
+    def bus_loads(self):
+        """{channel name: bus load (%) since the previous call} for every open channel."""
+        return {name: engine.bus_load() for name, engine in self.channels.items() if engine.is_open}
+
+    def close(self):
+        for engine in self.channels.values():
+            engine.close()
@@ -0,0 +1,72 @@
+from threading import Lock
+
+import can
+
+
+def has_native_periodic(bus):
+    """
+    True if the bus implements periodic transmission itself (e.g. SocketCAN BCM, IXXAT).
+    Other interfaces fall back to one python-can thread per task, which is no better than TxScheduler.
+    """
+    return type(bus)._send_periodic_internal is not can.BusABC._send_periodic_internal
+
+
+class PeriodicTaskManager:
+    """
+    One python-can periodic task per frame_id, so cycle timing comes from the kernel or adapter.
+
+    Tasks are started and stopped by the owner of the schedule (the UI thread); any thread may push
+    payload updates with modify(), which calls modify_data() only when the payload changed
+    (FrameEncoder returns the same object for an unchanged payload). Changing the period restarts
+    the task, since python-can tasks have a fixed period.
+    """
+
+    def __init__(self, bus):
+        self.bus = bus
+        self._lock = Lock()
+        self._tasks = {}  # frame_id -> [task, payload, period, frame flags (can.Message keyword arguments)]
+
+    def is_running(self, frame_id):
+        with self._lock:
+            return frame_id in self._tasks
+
+    def start(self, frame_id, payload, period, is_extended_id, is_fd=False, bitrate_switch=False):
+        """Start (or restart) the periodic task for frame_id."""
+        self._start(frame_id, payload, period,
+                    {"is_extended_id": is_extended_id, "is_fd": is_fd, "bitrate_switch": bitrate_switch})
+
+    def _start(self, frame_id, payload, period, flags):
+        self.stop(frame_id)
+        msg = can.Message(arbitration_id=frame_id, data=payload, **flags)
+        task = self.bus.send_periodic(msg, period, store_task=False)
+        with self._lock:
+            self._tasks[frame_id] = [task, payload, period, flags]
+
+    def modify(self, frame_id, payload):
+        """Push a new payload to a running task; no-op if the task is not running or nothing changed."""
+        with self._lock:
+            entry = self._tasks.get(frame_id)
+            if entry is None or payload is entry[1] or payload == entry[1]:
+                return
+            entry[1] = payload
+            entry[0].modify_data(can.Message(arbitration_id=frame_id, data=payload, **entry[3]))
+
+    def set_period(self, frame_id, period):
+        """Restart a running task with a new period."""
+        with self._lock:
+            entry = self._tasks.get(frame_id)
+        if entry is not None and entry[2] != period:
+            self._start(frame_id, entry[1], period, entry[3])
+
+    def stop(self, frame_id):
+        with self._lock:
+            entry = self._tasks.pop(frame_id, None)
+        if entry is not None:
+            entry[0].stop()
+
+    def stop_all(self):
+        with self._lock:
+            entries = list(self._tasks.values())
+            self._tasks.clear()
+        for entry in entries:
+            entry[0].stop()
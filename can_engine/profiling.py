@@ -0,0 +1,211 @@
+import csv
+import json
+import os
+import time
+from array import array
+from bisect import bisect_left
+from threading import Lock, current_thread, get_native_id, local
+
+# Phases of the send path, in the order a frame goes through them. 'wait' is the scheduler sleeping
+# until the next deadline and 'late' the part of it after the deadline passed (sleep overshoot);
+# 'gui' marks Tk work in the same process, to see it compete with the send path for the GIL.
+PHASE_RESOLVE = "resolve"  # advancing the signal values of a message (SignalStore.step_message)
+PHASE_ENCODE = "encode"
+PHASE_BUILD = "build"  # can.Message construction
+PHASE_SEND = "send"  # bus.send(), or handing the payload to an offloaded periodic task
+PHASE_WAIT = "wait"
+PHASE_LATE = "late"
+PHASE_GUI = "gui"
+PHASES = (PHASE_RESOLVE, PHASE_ENCODE, PHASE_BUILD, PHASE_SEND, PHASE_WAIT, PHASE_LATE, PHASE_GUI)
+_PHASE_CODES = {phase: code for code, phase in enumerate(PHASES)}
+
+NO_FRAME = -1  # frame_id of events that do not belong to one frame (wait, late, gui)
+
+# Events kept per thread; about 2.5 MB each, several seconds of a busy send path
+PROFILE_BUFFER_CAPACITY = 100000
+
+# Upper bucket edges (µs) of the duration histograms in the summary
+HISTOGRAM_EDGES_US = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+SUMMARY_CSV_COLUMNS = (
+    ["frame_id", "message", "phase", "count", "mean_us", "p50_us", "p99_us", "max_us"]
+    + [f"<={edge}us" for edge in HISTOGRAM_EDGES_US] + [f">{HISTOGRAM_EDGES_US[-1]}us"]
+)
+
+
+class ProfileBuffer:
+    """
+    Fixed-size ring buffer of the profile events of one thread, preallocated so recording never
+    allocates. Written by its thread only; when full, the oldest events are overwritten.
+    """
+
+    def __init__(self, capacity, thread_name, thread_id):
+        self.capacity = capacity
+        self.thread_name = thread_name
+        self.thread_id = thread_id
+        self.phases = bytearray(capacity)
+        self.frame_ids = array("q", [0]) * capacity
+        self.starts = array("d", bytes(8 * capacity))
+        self.ends = array("d", bytes(8 * capacity))
+        self.total = 0  # events ever recorded
+
+    @property
+    def overwritten(self):
+        return max(0, self.total - self.capacity)
+
+    def events(self):
+        """The buffered events, oldest first, as (phase, frame_id, start, end) tuples."""
+        total = self.total
+        events = []
+        for index in range(max(0, total - self.capacity), total):
+            slot = index % self.capacity
+            events.append((PHASES[self.phases[slot]], self.frame_ids[slot], self.starts[slot], self.ends[slot]))
+        return events
+
+
+class HotPathProfiler:
+    """
+    Opt-in timing of the send path phases (see PHASES), for finding out whether bad timing comes
+    from encoding, bus.send(), GUI work or the scheduler waking up late.
+
+    The instrumented code (TxScheduler, CanEngine._transmit_message, TxQueue) only looks at its
+    'profiler' attribute, which is None unless profiling is on. Each thread records into its own
+    ProfileBuffer, so recording takes no lock. Times are time.perf_counter() values.
+
+    The events can be exported as a Chrome trace (chrome://tracing, https://ui.perfetto.dev) with one
+    track per thread, and summarized per frame_id and phase as duration percentiles and a histogram.
+    """
+
+    def __init__(self, capacity=PROFILE_BUFFER_CAPACITY):
+        if capacity < 1:
+            raise ValueError("Profile buffer capacity must be at least 1")
+        self.capacity = capacity
+        self.started = time.perf_counter()
+        self._local = local()
+        self._buffers = []
+        self._lock = Lock()
+
+    def _buffer(self):
+        """ProfileBuffer of the calling thread, created on its first event."""
+        try:
+            return self._local.buffer
+        except AttributeError:
+            thread = current_thread()
+            buffer = self._local.buffer = ProfileBuffer(self.capacity, thread.name, get_native_id())
+            with self._lock:
+                self._buffers.append(buffer)
+            return buffer
+
+    def record(self, phase, frame_id, start, end=None):
+        """
+        Record one event of the calling thread that started at 'start' and ends at 'end' (default:
+        now). Returns the end time, so consecutive phases can be chained.
+        """
+        if end is None:
+            end = time.perf_counter()
+        buffer = self._buffer()
+        slot = buffer.total % buffer.capacity
+        buffer.phases[slot] = _PHASE_CODES[phase]
+        buffer.frame_ids[slot] = frame_id
+        buffer.starts[slot] = start
+        buffer.ends[slot] = end
+        buffer.total += 1
+        return end
+
+    def record_wait(self, start, deadline):
+        """
+        Record a scheduler wait from 'start' until now for a deadline in time.monotonic() time;
+        the time it woke up after the deadline is recorded as a nested 'late' event.
+        """
+        end = self.record(PHASE_WAIT, NO_FRAME, start)
+        late = min(time.monotonic() - deadline, end - start)
+        if late > 0:
+            self.record(PHASE_LATE, NO_FRAME, end - late, end)
+
+    def buffers(self):
+        with self._lock:
+            return list(self._buffers)
+
+    @property
+    def events_recorded(self):
+        return sum(buffer.total for buffer in self.buffers())
+
+    @property
+    def events_overwritten(self):
+        return sum(buffer.overwritten for buffer in self.buffers())
+
+    def chrome_trace(self, message_names=None):
+        """The buffered events in the Chrome trace event format (a JSON-serializable dict)."""
+        names = message_names or {}
+        pid = os.getpid()
+        events = []
+        for buffer in self.buffers():
+            tid = buffer.thread_id
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": buffer.thread_name}})
+            for phase, frame_id, start, end in buffer.events():
+                event = {
+                    "name": phase,
+                    "cat": "tx",
+                    "ph": "X",
+                    "pid": pid,
+                    "tid": tid,
+                    "ts": round((start - self.started) * 1e6, 3),
+                    "dur": round((end - start) * 1e6, 3),
+                }
+                if frame_id != NO_FRAME:
+                    event["args"] = {"frame_id": f"0x{frame_id:X}", "message": names.get(frame_id, "")}
+                events.append(event)
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"events_recorded": self.events_recorded, "events_overwritten": self.events_overwritten},
+        }
+
+    def export_chrome_trace(self, path, message_names=None):
+        """Write chrome_trace() to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(message_names), f)
+
+    def summary_rows(self, message_names=None):
+        """
+        One dict per (frame_id, phase) with the SUMMARY_CSV_COLUMNS keys, durations in µs, ordered by
+        frame_id (events without a frame_id last) and phase.
+        """
+        names = message_names or {}
+        durations = {}  # (frame_id, phase) -> [µs]
+        for buffer in self.buffers():
+            for phase, frame_id, start, end in buffer.events():
+                durations.setdefault((frame_id, phase), []).append((end - start) * 1e6)
+
+        def order(key):
+            frame_id, phase = key
+            return frame_id == NO_FRAME, frame_id, _PHASE_CODES[phase]
+
+        rows = []
+        for frame_id, phase in sorted(durations, key=order):
+            values = sorted(durations[frame_id, phase])
+            count = len(values)
+            row = {
+                "frame_id": "" if frame_id == NO_FRAME else f"0x{frame_id:X}",
+                "message": names.get(frame_id, ""),
+                "phase": phase,
+                "count": count,
+                "mean_us": round(sum(values) / count, 1),
+                "p50_us": round(values[(count - 1) // 2], 1),
+                "p99_us": round(values[min(count - 1, int(count * 0.99))], 1),
+                "max_us": round(values[-1], 1),
+            }
+            buckets = [0] * (len(HISTOGRAM_EDGES_US) + 1)
+            for value in values:
+                buckets[bisect_left(HISTOGRAM_EDGES_US, value)] += 1
+            row.update(zip(SUMMARY_CSV_COLUMNS[8:], buckets))
+            rows.append(row)
+        return rows
+
+    def export_summary_csv(self, path, message_names=None):
+        """Write summary_rows() to a CSV file."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_CSV_COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.summary_rows(message_names))
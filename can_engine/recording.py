@@ -0,0 +1,188 @@
+import os
+import queue
+import time
+from threading import Event, Thread
+
+import can
+
+LOG_FORMATS = (".blf", ".asc")
+WRITE_BATCH_SIZE = 4096  # frames written per writer wake-up at most
+FILE_BUFFER_SIZE = 1024 * 1024
+REPLAY_SPIN_THRESHOLD = 0.001
+
+_STOP = object()
+
+
+def _open_log_writer(path):
+    """python-can BLF/ASC writer on a file with a large write buffer."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".blf":
+        return can.BLFWriter(open(path, "wb", buffering=FILE_BUFFER_SIZE))
+    if extension == ".asc":
+        return can.ASCWriter(open(path, "w", buffering=FILE_BUFFER_SIZE, encoding="utf-8"))
+    raise ValueError(f"Unsupported log format '{extension}'. Use one of: {', '.join(LOG_FORMATS)}")
+
+
+def write_log(path, messages):
+    """Write can.Messages to a .blf or .asc file in one go. Returns the number of frames written."""
+    writer = _open_log_writer(path)
+    count = 0
+    try:
+        for msg in messages:
+            writer.on_message_received(msg)
+            count += 1
+    finally:
+        writer.stop()
+    return count
+
+
+class TrafficRecorder(can.Listener):
+    """
+    Records CAN frames to a BLF or ASC file without blocking the threads that produce them.
+
+    record() (TX path) and on_message_received() (as a can.Notifier listener, RX path) only put
+    the message on a SimpleQueue. A writer thread blocks on the queue, drains up to
+    WRITE_BATCH_SIZE frames per wake-up and passes them to python-can's writer on a buffered file,
+    so disk I/O happens off the send and receive threads.
+    """
+
+    def __init__(self, path, report_error=None):
+        self.path = path
+        self.report_error = report_error
+        self.recorded = 0
+        self.write_errors = 0
+        self._queue = queue.SimpleQueue()
+        self._writer = _open_log_writer(path)
+        self._thread = Thread(target=self._run, name="traffic-recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, msg):
+        """Queue a transmitted frame; timestamps it now and marks it as TX."""
+        msg.timestamp = time.time()
+        msg.is_rx = False
+        self._queue.put(msg)
+
+    def on_message_received(self, msg):
+        self._queue.put(msg)
+
+    def stop(self, timeout=10.0):
+        """Write every queued frame, then close the file."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+
+    def _run(self):
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        writer = self._writer
+        running = True
+        while running:
+            batch = [get()]
+            try:
+                while len(batch) < WRITE_BATCH_SIZE:
+                    batch.append(get_nowait())
+            except queue.Empty:
+                pass
+            for msg in batch:
+                if msg is _STOP:
+                    running = False
+                    continue
+                try:
+                    writer.on_message_received(msg)
+                    self.recorded += 1
+                except Exception as e:
+                    # Keep draining the queue so memory does not grow; report the first failure
+                    self.write_errors += 1
+                    if self.write_errors == 1 and self.report_error is not None:
+                        self.report_error(f"Failed to write {self.path}: {str(e)}")
+        try:
+            writer.stop()
+        except Exception as e:
+            if self.report_error is not None:
+                self.report_error(f"Failed to close {self.path}: {str(e)}")
+
+
+class LogReplayer:
+    """
+    Re-transmits the frames of a BLF/ASC log at their original relative timestamps.
+
+    The log is streamed with python-can's readers, one frame at a time, so logs of any size
+    replay in constant memory. Each frame is sent at start + (timestamp - first timestamp) / speed;
+    the thread sleeps until just before that deadline and yields for the rest, as TxScheduler does.
+    Error frames are skipped; with tx_only, so are frames recorded as received.
+    """
+
+    def __init__(self, send, path, speed=1.0, tx_only=False, on_finished=None, report_error=None):
+        """
+        send: callable(can.Message) that transmits a frame.
+        on_finished: optional callable(replayer) called on the replay thread at the end.
+        """
+        if speed <= 0:
+            raise ValueError("Replay speed must be positive")
+        if not os.path.isfile(path):
+            raise ValueError(f"Log file not found: {path}")
+        self.send = send
+        self.path = path
+        self.speed = speed
+        self.tx_only = tx_only
+        self.on_finished = on_finished
+        self.report_error = report_error
+        self.sent = 0
+        self.skipped = 0
+        self.error = None
+        self._stop = Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._thread = Thread(target=self._run, name="log-replay", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def wait(self, timeout=None):
+        """Block until the replay has finished; returns True if it did."""
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        return not self.running
+
+    def _run(self):
+        try:
+            self._replay()
+        except Exception as e:
+            self.error = e
+            if self.report_error is not None:
+                self.report_error(f"Replay of {self.path} failed after {self.sent} frames: {str(e)}")
+        finally:
+            if self.on_finished is not None:
+                self.on_finished(self)
+
+    def _replay(self):
+        stop = self._stop
+        speed = self.speed
+        first_timestamp = None
+        start = None
+        for msg in can.LogReader(self.path):
+            if stop.is_set():
+                return
+            if msg.is_error_frame or (self.tx_only and msg.is_rx):
+                self.skipped += 1
+                continue
+            if first_timestamp is None:
+                first_timestamp = msg.timestamp
+                start = time.perf_counter()
+            deadline = start + (msg.timestamp - first_timestamp) / speed
+            remaining = deadline - time.perf_counter()
+            if remaining > REPLAY_SPIN_THRESHOLD:
+                # Wake up early (and remain stoppable), then yield until the deadline
+                if stop.wait(remaining - REPLAY_SPIN_THRESHOLD):
+                    return
+            while time.perf_counter() < deadline:
+                time.sleep(0)
+            self.send(msg)
+            self.sent += 1
@@ -0,0 +1,151 @@
+import time
+from array import array
+
+import can
+
+# About 15 s of a 100% loaded 1 Mbit/s bus (~8000 frames/s) in about 10 MB
+RX_BUFFER_CAPACITY = 120000
+MAX_DATA_LENGTH = 64  # room for CAN FD payloads
+
+# Frame flags kept per buffered frame
+_FLAG_EXTENDED = 1
+_FLAG_FD = 2
+_FLAG_BRS = 4
+
+
+class RxRingBuffer:
+    """
+    Fixed-size ring buffer of raw received frames, preallocated so memory never grows.
+
+    Written by the notifier thread only; readers take a consistent-enough snapshot with
+    recent(), e.g. to save the last seconds of traffic after something went wrong. When full,
+    the oldest frames are overwritten and counted in 'overwritten'.
+    """
+
+    def __init__(self, capacity=RX_BUFFER_CAPACITY):
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.frame_ids = array("L", [0]) * capacity
+        self.lengths = bytearray(capacity)
+        self.flags = bytearray(capacity)  # _FLAG_* bits
+        self.data = bytearray(capacity * MAX_DATA_LENGTH)
+        self.total = 0  # frames ever appended
+
+    @property
+    def overwritten(self):
+        return max(0, self.total - self.capacity)
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def append(self, timestamp, frame_id, data, flags=0):
+        slot = self.total % self.capacity
+        length = len(data)
+        self.timestamps[slot] = timestamp
+        self.frame_ids[slot] = frame_id
+        self.lengths[slot] = length
+        self.flags[slot] = flags
+        start = slot * MAX_DATA_LENGTH
+        self.data[start:start + length] = data
+        self.total += 1
+
+    def clear(self):
+        self.total = 0
+
+    def recent(self, count=None):
+        """The last 'count' frames (default: all buffered ones), oldest first, as received can.Messages."""
+        total = self.total
+        count = min(total, self.capacity) if count is None else min(count, total, self.capacity)
+        frames = []
+        for index in range(total - count, total):
+            slot = index % self.capacity
+            start = slot * MAX_DATA_LENGTH
+            flags = self.flags[slot]
+            frames.append(can.Message(
+                timestamp=self.timestamps[slot],
+                arbitration_id=self.frame_ids[slot],
+                data=bytes(self.data[start:start + self.lengths[slot]]),
+                is_extended_id=bool(flags & _FLAG_EXTENDED),
+                is_fd=bool(flags & _FLAG_FD),
+                bitrate_switch=bool(flags & _FLAG_BRS),
+                is_rx=True,
+            ))
+        return frames
+
+
+class RxFrameState:
+    """Latest received frame of one frame_id and its decoded values."""
+
+    __slots__ = ("frame_id", "count", "message", "decoded_message", "values")
+
+    def __init__(self, frame_id):
+        self.frame_id = frame_id
+        self.count = 0
+        self.message = None  # latest can.Message
+        self.decoded_message = None  # the can.Message 'values' was decoded from
+        self.values = None  # {signal_name: physical_value}, or None for unknown frames
+
+
+class RxMonitor(can.Listener):
+    """
+    can.Notifier listener for the monitor view.
+
+    Per frame it only appends the raw frame to the ring buffer and keeps a reference to the
+    latest message of its frame_id, so it keeps up with a fully loaded bus without taking the
+    GIL away from the TX scheduler for long. Decoding happens in latest(), at the (low) rate
+    the view refreshes, and only for frame_ids that received something new since the last call.
+    """
+
+    def __init__(self, decoder_for, capacity=RX_BUFFER_CAPACITY, report_error=None):
+        """
+        decoder_for: callable(frame_id) -> cached decoder with decode(data), or None for unknown frames.
+        report_error: optional callable(text) for receive errors.
+        """
+        self.decoder_for = decoder_for
+        self.report_error = report_error
+        self.buffer = RxRingBuffer(capacity)
+        self.frames = {}  # frame_id -> RxFrameState
+        self.error_frames = 0
+        self.receive_errors = 0
+
+    def on_message_received(self, msg):
+        if msg.is_error_frame:
+            self.error_frames += 1
+            return
+        frame_id = msg.arbitration_id
+        self.buffer.append(msg.timestamp, frame_id, msg.data,
+                           msg.is_extended_id | msg.is_fd << 1 | msg.bitrate_switch << 2)
+        state = self.frames.get(frame_id)
+        if state is None:
+            state = self.frames[frame_id] = RxFrameState(frame_id)
+        state.count += 1
+        state.message = msg
+
+    def on_error(self, exc):
+        """Called on the notifier thread when bus.recv() fails; reports and backs off briefly."""
+        self.receive_errors += 1
+        if self.receive_errors == 1 and self.report_error is not None:
+            self.report_error(f"CAN receive failed: {str(exc)}")
+        time.sleep(0.1)
+
+    def clear(self):
+        self.frames = {}
+        self.buffer.clear()
+        self.error_frames = 0
+        self.receive_errors = 0
+
+    def latest(self):
+        """RxFrameState of every received frame_id, ordered by frame_id, decoded up to date."""
+        states = []
+        for frame_id in sorted(list(self.frames)):
+            state = self.frames[frame_id]
+            msg = state.message
+            if msg is not state.decoded_message:
+                decoder = self.decoder_for(frame_id)
+                try:
+                    state.values = decoder.decode(msg.data) if decoder is not None else None
+                except Exception:
+                    state.values = None
+                state.decoded_message = msg
+            states.append(state)
+        return states
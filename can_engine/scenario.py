@@ -0,0 +1,167 @@
+import json
+import time
+
+# Step actions and whether they name a signal
+STEP_ACTIONS = {
+    "on": True,  # set the value (default 'A') and turn the signal on
+    "off": True,  # turn the signal off and send its final-off frame
+    "value": True,  # change the value of a signal without toggling it
+    "all_on": False,
+    "all_off": False,
+}
+
+
+class ScenarioStep:
+    """One timed action: 'at' seconds after the scenario starts."""
+
+    __slots__ = ("at", "action", "signal", "value")
+
+    def __init__(self, at, action, signal=None, value=None):
+        self.at = at
+        self.action = action
+        self.signal = signal
+        self.value = value
+
+    def describe(self):
+        text = f"t={self.at:.3f}s {self.action}"
+        if self.signal is not None:
+            text += f" {self.signal}"
+        if self.value is not None:
+            text += f" = {self.value}"
+        return text
+
+
+class Scenario:
+    """
+    Timed signal steps, read from a JSON file:
+
+        {
+            "duration": 10.0,
+            "cycle_ms": 100,
+            "override_dbc": false,
+            "steps": [
+                {"at": 0.0, "action": "on", "signal": "VehicleSpeed", "value": 80},
+                {"at": 2.5, "action": "value", "signal": "VehicleSpeed", "value": "A"},
+                {"at": 5.0, "action": "off", "signal": "VehicleSpeed"},
+                {"at": 6.0, "action": "all_on"},
+                {"at": 9.0, "action": "all_off"}
+            ]
+        }
+
+    - duration: total run time in seconds (default: time of the last step)
+    - cycle_ms / override_dbc: optional default cycle time and "Override DBC" setting
+    - value: 'A' for auto-increment or a number, as in the GUI entry boxes
+    """
+
+    def __init__(self, steps, duration=None, cycle_ms=None, override_dbc=None):
+        self.steps = sorted(steps, key=lambda step: step.at)
+        last_step = self.steps[-1].at if self.steps else 0.0
+        self.duration = max(duration, last_step) if duration is not None else last_step
+        self.cycle_ms = cycle_ms
+        self.override_dbc = override_dbc
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a scenario from parsed JSON; raises ValueError for malformed steps."""
+        steps = []
+        for index, raw in enumerate(data.get("steps", [])):
+            action = raw.get("action")
+            if action not in STEP_ACTIONS:
+                raise ValueError(f"Step {index}: unknown action {action!r}")
+            signal = raw.get("signal")
+            if STEP_ACTIONS[action] and not signal:
+                raise ValueError(f"Step {index}: action '{action}' needs a 'signal'")
+            if action == "value" and "value" not in raw:
+                raise ValueError(f"Step {index}: action 'value' needs a 'value'")
+            try:
+                at = float(raw.get("at", 0.0))
+            except (TypeError, ValueError):
+                raise ValueError(f"Step {index}: invalid time {raw.get('at')!r}")
+            if at < 0:
+                raise ValueError(f"Step {index}: time must not be negative")
+            value = raw.get("value")
+            steps.append(ScenarioStep(at, action, signal, None if value is None else str(value)))
+
+        duration = data.get("duration")
+        cycle_ms = data.get("cycle_ms")
+        if cycle_ms is not None and (not isinstance(cycle_ms, int) or cycle_ms <= 0):
+            raise ValueError("cycle_ms must be a positive integer")
+        return cls(steps, None if duration is None else float(duration), cycle_ms, data.get("override_dbc"))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+class ScenarioRunner:
+    """
+    Run a Scenario against a CanEngine that already has a bus and a DBC.
+
+    Steps are applied at absolute deadlines relative to the start, so a slow step does not
+    shift the ones after it. Every failed step, every engine error (e.g. a frame that could
+    not be built on the scheduler thread) and frames the TX queue gave up on are collected in
+    'errors'; the run passes if there are none.
+    """
+
+    def __init__(self, engine, log=None):
+        self.engine = engine
+        self.log = log or (lambda text: None)
+        self.errors = []
+
+    def _record_error(self, text):
+        self.errors.append(text)
+        self.log(f"Error: {text}")
+
+    def run(self, scenario):
+        """Execute the scenario, turn everything off at the end and return True on pass."""
+        engine = self.engine
+        previous_on_error = engine.on_error
+        engine.on_error = self._record_error
+        status = engine.tx_queue_status()
+        failed_before = status["failed"] if status else 0
+        try:
+            if scenario.cycle_ms is not None or scenario.override_dbc is not None:
+                engine.set_default_cycle(
+                    scenario.cycle_ms if scenario.cycle_ms is not None else engine.default_cycle_ms,
+                    override=scenario.override_dbc,
+                )
+
+            start = time.monotonic()
+            for step in scenario.steps:
+                delay = start + step.at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    self._apply(step)
+                    self.log(step.describe())
+                except Exception as e:
+                    self._record_error(f"{step.describe()}: {str(e)}")
+
+            delay = start + scenario.duration - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            engine.all_off()
+            status = engine.tx_queue_status()
+            if status and status["failed"] > failed_before:
+                self._record_error(f"{status['failed'] - failed_before} frame(s) could not be sent "
+                                   f"(last error: {status['last_error']})")
+        finally:
+            engine.on_error = previous_on_error
+        return not self.errors
+
+    def _apply(self, step):
+        engine = self.engine
+        if step.action == "all_on":
+            engine.all_on()
+        elif step.action == "all_off":
+            engine.all_off()
+        else:
+            sid = engine.signal_id(step.signal)
+            if step.action == "off":
+                engine.signal_off(sid)
+                return
+            if step.value is not None or step.action == "on":
+                engine.set_signal_value(sid, step.value if step.value is not None else "A")
+            if step.action == "on":
+                engine.signal_on(sid)
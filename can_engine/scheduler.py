@@ -0,0 +1,177 @@
+import heapq
+import time
+from threading import Condition, Thread
+
+# Frames due within this many seconds of the earliest deadline are sent in the same wake-up
+BATCH_WINDOW = 0.0005
+
+
+def grid_deadline(after, period):
+    """The first multiple of 'period' (in monotonic time) at or after 'after'."""
+    remainder = after % period
+    return after if remainder == 0 else after - remainder + period
+
+
+class TxScheduler:
+    """
+    Single-thread, deadline-based cyclic transmit scheduler.
+
+    Every scheduled frame_id keeps an absolute next-due deadline in a min-heap.
+    The scheduler thread sleeps until the earliest deadline, then hands every due
+    frame_id to the transmit callback in one pass and re-arms it at
+    deadline + period, so encode/send time never accumulates as drift.
+
+    Deadlines lie on a grid of multiples of each frame's period, whenever the frame was
+    started, so frames with the same (or a multiple) period share one wake-up; frames due
+    within 'batch_window' of the earliest deadline go out with it, slightly early. The thread
+    only sleeps on a condition variable, so CPU use stays proportional to the wake-ups.
+    Its timing is that of the OS timer: wake-ups are typically 0.05-0.3 ms late on Linux, a few
+    ms on a loaded or virtualized machine, while on Windows they follow the system timer
+    resolution (1 ms, up to 15.6 ms when no application has raised it). Frames whose encode and send take longer than the cycle in
+    total fall behind; see benchmarks/tx_benchmark.py for the rates a machine sustains.
+
+    Starting or stopping an individual frame only touches the heap; no threads
+    are created or joined per message.
+    """
+
+    def __init__(self, transmit, on_error=None, batch_window=BATCH_WINDOW):
+        """
+        transmit: callable(frame_id) invoked on the scheduler thread when a frame is due.
+        on_error: optional callable(frame_id, exception); the frame is unscheduled before it is called.
+        batch_window: seconds by which a frame may be sent early to share the wake-up of an earlier one.
+        """
+        self._transmit = transmit
+        self._on_error = on_error
+        self._batch_window = batch_window
+
+        self._cond = Condition()
+        self._heap = []  # (deadline, seq, frame_id, generation)
+        self._periods = {}  # frame_id -> period (s)
+        self._generations = {}  # frame_id -> generation of the live heap entry
+        self._seq = 0
+        self._running = False
+        self._thread = None
+        self._tick_deadline = 0.0  # earliest deadline of the frames handed out by the last _collect_due
+        self.profiler = None  # HotPathProfiler while profiling; records the waits
+
+    def start(self):
+        """Start the scheduler thread (no-op if already running)."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = Thread(target=self._run, name="tx-scheduler", daemon=True)
+        self._thread.start()
+
+    def shutdown(self, timeout=2.0):
+        """Stop the scheduler thread and drop every scheduled frame."""
+        with self._cond:
+            self._running = False
+            self._heap.clear()
+            self._periods.clear()
+            self._generations.clear()
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def add(self, frame_id, period, first_due=None):
+        """
+        Schedule frame_id every 'period' seconds. The first transmission happens at
+        'first_due' (monotonic time) or immediately; either way the following ones are on
+        the period's grid (see grid_deadline). Re-adding a scheduled frame restarts it.
+        """
+        period = max(0.001, float(period))
+        with self._cond:
+            generation = self._generations.get(frame_id, 0) + 1
+            self._generations[frame_id] = generation
+            self._periods[frame_id] = period
+            if first_due is None:
+                # The previous grid point: due now, then re-armed onto the grid
+                now = time.monotonic()
+                due = now - now % period
+            else:
+                due = grid_deadline(first_due, period)
+            self._push(due, frame_id, generation)
+            self._cond.notify()
+
+    def remove(self, frame_id):
+        """Unschedule frame_id. Its stale heap entry is discarded lazily."""
+        with self._cond:
+            self._periods.pop(frame_id, None)
+            if frame_id in self._generations:
+                self._generations[frame_id] += 1
+
+    def set_period(self, frame_id, period):
+        """Change the period of a scheduled frame; the new period applies from its next deadline."""
+        with self._cond:
+            if frame_id in self._periods:
+                self._periods[frame_id] = max(0.001, float(period))
+
+    def is_scheduled(self, frame_id):
+        with self._cond:
+            return frame_id in self._periods
+
+    def scheduled_ids(self):
+        with self._cond:
+            return list(self._periods.keys())
+
+    def _push(self, deadline, frame_id, generation):
+        self._seq += 1
+        heapq.heappush(self._heap, (deadline, self._seq, frame_id, generation))
+
+    def _collect_due(self):
+        """
+        Wait for the earliest deadline and return the list of due frame_ids, re-armed for
+        their next period. Returns None when the scheduler is shutting down.
+        """
+        with self._cond:
+            while True:
+                if not self._running:
+                    return None
+                # Drop entries of frames that were removed or re-added meanwhile
+                while self._heap and self._generations.get(self._heap[0][2]) != self._heap[0][3]:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                remaining = self._heap[0][0] - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            now = time.monotonic()
+            self._tick_deadline = self._heap[0][0]
+            batch_end = now + self._batch_window
+            due = []
+            while self._heap and self._heap[0][0] <= batch_end:
+                deadline, _, frame_id, generation = heapq.heappop(self._heap)
+                if self._generations.get(frame_id) != generation:
+                    continue
+                due.append(frame_id)
+                period = self._periods[frame_id]
+                next_due = deadline + period
+                if next_due <= now:
+                    # Overrun: skip the missed slots but stay on the original time grid
+                    next_due += ((now - next_due) // period + 1) * period
+                self._push(next_due, frame_id, generation)
+            return due
+
+    def _run(self):
+        while True:
+            profiler = self.profiler
+            if profiler is not None:
+                wait_start = time.perf_counter()
+            due = self._collect_due()
+            if due is None:
+                return
+            if profiler is not None:
+                profiler.record_wait(wait_start, self._tick_deadline)
+            for frame_id in due:
+                try:
+                    self._transmit(frame_id)
+                except Exception as e:
+                    self.remove(frame_id)
+                    if self._on_error is not None:
+                        self._on_error(frame_id, e)
@@ -0,0 +1,311 @@
+import multiprocessing
+import queue
+from multiprocessing import shared_memory
+from threading import Lock, Thread
+
+from .signal_store import MODE_GENERATOR
+
+START_TIMEOUT = 30.0  # spawning the interpreter, importing python-can/cantools and opening the bus
+CALL_TIMEOUT = 5.0
+INSTALL_TIMEOUT = 120.0  # the child compiles the encoders of the whole DBC
+EXPORT_TIMEOUT = 60.0  # the child writes a profile of up to a few million events
+
+# Buffer format of each shared field; doubles come first so they stay 8-byte aligned
+_FIELD_FORMATS = (("target", "d"), ("current", "d"), ("mode", "B"), ("active", "B"))
+
+# CanEngine methods the GUI-side engine runs in the sender process
+ENGINE_COMMANDS = frozenset((
+    "_apply_entry",
+    "_schedule_messages",
+    "_send_final_offs",
+    "bus_load",
+    "configure_tx_queue",
+    "export_profile",
+    "export_tx_stats",
+    "reset_tx_stats",
+    "set_default_cycle",
+    "set_message_cycle",
+    "set_offload",
+    "start_profiling",
+    "stop_profiling",
+    "tx_queue_status",
+    "tx_stats_rows",
+))
+
+
+class SharedSignalTable:
+    """
+    The SignalStore fields in SHARED_FIELDS (mode, target, active, current) of every signal id,
+    in one shared memory block.
+
+    Layout: target and current as float64 arrays, then mode and active as one byte per signal.
+    Without 'name' a new block is created; with it, the existing block is attached.
+    """
+
+    def __init__(self, count, name=None):
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(1, 18 * count))
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.count = count
+        self.views = {}
+        offset = 0
+        for field, view_format in _FIELD_FORMATS:
+            size = count * (8 if view_format == "d" else 1)
+            self.views[field] = self.shm.buf[offset:offset + size].cast(view_format)
+            offset += size
+
+    def close(self, unlink=False):
+        """Release the views (nothing may use them afterwards) and the mapping; 'unlink' frees the block."""
+        for view in self.views.values():
+            view.release()
+        self.views = {}
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+class SenderProcess:
+    """
+    Runs the CAN bus and cyclic transmission of one channel in a child process, so work on the
+    GUI side (the Tk mainloop, DBC loading, widget updates) cannot delay frames through the GIL.
+
+    The child runs its own CanEngine. The signal state lives in a SharedSignalTable: on/off flags
+    and constant or auto-increment entries written here are picked up by the child's scheduler on
+    its next tick. Everything else goes over a Pipe, in order: starting and stopping messages,
+    final-off frames, cycle times, generator entries (tables are built in the child) and requests
+    for statistics. Errors of the child are reported through on_error(text).
+    """
+
+    def __init__(self, interface, channel, bitrate, data_bitrate, on_error):
+        self.interface = interface
+        self.channel = channel
+        self.bitrate = bitrate
+        self.data_bitrate = data_bitrate
+        self.on_error = on_error
+        self.table = None
+        self.generators = {}  # signal id -> GeneratorSpec sent to the child
+        self._routed_sids = set()  # signal ids whose entries go through the pipe
+        self._conn = None
+        self._process = None
+        self._reader = None
+        self._send_lock = Lock()
+        self._call_lock = Lock()
+        self._replies = queue.SimpleQueue()
+        self._seq = 0
+        self._closing = False
+
+    @property
+    def running(self):
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        """Start the child and open its bus; raises ValueError if that fails."""
+        # Spawn on every platform: forking a process that runs Tk and other threads is not safe
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_sender_main, args=(child_conn, self.interface, self.channel, self.bitrate, self.data_bitrate),
+            name=f"can-sender-{self.channel}", daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+
+        status = ("failed", "The sender process did not start in time")
+        try:
+            if self._conn.poll(START_TIMEOUT):
+                status = self._conn.recv()
+        except (EOFError, OSError):
+            status = ("failed", "The sender process exited while starting")
+        if status[0] != "ready":
+            self._stop_process()
+            raise ValueError(status[1])
+        self._reader = Thread(target=self._read, name=f"can-sender-{self.channel}-reader", daemon=True)
+        self._reader.start()
+
+    def install(self, db, store):
+        """
+        Load 'db' in the child. 'store' (just built for 'db') moves into a new shared table;
+        its generator entries are rebuilt in the child.
+        """
+        old_table = self.table
+        self.table = SharedSignalTable(len(store))
+        store.attach_shared(self.table.views)
+        self.generators = dict(store.generators)
+        self._routed_sids = set(self.generators)
+        self.call("install", db, self.table.name, len(store), self.generators, timeout=INSTALL_TIMEOUT)
+        if old_table is not None:
+            # 'store' was rebuilt for the new DBC, so nothing here uses the old views anymore
+            old_table.close(unlink=True)
+
+    def set_entry(self, store, sid, mode, value):
+        """Apply a parsed signal entry: in shared memory directly, or through the pipe for generators."""
+        if mode == MODE_GENERATOR or sid in self._routed_sids:
+            # Generator tables are built in the child. Later entries of such a signal follow the same
+            # ordered path, so a constant typed afterwards can never be overtaken by the generator.
+            self._routed_sids.add(sid)
+            if mode == MODE_GENERATOR:
+                self.generators[sid] = value
+            else:
+                self.generators.pop(sid, None)
+            self.send("_apply_entry", sid, mode, value)
+        else:
+            store.set_entry(sid, mode, value)
+
+    def send(self, name, *args):
+        """Run a CanEngine method (see ENGINE_COMMANDS) in the child without waiting for it."""
+        try:
+            self._send((None, name, args))
+        except (OSError, ValueError):
+            pass  # the reader thread reports a child that went away
+
+    def call(self, name, *args, timeout=CALL_TIMEOUT):
+        """Run a CanEngine method in the child and return its result; failures raise ValueError."""
+        with self._call_lock:
+            self._seq += 1
+            seq = self._seq
+            try:
+                self._send((seq, name, args))
+            except (OSError, ValueError):
+                raise ValueError("The sender process is not running")
+            while True:
+                try:
+                    reply_seq, ok, value = self._replies.get(timeout=timeout)
+                except queue.Empty:
+                    raise ValueError(f"The sender process did not answer ({name})")
+                if reply_seq == seq:
+                    break
+                # A late answer to a call that timed out
+        if not ok:
+            raise ValueError(value)
+        return value
+
+    def close(self, store):
+        """Stop the child (it stops transmitting and shuts its bus down) and take the signal state back."""
+        self._closing = True
+        self.send("close")
+        self._stop_process()
+        if self.table is not None:
+            store.detach_shared()
+            self.table.close(unlink=True)
+            self.table = None
+            # The generator tables only existed in the child
+            store.generators = {}
+            store.tables = {}
+            for sid, spec in self.generators.items():
+                if store.mode[sid] == MODE_GENERATOR:
+                    store.set_entry(sid, MODE_GENERATOR, spec)
+
+    def _stop_process(self):
+        self._process.join(timeout=5.0)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=1.0)
+        if self._reader is not None:
+            self._reader.join(timeout=1.0)
+        self._conn.close()
+
+    def _send(self, command):
+        with self._send_lock:
+            self._conn.send(command)
+
+    def _read(self):
+        """Reader thread: errors go to on_error, call results to the waiting caller."""
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                if not self._closing:
+                    self.on_error(f"The sender process for {self.channel} stopped unexpectedly")
+                return
+            if message[0] == "error":
+                self.on_error(message[1])
+            elif message[0] == "reply":
+                self._replies.put(message[1:])
+
+
+def _sender_main(conn, interface, channel, bitrate, data_bitrate):
+    """Entry point of the sender process."""
+    _SenderChild(conn).run(interface, channel, bitrate, data_bitrate)
+
+
+class _SenderChild:
+    """The child side of SenderProcess: a CanEngine driven by the commands read from the pipe."""
+
+    def __init__(self, conn):
+        # Imported here: engine imports this module
+        from .dbc_cache import DbcCache
+        from .engine import CanEngine
+
+        self.conn = conn
+        self._send_lock = Lock()
+        self.engine = CanEngine(dbc_cache=DbcCache(directory=None), on_error=self.report_error)
+        self.tables = []  # every table attached, closed on exit once no thread can use it
+
+    def report_error(self, text):
+        """Engine error callback; runs on the scheduler thread as well as the main thread."""
+        self._send(("error", text))
+
+    def run(self, interface, channel, bitrate, data_bitrate):
+        try:
+            self.engine.open_bus(interface, channel, bitrate, data_bitrate, receive=False)
+        except Exception as e:
+            self._send(("failed", str(e)))
+            return
+        self._send(("ready",))
+        try:
+            self._serve()
+        finally:
+            self.engine.close()
+            self.engine.signal_store.clear()
+            for table in self.tables:
+                table.close()
+
+    def install(self, db, table_name, count, generators):
+        from .dbc_cache import LoadedDbc, build_signal_tables
+        from .encoder import make_frame_encoder
+
+        engine = self.engine
+        encoders = {message.frame_id: make_frame_encoder(message) for message in db.messages}
+        engine.install_dbc(LoadedDbc(db, build_signal_tables(db)), encoders)
+        store = engine.signal_store
+        if len(store) != count:
+            raise ValueError(f"DBC has {len(store)} signals in the sender process, expected {count}")
+        # Build the generator tables before the shared mode flags become visible
+        for sid, spec in generators.items():
+            store.set_entry(sid, MODE_GENERATOR, spec)
+        table = SharedSignalTable(count, name=table_name)
+        self.tables.append(table)
+        store.attach_shared(table.views, copy=False)
+
+    def _serve(self):
+        while True:
+            try:
+                seq, name, args = self.conn.recv()
+            except (EOFError, OSError):
+                return  # the GUI process went away
+            if name == "close":
+                return
+            try:
+                if name == "install":
+                    result = self.install(*args)
+                elif name in ENGINE_COMMANDS:
+                    result = getattr(self.engine, name)(*args)
+                else:
+                    raise ValueError(f"Unknown sender command '{name}'")
+            except Exception as e:
+                if seq is None:
+                    self.report_error(str(e))
+                else:
+                    self._send(("reply", seq, False, str(e)))
+                continue
+            if seq is not None:
+                self._send(("reply", seq, True, result))
+
+    def _send(self, message):
+        with self._send_lock:
+            try:
+                self.conn.send(message)
+            except (OSError, ValueError):
+                pass  # the GUI process went away; _serve() returns on its next read
@@ -0,0 +1,240 @@
+from array import array
+
+from .generators import parse_generator
+
+MODE_AUTO = 0  # ramp by 1.0 physical unit per cycle up to the maximum
+MODE_CONSTANT = 1  # send the target value
+MODE_GENERATOR = 2  # send the next sample of a precomputed waveform table
+
+DEFAULT_TICK = 0.1  # generator sample period (s) until the message's cycle time is known
+
+# Per-signal state that can be moved into shared memory (see attach_shared)
+SHARED_FIELDS = ("mode", "target", "active", "current")
+
+
+def parse_signal_entry(text):
+    """
+    Parse the text of a signal entry box into (mode, value).
+    'A' (case-insensitive) or an empty entry means auto-increment; a generator call such as
+    'sine(2)' gives (MODE_GENERATOR, GeneratorSpec); anything else must be a number.
+    Raises ValueError for invalid text.
+    """
+    text = text.strip()
+    if text == "" or text.upper() == "A":
+        return MODE_AUTO, 0.0
+    spec = parse_generator(text)
+    if spec is not None:
+        return MODE_GENERATOR, spec
+    return MODE_CONSTANT, float(text)
+
+
+def signal_limits_physical(sig):
+    """
+    Compute physical min/max for a signal.
+    Uses DBC-provided limits if present; otherwise derives from bit length and signedness with scale/offset.
+    """
+    scale = sig.scale if sig.scale is not None else 1.0
+    offset = sig.offset if sig.offset is not None else 0.0
+    if sig.minimum is not None and sig.maximum is not None:
+        return float(sig.minimum), float(sig.maximum)
+
+    length = sig.length
+    if sig.is_signed:
+        raw_min = -(1 << (length - 1))
+        raw_max = (1 << (length - 1)) - 1
+    else:
+        raw_min = 0
+        raw_max = (1 << length) - 1
+
+    phys_min = raw_min * scale + offset
+    phys_max = raw_max * scale + offset
+    # Ensure ordering
+    if phys_min > phys_max:
+        phys_min, phys_max = phys_max, phys_min
+    return float(phys_min), float(phys_max)
+
+
+def neutral_value(sig):
+    """
+    Choose a neutral 'off' physical value for a signal:
+    - Prefer 0.0 clamped within physical range
+    - If 0.0 outside range, fall back to physical minimum
+    """
+    phys_min, phys_max = signal_limits_physical(sig)
+    neutral = 0.0
+    if neutral < phys_min:
+        neutral = phys_min
+    if neutral > phys_max:
+        neutral = phys_max
+    return neutral
+
+
+class SignalStore:
+    """
+    Thread-safe signal state shared by the UI and the TX path, stored as compact
+    arrays indexed by signal id.
+
+    The UI writes mode/target/active when an entry is edited or a toggle is clicked;
+    the scheduler thread only reads those and writes current values. Every write is a
+    single array element assignment, so no Tk access or locking is needed on the TX side.
+
+    Generator signals send samples from a table that holds one period of the waveform at the
+    message's cycle time. The table is built (with NumPy when available) whenever the entry or
+    the cycle time changes, so a tick only reads table[index] and advances the index.
+
+    With attach_shared(), mode/target/active/current live in buffers shared with another process
+    (see SenderProcess); the same single-element writes keep that safe across processes.
+    """
+
+    def __init__(self):
+        self.names = []  # signal id -> signal name
+        self.ids = {}  # signal name -> signal id
+        self.frame_ids = array("q")  # signal id -> frame_id
+        self.phys_min = array("d")
+        self.phys_max = array("d")
+        self.neutral = array("d")
+        self.mode = bytearray()  # MODE_AUTO / MODE_CONSTANT / MODE_GENERATOR
+        self.target = array("d")  # constant value (already clamped to the physical range)
+        self.active = bytearray()  # 1 = toggled on
+        self.current = array("d")  # last physical value put on the bus
+        self.message_signal_ids = {}  # frame_id -> tuple of signal ids in message.signals order
+        self.generators = {}  # signal id -> GeneratorSpec
+        self.tables = {}  # signal id -> (array('d') of samples, repeat), replaced as a whole
+        self.table_index = array("q")  # signal id -> next sample index
+        self.message_ticks = {}  # frame_id -> generator sample period (s)
+
+    def __len__(self):
+        return len(self.names)
+
+    def clear(self):
+        self.__init__()
+
+    def add_message(self, frame_id, signals):
+        """
+        Register the signals of one message.
+        signals: iterable of (name, phys_min, phys_max, neutral) in message.signals order.
+        Returns the tuple of new signal ids.
+        """
+        ids = []
+        for name, phys_min, phys_max, neutral in signals:
+            sid = len(self.names)
+            self.names.append(name)
+            self.ids[name] = sid
+            self.frame_ids.append(frame_id)
+            self.phys_min.append(phys_min)
+            self.phys_max.append(phys_max)
+            self.neutral.append(neutral)
+            self.mode.append(MODE_AUTO)
+            self.target.append(phys_min)
+            self.active.append(0)
+            self.current.append(phys_min)
+            self.table_index.append(0)
+            ids.append(sid)
+        self.message_signal_ids[frame_id] = tuple(ids)
+        return self.message_signal_ids[frame_id]
+
+    def attach_shared(self, views, copy=True):
+        """
+        Back the SHARED_FIELDS arrays by the given buffers ({field: memoryview}, e.g. SharedSignalTable.views).
+        With 'copy' the current state is copied into them first; otherwise the store adopts what they hold.
+        """
+        for field in SHARED_FIELDS:
+            view = views[field]
+            if copy:
+                view[:] = getattr(self, field)
+            setattr(self, field, view)
+
+    def detach_shared(self):
+        """Copy the shared state back into private arrays, so the shared buffers can be released."""
+        self.mode = bytearray(self.mode)
+        self.target = array("d", self.target)
+        self.active = bytearray(self.active)
+        self.current = array("d", self.current)
+
+    def set_entry(self, sid, mode, value=0.0):
+        """
+        Apply a parsed entry; constant values are clamped to the physical range here, not per tick.
+        For MODE_GENERATOR, value is the GeneratorSpec and its table is built right away.
+        Raises ValueError if the generator table cannot be built.
+        """
+        if mode == MODE_GENERATOR:
+            tick = self.message_ticks.get(self.frame_ids[sid], DEFAULT_TICK)
+            table = value.build_table(tick, self.phys_min[sid], self.phys_max[sid])
+            self.generators[sid] = value
+            self.table_index[sid] = 0
+            self.tables[sid] = table
+        else:
+            self.generators.pop(sid, None)
+        if mode == MODE_CONSTANT:
+            if value < self.phys_min[sid]:
+                value = self.phys_min[sid]
+            if value > self.phys_max[sid]:
+                value = self.phys_max[sid]
+            self.target[sid] = value
+        self.mode[sid] = mode
+
+    def set_message_tick(self, frame_id, tick):
+        """Rebuild the generator tables of a message for a new cycle time (s), keeping their phase."""
+        previous = self.message_ticks.get(frame_id, DEFAULT_TICK)
+        if self.message_ticks.get(frame_id) == tick:
+            return
+        self.message_ticks[frame_id] = tick
+        for sid in self.message_signal_ids.get(frame_id, ()):
+            spec = self.generators.get(sid)
+            if spec is not None:
+                self.tables[sid] = spec.build_table(tick, self.phys_min[sid], self.phys_max[sid])
+                self.table_index[sid] = int(self.table_index[sid] * previous / tick)
+
+    def set_active(self, sid, on):
+        self.active[sid] = 1 if on else 0
+
+    def is_active(self, sid):
+        return self.active[sid] == 1
+
+    def any_active(self, frame_id):
+        active = self.active
+        return any(active[sid] for sid in self.message_signal_ids.get(frame_id, ()))
+
+    def reset_message(self, frame_id):
+        """Start every signal of a message from its physical minimum (generators from their first sample)."""
+        for sid in self.message_signal_ids.get(frame_id, ()):
+            self.current[sid] = self.phys_min[sid]
+            self.table_index[sid] = 0
+
+    def message_values(self, frame_id):
+        """{signal_name: current_value} snapshot for a message."""
+        names = self.names
+        current = self.current
+        return {names[sid]: current[sid] for sid in self.message_signal_ids.get(frame_id, ())}
+
+    def step_message(self, frame_id):
+        """
+        Advance the signals of a message by one cycle and return True if any of them is on:
+        - ON, auto mode: increment by 1.0 physical unit up to max, then stay at max.
+        - ON, constant mode: use the (pre-clamped) target value.
+        - ON, generator mode: take the next table sample; wrap around, or hold the last one (ramp).
+        - OFF: force the neutral 'off' value, so it no longer carries the last value.
+        """
+        active = self.active
+        current = self.current
+        any_active = False
+        for sid in self.message_signal_ids.get(frame_id, ()):
+            if active[sid]:
+                any_active = True
+                mode = self.mode[sid]
+                if mode == MODE_AUTO:
+                    val = current[sid] + 1.0
+                    phys_max = self.phys_max[sid]
+                    current[sid] = val if val < phys_max else phys_max
+                elif mode == MODE_GENERATOR:
+                    samples, repeat = self.tables[sid]
+                    index = self.table_index[sid]
+                    if index >= len(samples):
+                        index = 0 if repeat else len(samples) - 1
+                    current[sid] = samples[index]
+                    self.table_index[sid] = index + 1
+                else:
+                    current[sid] = self.target[sid]
+            else:
+                current[sid] = self.neutral[sid]
+        return any_active
@@ -0,0 +1,354 @@
+import heapq
+import time
+from collections import deque
+from threading import Condition, Thread
+
+import can
+
+from .profiling import PHASE_SEND
+
+OVERFLOW_LATEST = "latest"  # one pending frame per frame_id; a newer payload replaces the queued one
+OVERFLOW_DROP_OLDEST = "drop_oldest"  # frames queue up; when full, the oldest frame of that frame_id is dropped
+OVERFLOW_POLICIES = (OVERFLOW_LATEST, OVERFLOW_DROP_OLDEST)
+
+TX_QUEUE_CAPACITY = 256  # frames waiting for the bus, over all frame_ids
+SEND_TIMEOUT = 0.05  # seconds bus.send() may block on a full adapter buffer before it counts as failed
+MAX_SEND_RETRIES = 3  # further attempts for a frame after a transient error, before it is given up
+BACKOFF_MIN = 0.002  # seconds after the first failed attempt; doubled per consecutive failure
+BACKOFF_MAX = 0.5
+
+
+def arbitration_priority(arbitration_id, is_extended_id):
+    """
+    Sort key of a frame in CAN arbitration order (lower wins): the 11-bit base ID first,
+    then a standard frame before an extended one with the same base ID, then the 18-bit ID extension.
+    """
+    if is_extended_id:
+        return arbitration_id >> 18, 1, arbitration_id & 0x3FFFF
+    return arbitration_id, 0, 0
+
+
+class TxQueue:
+    """
+    Bounded TX queue between the producers (TX scheduler, final-off frames) and the bus.
+
+    While the bus is healthy and nothing is waiting, put() offers the frame to the adapter right
+    away on the caller's thread with a zero send timeout, so the normal path costs no thread
+    hand-off. If the adapter cannot take it at once, or frames are waiting, the frame is only
+    queued: a sender thread hands queued frames to bus.send() in arbitration priority order (the
+    frame that would win arbitration goes first), frames of one frame_id in the order they were
+    queued. When the queue is full, or a frame_id already has a frame queued under OVERFLOW_LATEST,
+    the overflow policy decides what is dropped. A producer (the TX scheduler, or the GUI for
+    final-off frames) therefore never waits for the bus.
+
+    A transient send error (can.CanError, e.g. a full adapter buffer, bus-off or no ACK) puts the
+    frame back and the sender backs off, doubling the pause per consecutive failure up to
+    BACKOFF_MAX; a frame still failing after MAX_SEND_RETRIES is given up. The first success ends
+    the back-off, so sending returns to full rate as soon as the bus recovers. When errors persist,
+    the adapter's TX buffer is flushed once so stale frames do not delay fresh ones after recovery.
+
+    Errors are not reported one by one: status() returns aggregated counters for the UI.
+    on_sent(msg, cyclic) and on_send_error(msg, error) run on the thread that sent the frame; an
+    exception they raise does not stop sending. Such failures are counted, and only the first one
+    is reported through on_error(text).
+    """
+
+    def __init__(self, bus, on_sent=None, on_send_error=None, capacity=TX_QUEUE_CAPACITY, policy=OVERFLOW_LATEST,
+                 on_error=None):
+        if capacity < 1:
+            raise ValueError("TX queue capacity must be at least 1")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}'. Use one of: {', '.join(OVERFLOW_POLICIES)}")
+        self.bus = bus
+        self.on_sent = on_sent
+        self.on_send_error = on_send_error
+        self.on_error = on_error
+        self.capacity = capacity
+        self.policy = policy
+
+        self._cond = Condition()
+        self._pending = {}  # priority key -> deque of [msg, cyclic, attempts]
+        self._heap = []  # priority keys of _pending, each once
+        self._count = 0
+        self._in_flight = False  # a frame is being sent (by a producer or the sender thread)
+        self._retry_at = 0.0  # monotonic time before which the sender thread backs off
+        self._running = False
+        self._draining_until = None  # monotonic deadline while stop() flushes the queue
+        self._thread = None
+        self.profiler = None  # HotPathProfiler while profiling; records the bus.send() calls
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.sent = 0
+        self.retries = 0
+        self.dropped = 0  # replaced by a newer payload or pushed out by the overflow policy before a send attempt
+        self.failed = 0  # not sent after a failed attempt: retries used up, superseded, or not retryable
+        self.last_error = None
+        self.callback_errors = 0  # exceptions raised by on_sent/on_send_error
+        self._consecutive_failures = 0
+        self._flushed = False
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = Thread(target=self._run, name="tx-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Send what is still queued (for at most 'timeout' seconds), then stop the sender thread."""
+        with self._cond:
+            self._draining_until = time.monotonic() + timeout
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout + SEND_TIMEOUT + 0.5)
+            self._thread = None
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+            self._pending.clear()
+            self._heap.clear()
+            self._count = 0
+
+    def configure(self, capacity=None, policy=None):
+        """Change the capacity and/or the overflow policy; frames already queued stay queued."""
+        if capacity is not None and capacity < 1:
+            raise ValueError("TX queue capacity must be at least 1")
+        if policy is not None and policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}'. Use one of: {', '.join(OVERFLOW_POLICIES)}")
+        with self._cond:
+            if capacity is not None:
+                self.capacity = capacity
+            if policy is not None:
+                self.policy = policy
+
+    def put(self, msg, cyclic=True):
+        """Send or queue a frame (see the class docstring); cyclic is passed on to on_sent (TX statistics)."""
+        entry = [msg, cyclic, 0]
+        with self._cond:
+            if not (self._count or self._in_flight or self._consecutive_failures) and self._running \
+                    and self._draining_until is None:
+                self._in_flight = True
+            else:
+                self._enqueue(entry)
+                return
+        self._send(entry, timeout=0)
+
+    def _enqueue(self, entry):
+        """Queue a new frame under the overflow policy (lock held)."""
+        msg = entry[0]
+        key = arbitration_priority(msg.arbitration_id, msg.is_extended_id)
+        frames = self._pending.get(key)
+        if frames is not None and self.policy == OVERFLOW_LATEST:
+            # Only the newest payload of a frame_id matters; it keeps the queued frame's place
+            self._discard(frames[-1])
+            frames[-1] = entry
+            return
+        if self._count >= self.capacity:
+            if not self._make_room(key):
+                self.dropped += 1
+                return
+            # Making room may have removed the last queued frame of this frame_id, and its deque
+            frames = self._pending.get(key)
+        if frames is None:
+            frames = self._pending[key] = deque()
+            heapq.heappush(self._heap, key)
+        frames.append(entry)
+        self._count += 1
+        self._cond.notify_all()
+
+    def _make_room(self, key):
+        """
+        Drop one queued frame for a new frame with priority 'key' (lock held): the oldest of the same
+        frame_id, else the oldest of the lowest-priority frame_id if that is below 'key'. False if none.
+        """
+        victim = key if key in self._pending else max(self._pending)
+        if victim < key:
+            return False
+        frames = self._pending[victim]
+        self._discard(frames.popleft())
+        self._count -= 1
+        if not frames:
+            del self._pending[victim]
+            self._heap.remove(victim)
+            heapq.heapify(self._heap)
+        return True
+
+    def _discard(self, entry):
+        """Count a queued frame that will not be sent (lock held)."""
+        if entry[2]:
+            self.failed += 1  # it was being retried
+        else:
+            self.dropped += 1
+
+    def clear(self):
+        """Drop every queued frame (counted as dropped or failed), e.g. when they belong to a DBC that is replaced."""
+        with self._cond:
+            for frames in self._pending.values():
+                for entry in frames:
+                    self._discard(entry)
+            self._pending.clear()
+            self._heap.clear()
+            self._count = 0
+            self._cond.notify_all()
+
+    def flush(self, timeout=1.0):
+        """Wait until every queued frame has been sent, dropped or given up; True if the queue is empty."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while (self._count or self._in_flight) and self._running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.01))
+            return not (self._count or self._in_flight)
+
+    def status(self):
+        """
+        Aggregated counters: queued, sent, retries, dropped, failed, degraded (sending fails), last_error
+        and callback_errors.
+        """
+        with self._cond:
+            return {
+                "queued": self._count,
+                "sent": self.sent,
+                "retries": self.retries,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "degraded": self._consecutive_failures > 0,
+                "last_error": self.last_error,
+                "callback_errors": self.callback_errors,
+            }
+
+    def reset_counters(self):
+        with self._cond:
+            self._reset_counters()
+
+    def _next(self):
+        """
+        Block for the highest-priority queued frame once no send is in flight and the back-off has
+        passed, and take it out (lock held). None: stop.
+        """
+        while True:
+            if not self._running:
+                return None
+            draining = self._draining_until is not None
+            if draining and (not self._count or time.monotonic() >= self._draining_until):
+                return None
+            if self._count and not self._in_flight:
+                wait = 0 if draining else self._retry_at - time.monotonic()
+                if wait <= 0:
+                    break
+                self._cond.wait(wait)
+            else:
+                self._cond.wait()
+        key = self._heap[0]
+        frames = self._pending[key]
+        entry = frames.popleft()
+        self._count -= 1
+        self._in_flight = True
+        if not frames:
+            del self._pending[key]
+            heapq.heappop(self._heap)
+        return entry
+
+    def _requeue(self, entry):
+        """Put a frame that failed back in front of its frame_id (lock held); False if it has to go."""
+        msg = entry[0]
+        key = arbitration_priority(msg.arbitration_id, msg.is_extended_id)
+        frames = self._pending.get(key)
+        if frames is not None and self.policy == OVERFLOW_LATEST:
+            return False  # superseded by a newer payload
+        if self._count >= self.capacity:
+            return False
+        if frames is None:
+            frames = self._pending[key] = deque()
+            heapq.heappush(self._heap, key)
+        frames.appendleft(entry)
+        self._count += 1
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                entry = self._next()
+            if entry is None:
+                return
+            self._send(entry)
+
+    def _send(self, entry, timeout=SEND_TIMEOUT):
+        """
+        Send a frame taken out of the queue, or never queued (put(), timeout 0: a frame the adapter
+        cannot take at once is queued instead). _in_flight is set, and cleared here in any case.
+        """
+        msg = entry[0]
+        profiler = self.profiler
+        sent = False
+        try:
+            try:
+                if profiler is None:
+                    self.bus.send(msg, timeout=timeout)
+                else:
+                    started = time.perf_counter()
+                    try:
+                        self.bus.send(msg, timeout=timeout)
+                    finally:
+                        profiler.record(PHASE_SEND, msg.arbitration_id, started)
+            except Exception as e:
+                if not timeout and isinstance(e, can.CanError):
+                    # The sender thread tries again, and may wait for the adapter
+                    with self._cond:
+                        self._enqueue(entry)
+                    return
+                self._on_failure(entry, e)
+                return
+            sent = True
+            self._run_callback(self.on_sent, msg, entry[1])
+        finally:
+            with self._cond:
+                if sent:
+                    self.sent += 1
+                    self._consecutive_failures = 0
+                    self._flushed = False
+                self._in_flight = False
+                if self._count:
+                    self._cond.notify_all()
+
+    def _run_callback(self, callback, *args):
+        """Run on_sent/on_send_error; what they raise is counted (the first one reported) and cannot stop the queue."""
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            with self._cond:
+                self.callback_errors += 1
+                first = self.callback_errors == 1
+            if first and self.on_error is not None:
+                self.on_error(f"TX queue callback failed: {str(e)}")
+
+    def _on_failure(self, entry, error):
+        """Count a failed attempt, requeue the frame if it may be retried and set the back-off."""
+        self._run_callback(self.on_send_error, entry[0], error)
+        entry[2] += 1
+        retry = isinstance(error, can.CanError) and entry[2] <= MAX_SEND_RETRIES
+        with self._cond:
+            self.last_error = f"0x{entry[0].arbitration_id:X}: {str(error)}"
+            self._consecutive_failures += 1
+            self._in_flight = False
+            if retry and self._requeue(entry):
+                self.retries += 1
+            else:
+                self.failed += 1
+            delay = min(BACKOFF_MAX, BACKOFF_MIN * 2 ** min(self._consecutive_failures - 1, 16))
+            self._retry_at = time.monotonic() + delay
+            flush = delay >= BACKOFF_MAX and not self._flushed
+            if flush:
+                self._flushed = True
+            self._cond.notify_all()
+        if flush:
+            try:
+                self.bus.flush_tx_buffer()
+            except Exception:
+                pass  # not every interface can flush; the frames then go out once the bus recovers
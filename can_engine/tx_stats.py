@@ -0,0 +1,213 @@
+import csv
+import time
+
+import can
+
+# Classical CAN frame overhead in bits (SOF, arbitration, control, CRC, ACK, EOF and
+# 3 bits of interframe space) and the bits exposed to bit stuffing, per ID format
+_FRAME_OVERHEAD_BITS = {False: 47, True: 67}
+_STUFFED_OVERHEAD_BITS = {False: 34, True: 54}
+
+# CAN FD: arbitration phase bits up to and including BRS, per ID format; the frame tail from the
+# CRC delimiter to the interframe space (ACK, EOF, IFS) is also sent at the nominal bitrate
+_FD_ARBITRATION_BITS = {False: 17, True: 36}
+_FD_TAIL_BITS = 13
+
+CSV_COLUMNS = [
+    "frame_id", "message", "sent", "expected_period_ms", "period_min_ms", "period_mean_ms",
+    "period_max_ms", "late", "errors", "timeouts",
+]
+
+
+def frame_bits(length, is_extended_id=False):
+    """Worst-case bits on the wire for a classical CAN data frame with 'length' data bytes."""
+    data_bits = 8 * length
+    stuff_bits = (_STUFFED_OVERHEAD_BITS[is_extended_id] + data_bits - 1) // 4
+    return _FRAME_OVERHEAD_BITS[is_extended_id] + data_bits + stuff_bits
+
+
+def fd_frame_bits(length, is_extended_id=False):
+    """
+    Worst-case bits of a CAN FD data frame with 'length' data bytes, as (nominal_bits, data_phase_bits).
+    With bitrate switching the data phase (ESI, DLC, data, stuff count, CRC) runs at the data bitrate.
+    """
+    arbitration_bits = _FD_ARBITRATION_BITS[is_extended_id]
+    nominal_bits = arbitration_bits + (arbitration_bits - 1) // 4 + _FD_TAIL_BITS
+    control_and_data_bits = 5 + 8 * length  # ESI, DLC and the data field are subject to bit stuffing
+    # Stuff count with parity, CRC-17/21 and their fixed stuff bits
+    crc_bits = 4 + 17 + 6 if length <= 16 else 4 + 21 + 7
+    data_phase_bits = control_and_data_bits + control_and_data_bits // 4 + crc_bits
+    return nominal_bits, data_phase_bits
+
+
+class FrameStats:
+    """
+    Counters for one frame_id. Periods are in seconds. frame_bits are sent at the nominal bitrate,
+    data_bits (the data phase of CAN FD frames, 0 for classical frames) at the data bitrate.
+    """
+
+    __slots__ = ("frame_id", "frame_bits", "data_bits", "expected_period", "late_threshold", "sent", "late", "errors",
+                 "timeouts", "last_sent", "period_min", "period_max", "period_sum", "period_count")
+
+    def __init__(self, frame_id, frame_bits, data_bits=0):
+        self.frame_id = frame_id
+        self.frame_bits = frame_bits
+        self.data_bits = data_bits
+        self.expected_period = None
+        self.late_threshold = None
+        self.sent = 0
+        self.late = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.last_sent = None
+        self.period_min = None
+        self.period_max = None
+        self.period_sum = 0.0
+        self.period_count = 0
+
+    @property
+    def period_mean(self):
+        return self.period_sum / self.period_count if self.period_count else None
+
+
+class TxStats:
+    """
+    Per-frame_id TX counters, written by the sending thread and read at a low rate by the UI.
+
+    record_sent() is called for every frame put on the bus and only does a dict lookup and a few
+    additions; everything else (means, bus load, CSV rows) is computed when a snapshot is taken.
+    A cyclic send is counted as late when the measured period exceeds the expected period by more
+    than late_fraction of it. Frames sent by offloaded periodic tasks never pass through here.
+    """
+
+    def __init__(self, late_fraction=0.5):
+        self.late_fraction = late_fraction
+        self._frames = {}  # frame_id -> FrameStats
+        self._bits_total = 0
+        self._data_bits_total = 0
+        self._load_mark = (time.monotonic(), 0, 0)
+
+    def reset(self):
+        """Clear all counters; expected periods of known frames are kept."""
+        for stats in self._frames.values():
+            fresh = FrameStats(stats.frame_id, stats.frame_bits, stats.data_bits)
+            fresh.expected_period = stats.expected_period
+            fresh.late_threshold = stats.late_threshold
+            self._frames[stats.frame_id] = fresh
+        self._bits_total = 0
+        self._data_bits_total = 0
+        self._load_mark = (time.monotonic(), 0, 0)
+
+    def clear(self):
+        """Forget every frame (e.g. when another DBC is loaded)."""
+        self._frames = {}
+        self._bits_total = 0
+        self._data_bits_total = 0
+        self._load_mark = (time.monotonic(), 0, 0)
+
+    def register(self, frame_id, length, is_extended_id=False, is_fd=False):
+        """Make frame_id known; its frame size (classical or CAN FD format) is used for the bus load."""
+        if frame_id not in self._frames:
+            if is_fd:
+                self._frames[frame_id] = FrameStats(frame_id, *fd_frame_bits(length, is_extended_id))
+            else:
+                self._frames[frame_id] = FrameStats(frame_id, frame_bits(length, is_extended_id))
+
+    def start(self, frame_id, period):
+        """A frame starts being sent cyclically; the next send does not produce a period sample."""
+        stats = self._frames[frame_id]
+        stats.last_sent = None
+        self.set_period(frame_id, period)
+
+    def set_period(self, frame_id, period):
+        stats = self._frames[frame_id]
+        stats.expected_period = period
+        stats.late_threshold = period * (1.0 + self.late_fraction)
+
+    def record_sent(self, frame_id, cyclic=True):
+        """
+        Count a frame that was handed to the bus; one-off frames (final off) have no period.
+        Unknown frame_ids (e.g. a frame of the previous DBC still leaving the TX queue) are ignored.
+        """
+        stats = self._frames.get(frame_id)
+        if stats is None:
+            return
+        stats.sent += 1
+        self._bits_total += stats.frame_bits
+        self._data_bits_total += stats.data_bits
+        if not cyclic:
+            return
+        now = time.monotonic()
+        last = stats.last_sent
+        stats.last_sent = now
+        if last is None:
+            return
+        period = now - last
+        stats.period_sum += period
+        stats.period_count += 1
+        if stats.period_min is None or period < stats.period_min:
+            stats.period_min = period
+        if stats.period_max is None or period > stats.period_max:
+            stats.period_max = period
+        if period > stats.late_threshold:
+            stats.late += 1
+
+    def record_error(self, frame_id, error):
+        """Count a failed bus.send(); python-can timeouts are also counted separately. Unknown frame_ids are ignored."""
+        stats = self._frames.get(frame_id)
+        if stats is None:
+            return
+        stats.errors += 1
+        if isinstance(error, can.CanTimeoutError):
+            stats.timeouts += 1
+
+    def frames(self):
+        """FrameStats of every known frame, ordered by frame_id."""
+        return [self._frames[frame_id] for frame_id in sorted(self._frames)]
+
+    def bus_load(self, bitrate, data_bitrate=None):
+        """
+        Bus load in percent of the bus time, caused by the frames sent since the previous call
+        (call at a fixed low rate, e.g. once per second). CAN FD data phases take their bits at
+        'data_bitrate' (bitrate switching), or at 'bitrate' without it. Returns None without a bitrate.
+        """
+        now = time.monotonic()
+        bits = self._bits_total
+        data_bits = self._data_bits_total
+        mark_time, mark_bits, mark_data_bits = self._load_mark
+        self._load_mark = (now, bits, data_bits)
+        elapsed = now - mark_time
+        if not bitrate or elapsed <= 0:
+            return None
+        busy = (bits - mark_bits) / bitrate + (data_bits - mark_data_bits) / (data_bitrate or bitrate)
+        return busy / elapsed * 100.0
+
+    def rows(self, message_names=None):
+        """One dict per frame with the CSV_COLUMNS keys; periods in ms."""
+        names = message_names or {}
+        rows = []
+        for stats in self.frames():
+            rows.append({
+                "frame_id": f"0x{stats.frame_id:X}",
+                "message": names.get(stats.frame_id, ""),
+                "sent": stats.sent,
+                "expected_period_ms": _ms(stats.expected_period),
+                "period_min_ms": _ms(stats.period_min),
+                "period_mean_ms": _ms(stats.period_mean),
+                "period_max_ms": _ms(stats.period_max),
+                "late": stats.late,
+                "errors": stats.errors,
+                "timeouts": stats.timeouts,
+            })
+        return rows
+
+    def export_csv(self, path, message_names=None):
+        """Write rows() to a CSV file."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.rows(message_names))
+
+
+def _ms(seconds):
+    return "" if seconds is None else round(seconds * 1000.0, 3)
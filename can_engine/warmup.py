@@ -0,0 +1,42 @@
+import importlib
+from threading import Thread
+
+import can
+
+# Imported on first use (DBC loading, generator tables); warm_up() can import them in advance
+DEFERRED_MODULES = ("cantools", "numpy", "diskcache")
+
+
+def import_backend(interface):
+    """
+    Import the python-can module of 'interface' (e.g. 'pcan'), as can.interface.Bus does when the
+    bus is created. Loading a vendor library can take a while, so this lets it happen in advance.
+    Raises ValueError for an unknown interface and ImportError if the backend cannot be imported.
+    """
+    if interface not in can.interfaces.BACKENDS:
+        raise ValueError(f"Unknown python-can interface '{interface}'")
+    module_name, _ = can.interfaces.BACKENDS[interface]
+    importlib.import_module(module_name)
+
+
+def warm_up(interfaces=(), modules=DEFERRED_MODULES):
+    """
+    Import 'modules' and the backends of 'interfaces' on a daemon thread and return the thread, so
+    the first DBC load or interface start does not wait for them. Failures are ignored: they are
+    reported when the module is really used.
+    """
+    def run():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+        for interface in interfaces:
+            try:
+                import_backend(interface)
+            except Exception:
+                pass  # e.g. a vendor library that is not installed
+
+    thread = Thread(target=run, name="import-warm-up", daemon=True)
+    thread.start()
+    return thread
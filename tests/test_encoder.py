@@ -0,0 +1,29 @@
+from cantools.database.can import Message, Signal
+from cantools.database.conversion import BaseConversion
+
+from can_engine import CantoolsFrameEncoder, FrameEncoder, make_frame_encoder
+
+
+def test_64_bit_signal_matches_cantools():
+    signal = Signal("Counter", 0, 64, minimum=0, maximum=(1 << 64) - 1)
+    message = Message(0x200, "Wide", 8, [signal])
+    value = (1 << 63) + 12345  # not representable as a float
+
+    encoder = make_frame_encoder(message)
+    assert not FrameEncoder.supports(message)
+    assert isinstance(encoder, CantoolsFrameEncoder)
+    assert encoder.encode({"Counter": value}) == message.encode({"Counter": value})
+
+
+def test_compiled_encoder_matches_cantools():
+    signals = [
+        Signal("Speed", 0, 16, conversion=BaseConversion.factory(scale=0.5, offset=-100), minimum=-100, maximum=32667),
+        Signal("Gear", 16, 4, minimum=0, maximum=15),
+        Signal("Wide", 20, 44, minimum=0, maximum=(1 << 44) - 1),
+    ]
+    message = Message(0x100, "Mixed", 8, signals)
+    values = {"Speed": 88.5, "Gear": 3, "Wide": (1 << 44) - 7}
+
+    encoder = make_frame_encoder(message)
+    assert isinstance(encoder, FrameEncoder)
+    assert encoder.encode(values) == message.encode(values)
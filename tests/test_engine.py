@@ -0,0 +1,34 @@
+from cantools.database import Database
+from cantools.database.can import Message, Signal
+
+from can_engine import CanEngine, LoadedDbc, build_signal_tables, make_frame_encoder
+
+
+def make_engine(errors):
+    messages = [
+        Message(0x100, "Classic", 8, [Signal("C1", 0, 8, minimum=0, maximum=255)], cycle_time=10),
+        Message(0x200, "FdMsg", 64, [Signal("F1", 0, 8, minimum=0, maximum=255)], cycle_time=10, is_fd=True),
+    ]
+    db = Database(messages)
+    engine = CanEngine(on_error=errors.append)
+    engine.install_dbc(LoadedDbc(db, build_signal_tables(db)),
+                       {message.frame_id: make_frame_encoder(message) for message in messages})
+    return engine
+
+
+def test_reopen_resumes_signals_that_are_on():
+    errors = []
+    engine = make_engine(errors)
+    engine.open_bus("virtual", "reopen-test", 500000, data_bitrate=2000000, receive=False)
+    try:
+        engine.signals_on(range(len(engine.signal_store)))
+        engine.close()
+        assert engine.signal_store.any_active(0x100)
+
+        engine.open_bus("virtual", "reopen-test", 500000, receive=False)  # classical CAN now
+        assert engine.tx_scheduler.is_scheduled(0x100)
+        assert not engine.tx_scheduler.is_scheduled(0x200)
+        assert not engine.signal_store.any_active(0x200)
+        assert len(errors) == 1 and "FdMsg (0x200)" in errors[0]
+    finally:
+        engine.close()
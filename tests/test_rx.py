@@ -0,0 +1,35 @@
+import can
+
+from can_engine import CanEngine, RxMonitor, RxRingBuffer
+
+
+def test_recent_returns_the_newest_frames_with_their_flags():
+    buffer = RxRingBuffer(capacity=4)
+    monitor = RxMonitor(lambda frame_id: None)
+    monitor.buffer = buffer
+    for index in range(6):
+        monitor.on_message_received(can.Message(timestamp=float(index), arbitration_id=0x100 + index,
+                                                is_extended_id=False, data=bytes([index])))
+    monitor.on_message_received(can.Message(timestamp=6.0, arbitration_id=0x18FF0001, is_extended_id=True,
+                                            is_fd=True, bitrate_switch=True, data=bytes(12)))
+
+    assert buffer.overwritten == 3
+    assert [msg.arbitration_id for msg in buffer.recent(2)] == [0x105, 0x18FF0001]
+    frames = buffer.recent()
+    assert [msg.timestamp for msg in frames] == [3.0, 4.0, 5.0, 6.0]
+    assert frames[0].data == bytes([3]) and not frames[0].is_extended_id and not frames[0].is_fd
+    assert frames[-1].is_extended_id and frames[-1].is_fd and frames[-1].bitrate_switch
+    assert frames[-1].data == bytes(12)
+
+
+def test_save_rx_buffer_writes_a_log(tmp_path):
+    engine = CanEngine()
+    for index in range(3):
+        engine.rx_monitor.on_message_received(can.Message(timestamp=100.0 + index, arbitration_id=0x200,
+                                                          data=bytes([index] * 8)))
+    path = str(tmp_path / "rx.asc")
+
+    assert engine.save_rx_buffer(path) == 3
+    logged = [msg for msg in can.LogReader(path) if not msg.is_error_frame]
+    assert [msg.arbitration_id for msg in logged] == [0x200] * 3
+    assert [msg.data[0] for msg in logged] == [0, 1, 2]
@@ -0,0 +1,27 @@
+import time
+
+from can_engine.scheduler import TxScheduler, grid_deadline
+
+
+def test_grid_deadline():
+    assert abs(grid_deadline(0.25, 0.1) - 0.3) < 1e-9
+    assert grid_deadline(2.0, 0.5) == 2.0
+
+
+def test_frames_started_apart_share_wake_ups():
+    sent = []
+    scheduler = TxScheduler(lambda frame_id: sent.append((frame_id, time.monotonic())))
+    scheduler.start()
+    try:
+        scheduler.add(1, 0.02)
+        time.sleep(0.007)
+        scheduler.add(2, 0.02)
+        time.sleep(0.1)
+    finally:
+        scheduler.shutdown()
+    # After their first transmissions both frames are on the same 20 ms grid
+    first = [stamp for frame_id, stamp in sent if frame_id == 1][1:]
+    second = [stamp for frame_id, stamp in sent if frame_id == 2][1:]
+    assert len(second) >= 3
+    for stamp in second:
+        assert min(abs(stamp - other) for other in first) < 0.002
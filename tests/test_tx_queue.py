@@ -0,0 +1,111 @@
+import can
+
+from can_engine import OVERFLOW_DROP_OLDEST, TxQueue, TxStats
+
+
+class RecordingBus:
+    """Stands in for a can.BusABC: keeps the sent frames."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg, timeout=None):
+        self.sent.append(msg)
+
+    def flush_tx_buffer(self):
+        pass
+
+
+def frame(frame_id, value):
+    return can.Message(arbitration_id=frame_id, data=[value], is_extended_id=False)
+
+
+def test_drop_oldest_full_queue_replaces_only_frame_of_same_id():
+    bus = RecordingBus()
+    queue = TxQueue(bus, capacity=2, policy=OVERFLOW_DROP_OLDEST)
+    # Not started yet, so every frame is queued
+    queue.put(frame(0x100, 1))
+    queue.put(frame(0x200, 2))
+    queue.put(frame(0x200, 3))  # full: the only queued 0x200 frame makes room
+
+    status = queue.status()
+    assert status["queued"] == 2
+    assert status["dropped"] == 1
+
+    queue.start()
+    try:
+        assert queue.flush(timeout=2.0)
+    finally:
+        queue.stop()
+    assert [(msg.arbitration_id, msg.data[0]) for msg in bus.sent] == [(0x100, 1), (0x200, 3)]
+    assert queue.status()["sent"] == 2
+
+
+def test_failing_callback_is_reported_and_sending_continues():
+    bus = RecordingBus()
+    errors = []
+
+    def on_sent(msg, cyclic):
+        raise KeyError(msg.arbitration_id)
+
+    queue = TxQueue(bus, on_sent=on_sent, on_error=errors.append)
+    queue.start()
+    try:
+        queue.put(frame(0x100, 1))
+        queue.put(frame(0x101, 2))
+        assert queue.flush(timeout=2.0)
+    finally:
+        queue.stop()
+    assert len(bus.sent) == 2
+    status = queue.status()
+    assert status["sent"] == 2
+    assert status["callback_errors"] == 2
+    assert len(errors) == 1  # only the first failure is reported
+
+
+def test_clear_drops_queued_frames():
+    queue = TxQueue(RecordingBus())
+    queue.put(frame(0x100, 1))
+    queue.put(frame(0x101, 2))
+    queue.clear()
+    status = queue.status()
+    assert status["queued"] == 0
+    assert status["dropped"] == 2
+
+
+def test_tx_stats_ignore_unknown_frame_ids():
+    stats = TxStats()
+    stats.register(0x100, 8)
+    stats.record_sent(0x200)
+    stats.record_error(0x200, can.CanError("bus-off"))
+    assert [frame.frame_id for frame in stats.frames()] == [0x100]
+
+
+class BusyAdapterBus(RecordingBus):
+    """An adapter whose buffer is full for an immediate send, but takes frames when the sender may wait."""
+
+    def __init__(self):
+        super().__init__()
+        self.timeouts = []
+
+    def send(self, msg, timeout=None):
+        self.timeouts.append(timeout)
+        if not timeout:
+            raise can.CanOperationError("Transmit buffer full")
+        super().send(msg, timeout)
+
+
+def test_put_never_waits_for_a_busy_adapter():
+    bus = BusyAdapterBus()
+    queue = TxQueue(bus)
+    queue.start()
+    try:
+        queue.put(frame(0x100, 1))
+        assert queue.flush(timeout=2.0)
+    finally:
+        queue.stop()
+    assert bus.timeouts[0] == 0  # the producer's own attempt does not block
+    assert [msg.arbitration_id for msg in bus.sent] == [0x100]
+    status = queue.status()
+    assert status["sent"] == 1
+    assert status["failed"] == 0 and status["retries"] == 0